@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""Benchmark audit queries over a day of indexed audit segments.
+
+Writes a synthetic day of tool execution events (one segment per hour) to a
+temporary directory, then times first-page queries filtered by user, by
+tool and user, by result, and by a one-hour time range.
+
+Usage: uv run python benchmarks/bench_audit_query.py [--events 1000000] [--users 1000]
+"""
+
+import argparse
+import random
+import tempfile
+import time
+
+from template_mcp.audit_segments import AuditSegmentStore, SegmentedAuditSink
+
+TOOLS = ("hello", "server_info", "audit_query")
+ROLES = ("admin", "user", "guest")
+
+
+class _Clock:
+    """Clock moved forward by the writer loop."""
+    
+    def __init__(self):
+        self.now = 0.0
+    
+    def __call__(self) -> float:
+        return self.now
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=1_000_000)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    
+    rng = random.Random(42)
+    with tempfile.TemporaryDirectory() as directory:
+        clock = _Clock()
+        sink = SegmentedAuditSink(directory, max_bytes=1 << 40, max_age=3600, clock=clock)
+        step = 86400 / args.events
+        start = time.perf_counter()
+        for first in range(0, args.events, 1000):
+            clock.now = first * step
+            sink.write([
+                {
+                    "event": "Tool execution",
+                    "event_type": "tool_execution",
+                    "timestamp": i * step,
+                    "tool_name": rng.choice(TOOLS),
+                    "user_id": f"user-{rng.randrange(args.users)}",
+                    "user_role": rng.choice(ROLES),
+                    "result": "error" if rng.random() < 0.01 else "success",
+                    "execution_time_ms": 0.5,
+                }
+                for i in range(first, min(first + 1000, args.events))
+            ])
+        sink.rotate()
+        print(f"wrote {args.events:,} events in {time.perf_counter() - start:.1f} s")
+        
+        store = AuditSegmentStore(directory)
+        store.segments()  # Load the indexes once, as a running server would
+        queries = {
+            "user": {"user_id": "user-7"},
+            "user+tool": {"user_id": "user-7", "tool": "hello"},
+            "result=error": {"result": "error"},
+            "one hour": {"since_us": 12 * 3600 * 1_000_000, "until_us": 13 * 3600 * 1_000_000},
+            "one hour+role": {"since_us": 12 * 3600 * 1_000_000, "until_us": 13 * 3600 * 1_000_000,
+                              "user_role": "admin"},
+        }
+        for label, filters in queries.items():
+            start = time.perf_counter_ns()
+            for _ in range(args.repeat):
+                events, _ = store.query(limit=100, **filters)
+            elapsed_ms = (time.perf_counter_ns() - start) / args.repeat / 1e6
+            print(f"{label:>14}: {elapsed_ms:7.2f} ms per page ({len(events)} events)")
+        sink.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""Benchmark hello tool result rendering in calls per second.
+
+Compares the previous handler body (a dict of six f-strings rebuilt per call
+plus a HelloResponse model) with the precompiled greeting catalog, with and
+without the result LRU. Requests cycle through a fixed set of names,
+languages and formats, so the cached run measures a warm cache.
+
+Usage: uv run python benchmarks/bench_greetings.py [--calls 200000] [--names 100]
+"""
+
+import argparse
+import itertools
+import time
+from typing import Callable, Tuple
+
+from template_mcp.greetings import GreetingCatalog
+from template_mcp.models import HelloResponse
+
+LANGUAGES = ("en", "es", "fr", "pt", "pt-BR", "xx")
+FORMATS = ("plain", "plain", "plain", "html", "json")
+
+# (name, language, format)
+Request = Tuple[str, str, str]
+
+
+def render_inline(name: str, language: str, format: str) -> str:
+    """The hello handler body before the greeting catalog."""
+    greetings = {
+        "en": f"Hello, {name}!",
+        "es": f"¡Hola, {name}!",
+        "fr": f"Bonjour, {name}!",
+        "de": f"Hallo, {name}!",
+        "pt": f"Olá, {name}!",
+        "it": f"Ciao, {name}!",
+    }
+    greeting = greetings.get(language, greetings["en"])
+    hello_response = HelloResponse(greeting=greeting, name=name, language=language)
+    if format == "json":
+        result = hello_response.model_dump()
+    elif format == "html":
+        result = f"<h1>{greeting}</h1><p>Welcome, <strong>{name}</strong>!</p>"
+    else:
+        result = greeting
+    return result if isinstance(result, str) else str(result)
+
+
+def run(label: str, render: Callable[[str, str, str], str], requests: Tuple[Request, ...], calls: int) -> None:
+    """Time one renderer over the request mix."""
+    mix = itertools.islice(itertools.cycle(requests), calls)
+    start = time.perf_counter_ns()
+    for name, language, format in mix:
+        render(name, language, format)
+    elapsed_ns = time.perf_counter_ns() - start
+    print(f"{label:<32} {calls / (elapsed_ns / 1e9):>14,.0f} calls/s")
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=200_000)
+    parser.add_argument("--names", type=int, default=100)
+    args = parser.parse_args()
+    
+    requests = tuple(
+        (f"user-{i}", LANGUAGES[i % len(LANGUAGES)], FORMATS[i % len(FORMATS)]) for i in range(args.names)
+    )
+    catalog = GreetingCatalog.load()
+    cached = GreetingCatalog.load(cache_size=args.names * 2)
+    
+    run("inline f-strings + model", render_inline, requests, args.calls)
+    run("catalog", catalog.render, requests, args.calls)
+    run("catalog + result LRU", cached.render, requests, args.calls)
+    print(f"LRU hit ratio: {cached.get_stats()['cache']['hit_ratio']:.2%} (json results are never cached)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""Benchmark hello tool throughput over the HTTP transport by client count.
+
+Starts one server process with the streamable HTTP transport and the
+embedded policy engine, then runs 1..N concurrent MCP clients, each with
+its own session, calling the hello tool in a loop.
+
+Usage: uv run python benchmarks/bench_http_concurrency.py [--clients 1,2,4,8,16,32] [--seconds 5]
+"""
+
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+
+from fastmcp import Client
+
+HOST = "127.0.0.1"
+
+
+async def wait_for_server(url: str, timeout: float = 30.0) -> None:
+    """Wait until the server accepts MCP sessions."""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            async with Client(url) as client:
+                await client.ping()
+                return
+        except Exception:
+            if time.monotonic() > deadline:
+                raise
+            await asyncio.sleep(0.2)
+
+
+async def client_loop(url: str, stop_at: float) -> int:
+    """Call the hello tool until ``stop_at`` and return the number of calls."""
+    calls = 0
+    async with Client(url) as client:
+        while time.monotonic() < stop_at:
+            await client.call_tool("hello", {"name": "Bench", "language": "en", "format": "plain"})
+            calls += 1
+    return calls
+
+
+async def run_level(url: str, clients: int, seconds: float) -> float:
+    """Run ``clients`` concurrent sessions for ``seconds`` and return calls per second."""
+    start = time.monotonic()
+    counts = await asyncio.gather(*(client_loop(url, start + seconds) for _ in range(clients)))
+    return sum(counts) / (time.monotonic() - start)
+
+
+async def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clients", default="1,2,4,8,16,32")
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--port", type=int, default=3917)
+    args = parser.parse_args()
+    
+    env = {
+        **os.environ,
+        "MCP_SERVER__TRANSPORT": "http",
+        "MCP_SERVER__HOST": HOST,
+        "MCP_SERVER__PORT": str(args.port),
+        "EUNOMIA__MODE": "local",
+        "LOGGING__CONSOLE_ENABLED": "false",
+        "LOGGING__FILE_ENABLED": "false",
+    }
+    server = subprocess.Popen([sys.executable, "-m", "template_mcp.main"], env=env)  # noqa: S603
+    url = f"http://{HOST}:{args.port}/mcp"
+    try:
+        await wait_for_server(url)
+        print(f"{'clients':>8} {'calls/s':>10} {'per client':>11}")
+        for clients in (int(value) for value in args.clients.split(",")):
+            throughput = await run_level(url, clients, args.seconds)
+            print(f"{clients:>8} {throughput:10.1f} {throughput / clients:11.1f}")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""Benchmark logging calls per second with the level enabled and disabled.
+
+Compares the level-gated facade returned by ``get_logger`` (placeholders
+formatted only when emitted) with a plain loguru logger given an f-string,
+as the server code did before, and with the stdlib bridge. Records go to
+the configured (enqueued) file sink in a temporary directory, so the numbers
+are the cost paid by the calling thread plus the sink's writer thread
+(encoding with the chosen JSON encoder).
+
+Usage: uv run python benchmarks/bench_logging.py [--calls 200000] [--json-encoder stdlib|orjson]
+"""
+
+import argparse
+import logging
+import tempfile
+import time
+from pathlib import Path
+
+from loguru import logger
+
+from template_mcp.config import LoggingConfig
+from template_mcp.logging import get_logger, setup_logging
+
+
+def _rate(calls: int, elapsed_ns: int) -> str:
+    """Format a calls-per-second figure."""
+    return f"{calls / (elapsed_ns / 1e9):>14,.0f} calls/s"
+
+
+def run(label: str, calls: int, level: str, caller_info: bool, directory: str, json_encoder: str) -> None:
+    """Time each logger style at one configured level."""
+    log_file = str(Path(directory) / f"{level.lower()}-{caller_info}.log")
+    setup_logging(LoggingConfig(
+        level=level, console_enabled=False, file_path=log_file, caller_info=caller_info, json_encoder=json_encoder
+    ))
+    
+    gated = get_logger("bench")
+    plain = logger.bind(logger_name="bench")
+    stdlib = logging.getLogger("bench")
+    name, count = "world", 42
+    perf_counter_ns = time.perf_counter_ns
+    
+    print(f"{label}:")
+    start = perf_counter_ns()
+    for _ in range(calls):
+        gated.info("Hello {} number {}", name, count)
+    print(f"  facade, lazy placeholders  {_rate(calls, perf_counter_ns() - start)}")
+    
+    start = perf_counter_ns()
+    for _ in range(calls):
+        plain.info(f"Hello {name} number {count}")
+    print(f"  loguru, eager f-string     {_rate(calls, perf_counter_ns() - start)}")
+    
+    start = perf_counter_ns()
+    for _ in range(calls):
+        stdlib.info("Hello %s number %s", name, count)
+    print(f"  stdlib bridge              {_rate(calls, perf_counter_ns() - start)}")
+    start = perf_counter_ns()
+    logger.remove()  # Drains the enqueued records
+    print(f"  draining the sink queue    {(perf_counter_ns() - start) / 1e6:>10,.0f} ms")
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=200_000)
+    parser.add_argument("--json-encoder", choices=("stdlib", "orjson"), default="stdlib")
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as directory:
+        run("INFO disabled (level WARNING)", args.calls * 10, "WARNING", True, directory, args.json_encoder)
+        run("INFO enabled, caller info", args.calls, "INFO", True, directory, args.json_encoder)
+        run("INFO enabled, no caller info", args.calls, "INFO", False, directory, args.json_encoder)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""Benchmark the per-call cost of tool counters and latency histograms.
+
+Measures what a handler pays on every call: two ``perf_counter_ns`` reads,
+``SharedCounters.start`` and ``SharedCounters.finish`` with a duration, and
+compares it with an empty loop. Rendering the Prometheus text is timed too.
+
+Usage: uv run python benchmarks/bench_metrics_overhead.py [--calls 1000000]
+"""
+
+import argparse
+import time
+
+from template_mcp.counters import SharedCounters
+from template_mcp.metrics import render_prometheus
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=1_000_000)
+    parser.add_argument("--workers", type=int, default=8, help="worker slots in the counter block")
+    args = parser.parse_args()
+    
+    counters = SharedCounters(workers=args.workers)
+    counters.register_tool("hello")
+    perf_counter_ns = time.perf_counter_ns
+    
+    start = perf_counter_ns()
+    for _ in range(args.calls):
+        pass
+    empty_ns = perf_counter_ns() - start
+    
+    start = perf_counter_ns()
+    for i in range(args.calls):
+        call_start = perf_counter_ns()
+        counters.start("hello")
+        counters.finish("hello", perf_counter_ns() - call_start, error=not i % 100)
+    instrumented_ns = perf_counter_ns() - start
+    
+    per_call = (instrumented_ns - empty_ns) / args.calls
+    print(f"instrumentation: {per_call:.0f} ns per call ({args.calls:,} calls)")
+    
+    start = perf_counter_ns()
+    body = render_prometheus(counters, 1.0)
+    render_us = (perf_counter_ns() - start) / 1000
+    print(f"prometheus render: {render_us:.0f} us ({len(body):,} bytes, {args.workers} worker slots)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""Benchmark policy decisions from 10 to 100,000 policies.
+
+Policies are spread across tenants and all apply to the same subject and
+action, which is the worst case for the subject/action index: every lookup
+lands on one resource matcher. The trie-based engine is compared with a
+linear scan of compiled glob patterns.
+
+Usage: uv run python benchmarks/bench_policy_scaling.py [--lookups 20000]
+"""
+
+import argparse
+import random
+import re
+import time
+from fnmatch import translate
+
+from template_mcp.models import PolicyDocument, PolicyEffect, PolicyRule
+from template_mcp.policies import PolicyEngine
+
+SIZES = [10, 100, 1_000, 10_000, 100_000]
+
+
+def build_policies(count: int) -> list:
+    """Generate tenant policies mixing literal and wildcard resources."""
+    tenants = max(1, count // 10)
+    policies = []
+    for i in range(count):
+        tenant = f"tenant{i % tenants}"
+        if i % 10 == 0:
+            resource = f"tenants/{tenant}/resources/*"
+        elif i % 10 == 1:
+            resource = f"tenants/{tenant}/tools/admin_*"
+        else:
+            resource = f"tenants/{tenant}/tools/tool_{i}"
+        policies.append(
+            PolicyRule(
+                id=f"p{i}",
+                subjects=["user"],
+                actions=["read"],
+                resources=[resource],
+                effect=PolicyEffect.DENY if i % 10 == 1 else PolicyEffect.ALLOW,
+            )
+        )
+    return policies
+
+
+def build_lookups(count: int, lookups: int) -> list:
+    """Generate resource paths hitting and missing the policies."""
+    tenants = max(1, count // 10)
+    rng = random.Random(42)
+    paths = []
+    for _ in range(lookups):
+        tenant = f"tenant{rng.randrange(tenants)}"
+        kind = rng.randrange(3)
+        if kind == 0:
+            paths.append(f"tenants/{tenant}/tools/tool_{rng.randrange(count)}")
+        elif kind == 1:
+            paths.append(f"tenants/{tenant}/resources/doc_{rng.randrange(100)}")
+        else:
+            paths.append(f"tenants/{tenant}/tools/admin_reset")
+    return paths
+
+
+def linear_scan(policies: list):
+    """Baseline matcher testing every compiled pattern in order."""
+    rules = sorted(
+        ((policy.effect == PolicyEffect.ALLOW, re.compile(translate(resource))) for policy in policies for resource in policy.resources),
+        key=lambda rule: rule[0],
+    )
+    
+    def evaluate(resource: str) -> bool:
+        for allowed, pattern in rules:
+            if pattern.match(resource):
+                return allowed
+        return False
+    
+    return evaluate
+
+
+def per_lookup_us(func, paths) -> float:
+    """Mean microseconds per call of ``func`` over ``paths``."""
+    start = time.perf_counter()
+    for path in paths:
+        func(path)
+    return (time.perf_counter() - start) * 1_000_000 / len(paths)
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--lookups", type=int, default=20_000)
+    parser.add_argument("--linear-limit", type=int, default=10_000, help="largest size to run the linear baseline on")
+    args = parser.parse_args()
+    
+    print(f"{'policies':>10} {'compile ms':>12} {'trie us/op':>12} {'linear us/op':>14}")
+    for size in SIZES:
+        policies = build_policies(size)
+        paths = build_lookups(size, args.lookups)
+        
+        start = time.perf_counter()
+        engine = PolicyEngine(PolicyDocument(policies=policies))
+        compile_ms = (time.perf_counter() - start) * 1000
+        
+        trie_us = per_lookup_us(lambda path: engine.evaluate("user", "read", path), paths)
+        if size <= args.linear_limit:
+            linear = linear_scan(policies)
+            linear_us = f"{per_lookup_us(linear, paths[: max(100, args.lookups // size)]):14.2f}"
+        else:
+            linear_us = f"{'skipped':>14}"
+        print(f"{size:>10} {compile_ms:12.1f} {trie_us:12.2f} {linear_us}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""Benchmark tools/list authorization filtering with 1,000 registered tools.
+
+Compares one decision per tool against the batched ``authorize_many`` path,
+for the embedded policy engine and for a simulated Eunomia server with a
+fixed per-request latency.
+
+Usage: uv run python benchmarks/bench_tools_list.py [--tools 1000] [--latency-ms 1.0]
+"""
+
+import argparse
+import asyncio
+import time
+from pathlib import Path
+
+import httpx
+
+from template_mcp.authorization import TOOL_LIST_ACTION, LocalAuthorizer, Principal, RemoteAuthorizer, tool_resource
+from template_mcp.config import EunomiaConfig
+from template_mcp.eunomia_client import EunomiaClient
+from template_mcp.policies import PolicyStore
+
+POLICIES_FILE = Path(__file__).parent.parent / "configs" / "eunomia_policies.json"
+
+
+def simulated_eunomia(latency_s: float) -> httpx.AsyncBaseTransport:
+    """Mock Eunomia server that sleeps ``latency_s`` per HTTP request."""
+    
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(latency_s)
+        if request.url.path == "/check/bulk":
+            count = request.read().count(b'"principal"')
+            return httpx.Response(200, json=[{"allowed": True}] * count)
+        return httpx.Response(200, json={"allowed": True})
+    
+    return httpx.MockTransport(handler)
+
+
+async def per_tool(authorizer, principal, requests):
+    """Authorize each tool separately."""
+    return [await authorizer.authorize(principal, action, resource) for action, resource in requests]
+
+
+async def batched(authorizer, principal, requests):
+    """Authorize all tools with one batched call."""
+    return await authorizer.authorize_many(principal, requests)
+
+
+async def measure(label, func, authorizer, principal, requests, rounds):
+    """Run ``func`` for ``rounds`` iterations and print the mean latency."""
+    start = time.perf_counter()
+    for _ in range(rounds):
+        await func(authorizer, principal, requests)
+    elapsed_ms = (time.perf_counter() - start) * 1000 / rounds
+    print(f"{label:<32} {elapsed_ms:10.3f} ms per tools/list")
+
+
+async def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tools", type=int, default=1000)
+    parser.add_argument("--latency-ms", type=float, default=1.0)
+    args = parser.parse_args()
+    
+    principal = Principal(user_id="bench", role="user")
+    requests = [(TOOL_LIST_ACTION, tool_resource(f"tool_{i}")) for i in range(args.tools)]
+    print(f"{args.tools} registered tools, simulated Eunomia latency {args.latency_ms} ms\n")
+    
+    local = LocalAuthorizer(PolicyStore(POLICIES_FILE))
+    await measure("local per-tool", per_tool, local, principal, requests, rounds=50)
+    await measure("local batched", batched, local, principal, requests, rounds=50)
+    
+    client = EunomiaClient(EunomiaConfig(server_url="http://eunomia.bench"), transport=simulated_eunomia(args.latency_ms / 1000))
+    remote = RemoteAuthorizer(client)
+    await measure("remote per-tool", per_tool, remote, principal, requests, rounds=1)
+    await measure("remote batched", batched, remote, principal, requests, rounds=5)
+    await client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""Benchmark tools/list filtering with thousands of registered tools.
+
+Compares deciding visibility and filtering the registered tools on each
+request with the cached path, which reuses the principal's visibility and
+the list filtered once per registry version and visibility set. Decisions
+come from the embedded policy engine. The conversion and serialization of
+the listed tools, done by FastMCP on every request either way, is timed
+separately for reference.
+
+Usage: uv run python benchmarks/bench_tools_list_cache.py [--tools 5000] [--rounds 200]
+"""
+
+import argparse
+import asyncio
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+from mcp.types import ListToolsResult
+from mcp.types import Tool as McpTool
+
+from template_mcp.authorization import AuthorizationMiddleware, LocalAuthorizer, PrincipalResolver
+from template_mcp.policies import PolicyStore
+from template_mcp.tool_listing import ToolListCache
+
+POLICIES_FILE = Path(__file__).parent.parent / "configs" / "eunomia_policies.json"
+
+
+def registered_tool(index: int) -> SimpleNamespace:
+    """Build a registered tool with a small input schema."""
+    definition = McpTool(
+        name=f"tool_{index}",
+        description=f"Benchmark tool number {index}",
+        inputSchema={
+            "type": "object",
+            "properties": {"name": {"type": "string", "maxLength": 100}, "count": {"type": "integer"}},
+            "required": ["name"],
+        },
+    )
+    return SimpleNamespace(name=definition.name, to_mcp_tool=lambda: definition)
+
+
+async def measure(label, serve, rounds):
+    """Run ``serve`` for ``rounds`` iterations and print the mean latency."""
+    start = time.perf_counter()
+    for _ in range(rounds):
+        await serve()
+    elapsed_ms = (time.perf_counter() - start) * 1000 / rounds
+    print(f"{label:<40} {elapsed_ms:10.3f} ms per tools/list")
+
+
+async def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tools", type=int, default=5000)
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+    
+    tools = [registered_tool(i) for i in range(args.tools)]
+    context = SimpleNamespace(message=None)
+    principals = PrincipalResolver(default_role="admin")
+    authorizer = LocalAuthorizer(PolicyStore(POLICIES_FILE))
+    uncached = AuthorizationMiddleware(authorizer, principals=principals)
+    cached = AuthorizationMiddleware(authorizer, tool_lists=ToolListCache(), principals=principals)
+    print(f"{args.tools} registered tools\n")
+    
+    async def call_next(context):
+        return tools
+    
+    async def serialize():
+        listed = await cached.on_list_tools(context, call_next)
+        return ListToolsResult(tools=[tool.to_mcp_tool() for tool in listed]).model_dump_json(
+            by_alias=True, exclude_none=True
+        )
+    
+    await measure("decide + filter per request", lambda: uncached.on_list_tools(context, call_next), args.rounds)
+    await measure("cached visibility and filtered list", lambda: cached.on_list_tools(context, call_next), args.rounds)
+    await measure("FastMCP conversion + serialization", serialize, max(1, args.rounds // 20))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
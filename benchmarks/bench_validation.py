@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""Benchmark hello tool input validations per second.
+
+Compares the previous HelloRequest (Python ``field_validator`` for the name,
+regex for the format, constructed with ``HelloRequest(**params)``) with the
+current model whose checks are pydantic-core constraints, validated through
+the tool's compiled validator from the decoded arguments.
+
+Usage: uv run python benchmarks/bench_validation.py [--calls 200000]
+"""
+
+import argparse
+import time
+from typing import Any, Callable, List
+
+from pydantic import BaseModel, Field, field_validator
+
+from template_mcp.models import HelloRequest
+from template_mcp.validators import ValidatorRegistry
+
+
+class LegacyHelloRequest(BaseModel):
+    """HelloRequest as it was before its checks moved into pydantic-core."""
+    
+    name: str = Field(..., min_length=1, max_length=100)
+    language: str = Field(default="en", pattern="^[a-z]{2,3}(-[A-Za-z0-9]{2,8})*$", max_length=35)
+    format: str = Field(default="plain", pattern="^(plain|json|html)$")
+    
+    @field_validator("name")
+    @classmethod
+    def validate_name(cls, v: str) -> str:
+        cleaned = v.strip()
+        if not any(c.isalpha() for c in cleaned):
+            raise ValueError("Name must contain at least one letter")
+        return cleaned
+
+
+def run(label: str, validate: Callable[[Any], Any], inputs: List[Any], calls: int) -> None:
+    """Time one validation path over the inputs."""
+    rounds = max(1, calls // len(inputs))
+    start = time.perf_counter_ns()
+    for _ in range(rounds):
+        for item in inputs:
+            validate(item)
+    elapsed_ns = time.perf_counter_ns() - start
+    print(f"{label:<42} {rounds * len(inputs) / (elapsed_ns / 1e9):>14,.0f} validations/s")
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=200_000)
+    args = parser.parse_args()
+    
+    params = [
+        {"name": "Alice", "language": "en", "format": "plain"},
+        {"name": "  José-Carlos  ", "language": "pt-BR", "format": "html"},
+        {"name": "Иван", "language": "ru", "format": "json"},
+        {"name": "Bob"},
+    ]
+    registry = ValidatorRegistry()
+    registry.register("hello", HelloRequest)
+    
+    run("legacy model, HelloRequest(**params)", lambda item: LegacyHelloRequest(**item), params, args.calls)
+    run("core constraints, HelloRequest(**params)", lambda item: HelloRequest(**item), params, args.calls)
+    run("registry, decoded arguments", lambda item: registry.validate("hello", item), params, args.calls)
+
+
+if __name__ == "__main__":
+    main()
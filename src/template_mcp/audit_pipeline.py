@@ -0,0 +1,231 @@
+"""Bounded in-process audit buffer flushed in batches by a writer thread."""
+
+import json
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional
+
+from loguru import logger
+
+OVERFLOW_POLICIES = ("block", "drop_oldest", "drop_success")
+
+# Results that may be shed under the drop_success policy
+SHEDDABLE_RESULTS = frozenset({"success", "allowed"})
+
+# Records counting sampled-out events, never shed since totals depend on them
+SUMMARY_EVENT_TYPE = "audit_sample_summary"
+
+
+def is_sheddable(event: Dict[str, Any]) -> bool:
+    """Whether an event is routine enough to be dropped under pressure."""
+    return event.get("result") in SHEDDABLE_RESULTS and event.get("event_type") != SUMMARY_EVENT_TYPE
+
+
+def json_default(value: Any) -> Any:
+    """Encode values the json module does not handle natively."""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def encode_event(event: Dict[str, Any]) -> str:
+    """Encode an audit event as one JSON line, turning its epoch timestamp into ISO 8601."""
+    record = dict(event)
+    record["timestamp"] = datetime.fromtimestamp(event["timestamp"], timezone.utc).isoformat()
+    return json.dumps(record, default=json_default, separators=(",", ":")) + "\n"
+
+
+class AuditSink(ABC):
+    """Destination for batches of audit events."""
+    
+    @abstractmethod
+    def write(self, batch: List[Dict[str, Any]]) -> None:
+        """Persist a batch of events."""
+    
+    def close(self) -> None:
+        """Release resources held by the sink; sinks holding none keep this no-op default."""
+        return None
+
+
+class JsonLinesFileSink(AuditSink):
+    """Append audit events to a file as JSON lines, one write per batch."""
+    
+    def __init__(self, path: str):
+        """Open the audit file for appending."""
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = self.path.open("a", encoding="utf-8")
+    
+    def write(self, batch: List[Dict[str, Any]]) -> None:
+        """Append the batch and flush it to the OS."""
+        self._file.write("".join(encode_event(event) for event in batch))
+        self._file.flush()
+    
+    def close(self) -> None:
+        """Close the audit file."""
+        self._file.close()
+
+
+class AuditPipeline:
+    """Single audit path: a bounded ring buffer drained in batches by one writer thread.
+    
+    Producers only append to the buffer under a lock. When the buffer is full
+    the overflow policy applies: ``block`` waits for the writer to free space,
+    ``drop_oldest`` discards the oldest buffered event, and ``drop_success``
+    sheds routine success/allowed events (the incoming one or the oldest
+    buffered one) and only blocks when every buffered event must be kept.
+    """
+    
+    def __init__(
+        self,
+        sink: AuditSink,
+        capacity: int = 10000,
+        batch_size: int = 256,
+        flush_interval: float = 0.5,
+        overflow_policy: str = "drop_oldest",
+    ):
+        """Initialize the pipeline; call :meth:`start` to run the writer."""
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unsupported audit overflow policy: {overflow_policy}")
+        self.sink = sink
+        self.capacity = capacity
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.overflow_policy = overflow_policy
+        self._buffer: Deque[Dict[str, Any]] = deque()
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+        self._thread: Optional[threading.Thread] = None
+        self._closing = False
+        self._flush_requested = False
+        self._writing = False
+        self.submitted = 0
+        self.dropped = 0
+        self.dropped_success = 0
+        self.blocked = 0
+        self.written = 0
+        self.batches = 0
+        self.write_errors = 0
+        self.max_depth = 0
+    
+    def start(self) -> None:
+        """Start the writer thread."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+            self._thread.start()
+    
+    def submit(self, event: Dict[str, Any]) -> bool:
+        """Buffer an event, returning False if it was dropped."""
+        with self._lock:
+            self.submitted += 1
+            if len(self._buffer) >= self.capacity and not self._make_room(event):
+                return False
+            self._buffer.append(event)
+            depth = len(self._buffer)
+            if depth > self.max_depth:
+                self.max_depth = depth
+            if depth >= self.batch_size:
+                self._not_empty.notify()
+        return True
+    
+    def _make_room(self, event: Dict[str, Any]) -> bool:
+        """Apply the overflow policy with the lock held; False drops the incoming event."""
+        if self.overflow_policy == "drop_oldest":
+            self._buffer.popleft()
+            self.dropped += 1
+            return True
+        
+        if self.overflow_policy == "drop_success":
+            if is_sheddable(event):
+                self.dropped += 1
+                self.dropped_success += 1
+                return False
+            for index, buffered in enumerate(self._buffer):
+                if is_sheddable(buffered):
+                    del self._buffer[index]
+                    self.dropped += 1
+                    self.dropped_success += 1
+                    return True
+        
+        self.blocked += 1
+        self._not_empty.notify()
+        while len(self._buffer) >= self.capacity:
+            if self._closing or self._thread is None:
+                self.dropped += 1
+                return False
+            self._not_full.wait(self.flush_interval)
+        return True
+    
+    def _run(self) -> None:
+        """Writer loop: drain the buffer in batches until closed."""
+        while True:
+            with self._lock:
+                if len(self._buffer) < self.batch_size and not (self._closing or self._flush_requested):
+                    self._not_empty.wait(self.flush_interval)
+                batch = [self._buffer.popleft() for _ in range(min(len(self._buffer), self.batch_size))]
+                if not self._buffer:
+                    self._flush_requested = False
+                if not batch:
+                    self._not_full.notify_all()
+                    if self._closing:
+                        return
+                    continue
+                self._writing = True
+                self._not_full.notify_all()
+            
+            try:
+                self.sink.write(batch)
+                self.written += len(batch)
+                self.batches += 1
+            except Exception as e:
+                self.write_errors += 1
+                logger.error("Failed to write {} audit events: {}", len(batch), e)
+            finally:
+                with self._lock:
+                    self._writing = False
+                    self._not_full.notify_all()
+    
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wait until every buffered event has been written."""
+        deadline = time.monotonic() + timeout
+        with self._lock:
+            self._flush_requested = True
+            self._not_empty.notify()
+            while self._buffer or self._writing:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or self._thread is None:
+                    return False
+                self._not_full.wait(remaining)
+        return True
+    
+    def close(self, timeout: float = 5.0) -> None:
+        """Write the remaining events, stop the writer and close the sink."""
+        with self._lock:
+            self._closing = True
+            self._not_empty.notify()
+            self._not_full.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self.sink.close()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get buffer depth and drop counters."""
+        return {
+            "overflow_policy": self.overflow_policy,
+            "capacity": self.capacity,
+            "depth": len(self._buffer),
+            "max_depth": self.max_depth,
+            "submitted": self.submitted,
+            "written": self.written,
+            "batches": self.batches,
+            "dropped": self.dropped,
+            "dropped_success": self.dropped_success,
+            "blocked": self.blocked,
+            "write_errors": self.write_errors,
+        }
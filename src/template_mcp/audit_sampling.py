@@ -0,0 +1,128 @@
+"""Per-tool, per-role sampling of routine audit events with exact suppressed counts."""
+
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .audit_pipeline import SHEDDABLE_RESULTS, SUMMARY_EVENT_TYPE
+from .config import AuditConfig
+
+# Role whose actions are always audited in full
+ADMIN_ROLE = "admin"
+
+# (event type, tool or resource, role, result)
+SampleKey = Tuple[str, str, Optional[str], str]
+
+
+class AuditSampler:
+    """Decide which routine audit events are written and count the others.
+    
+    Only success/allowed events of non-admin callers are sampled; errors,
+    denials and admin actions are always kept. Rates are looked up by
+    ``tool:role``, then ``tool``, then ``*:role``, then the default rate, and
+    cached per (tool, role). Events sampled out are counted per event type,
+    tool, role and result; :meth:`drain` turns the counts into summary
+    records so kept events plus summaries add up to the exact totals.
+    """
+    
+    def __init__(
+        self,
+        default_rate: float = 1.0,
+        rates: Optional[Dict[str, float]] = None,
+        report_interval: float = 60.0,
+        clock: Callable[[], float] = time.time,
+        rng: Callable[[], float] = random.random,
+    ):
+        """Initialize the sampler."""
+        for key, rate in {"default": default_rate, **(rates or {})}.items():
+            if not 0.0 <= rate <= 1.0:
+                raise ValueError(f"Audit sample rate for {key} must be between 0 and 1")
+        self.default_rate = default_rate
+        self.rates = dict(rates or {})
+        self.report_interval = report_interval
+        self._clock = clock
+        self._rng = rng
+        self._lock = threading.Lock()
+        self._resolved: Dict[Tuple[str, Optional[str]], float] = {}
+        self._suppressed: Dict[SampleKey, int] = {}
+        self._window_start = clock()
+        self.kept = 0
+        self.suppressed = 0
+        self.summaries = 0
+    
+    def rate(self, target: str, role: Optional[str]) -> float:
+        """Get the sample rate for a tool (or ``tools/<name>`` resource) and role."""
+        rate = self._resolved.get((target, role))
+        if rate is None:
+            tool = target.rsplit("/", 1)[-1]
+            for key in (f"{tool}:{role}", tool, f"*:{role}"):
+                if key in self.rates:
+                    rate = self.rates[key]
+                    break
+            else:
+                rate = self.default_rate
+            self._resolved[(target, role)] = rate
+        return rate
+    
+    def sample(self, event_type: str, target: str, role: Optional[str], result: str) -> Optional[float]:
+        """Return the rate the event was kept at, or None if it was sampled out."""
+        if result not in SHEDDABLE_RESULTS or role == ADMIN_ROLE:
+            return 1.0
+        rate = self.rate(target, role)
+        if rate >= 1.0 or self._rng() < rate:
+            self.kept += 1
+            return rate
+        key = (event_type, target, role, result)
+        with self._lock:
+            self._suppressed[key] = self._suppressed.get(key, 0) + 1
+            self.suppressed += 1
+        return None
+    
+    def due(self) -> bool:
+        """Whether the current reporting window has ended."""
+        return self._clock() - self._window_start >= self.report_interval
+    
+    def seconds_until_due(self) -> float:
+        """Seconds left in the current reporting window."""
+        return max(0.0, self._window_start + self.report_interval - self._clock())
+    
+    def drain(self) -> List[Dict[str, Any]]:
+        """Close the reporting window and return one summary record per suppressed key."""
+        now = self._clock()
+        with self._lock:
+            suppressed, self._suppressed = self._suppressed, {}
+            window_start, self._window_start = self._window_start, now
+        
+        summaries = []
+        for (event_type, target, role, result), count in suppressed.items():
+            summaries.append({
+                "event_type": SUMMARY_EVENT_TYPE,
+                "sampled_event_type": event_type,
+                "tool_name" if event_type == "tool_execution" else "resource": target,
+                "user_role": role,
+                "result": result,
+                "suppressed": count,
+                "sample_rate": self.rate(target, role),
+                "window_start": window_start,
+                "window_end": now,
+            })
+        self.summaries += len(summaries)
+        return summaries
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get sampling counters."""
+        return {
+            "default_rate": self.default_rate,
+            "rates": self.rates,
+            "kept": self.kept,
+            "suppressed": self.suppressed,
+            "summaries": self.summaries,
+        }
+
+
+def create_sampler(config: AuditConfig) -> Optional[AuditSampler]:
+    """Create a sampler from configuration, or None when every event is kept."""
+    if config.sample_rate >= 1.0 and not config.sample_rates:
+        return None
+    return AuditSampler(config.sample_rate, config.sample_rates, config.sample_report_interval)
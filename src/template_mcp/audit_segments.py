@@ -0,0 +1,544 @@
+"""Append-only binary audit segments with per-segment time, user and tool indexes."""
+
+import base64
+import binascii
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .audit_pipeline import AuditSink, json_default
+
+SEGMENT_SUFFIX = ".seg"
+INDEX_SUFFIX = ".idx"
+INDEX_MAGIC = b"TMAI\x01"
+
+# Records are grouped in blocks of this many for the timestamp index
+TIME_BLOCK_RECORDS = 256
+
+# Enum fields are stored as one-byte codes; code 0 means absent or a value
+# outside the table, in which case the raw value is kept with the other fields.
+# Codes are persisted, so new values are only ever appended.
+EVENT_TYPES = (
+    None, "tool_execution", "authorization_check", "server_start", "server_stop", "policies_reloaded",
+    "audit_sample_summary",
+)
+RESULTS = (None, "success", "error", "denied", "allowed", "failure")
+ROLES = (None, "admin", "user", "guest")
+TOOL_KEYS = (None, "tool_name", "resource")
+
+_EVENT_TYPE_CODES = {value: code for code, value in enumerate(EVENT_TYPES) if value}
+_RESULT_CODES = {value: code for code, value in enumerate(RESULTS) if value}
+_ROLE_CODES = {value: code for code, value in enumerate(ROLES) if value}
+
+# length of the rest of the record, timestamp (µs), event type, result, role,
+# tool key, user_id length, tool length, length of the JSON-encoded other fields
+_HEADER = struct.Struct("<IqBBBBHHI")
+_NO_USER = 0xFFFF
+
+
+def _enum_value(value: Any) -> Any:
+    """Unwrap enum members to their value."""
+    return getattr(value, "value", value)
+
+
+def encode_record(event: Dict[str, Any]) -> Tuple[bytes, int, Optional[str], Optional[str]]:
+    """Encode an audit event, returning the record, its timestamp (µs), user_id and tool."""
+    fields = dict(event)
+    timestamp_us = int(fields.pop("timestamp") * 1_000_000)
+    
+    event_type = _enum_value(fields.get("event_type"))
+    event_type_code = _EVENT_TYPE_CODES.get(event_type, 0)
+    if event_type_code:
+        del fields["event_type"]
+    result = _enum_value(fields.get("result"))
+    result_code = _RESULT_CODES.get(result, 0)
+    if result_code:
+        del fields["result"]
+    role = _enum_value(fields.get("user_role"))
+    role_code = _ROLE_CODES.get(role, 0)
+    if role_code:
+        del fields["user_role"]
+    
+    tool_key = 1 if isinstance(fields.get("tool_name"), str) else 2 if isinstance(fields.get("resource"), str) else 0
+    tool = fields.pop(TOOL_KEYS[tool_key]) if tool_key else None
+    tool_bytes = tool.encode("utf-8")[:0xFFFE] if tool is not None else b""
+    
+    user_id = fields.pop("user_id", None)
+    if user_id is not None and not isinstance(user_id, str):
+        user_id = str(user_id)
+    user_bytes = user_id.encode("utf-8")[:0xFFFE] if user_id is not None else b""
+    
+    extras = json.dumps(fields, default=json_default, separators=(",", ":")).encode("utf-8") if fields else b""
+    header = _HEADER.pack(
+        _HEADER.size - 4 + len(user_bytes) + len(tool_bytes) + len(extras),
+        timestamp_us,
+        event_type_code,
+        result_code,
+        role_code,
+        tool_key,
+        len(user_bytes) if user_id is not None else _NO_USER,
+        len(tool_bytes),
+        len(extras),
+    )
+    return header + user_bytes + tool_bytes + extras, timestamp_us, user_id, tool
+
+
+def record_timestamp(buffer: Any, offset: int) -> int:
+    """Read the timestamp (µs) of the record at ``offset`` without decoding it."""
+    return struct.unpack_from("<q", buffer, offset + 4)[0]
+
+
+def decode_record(buffer: Any, offset: int) -> Tuple[Dict[str, Any], int]:
+    """Decode the record at ``offset``, returning the event and the next record offset."""
+    length, timestamp_us, event_type, result, role, tool_key, user_len, tool_len, extras_len = _HEADER.unpack_from(
+        buffer, offset
+    )
+    position = offset + _HEADER.size
+    event: Dict[str, Any] = {"timestamp": timestamp_us / 1_000_000}
+    if user_len == _NO_USER:
+        event["user_id"] = None
+    else:
+        event["user_id"] = bytes(buffer[position:position + user_len]).decode("utf-8", "replace")
+        position += user_len
+    if tool_key:
+        event[TOOL_KEYS[tool_key]] = bytes(buffer[position:position + tool_len]).decode("utf-8", "replace")
+    position += tool_len
+    if event_type:
+        event["event_type"] = EVENT_TYPES[event_type]
+    if result:
+        event["result"] = RESULTS[result]
+    if role:
+        event["user_role"] = ROLES[role]
+    if extras_len:
+        event.update(json.loads(bytes(buffer[position:position + extras_len])))
+    return event, offset + 4 + length
+
+
+class SegmentIndex:
+    """Record offsets of one segment by user_id and tool, plus timestamp ranges per block.
+    
+    Blocks of :data:`TIME_BLOCK_RECORDS` consecutive records carry their
+    minimum and maximum timestamp, so time filters skip whole blocks even if
+    records are not strictly ordered. On disk the index is a JSON header
+    followed by the uint32 offset postings, which are memory-mapped on load.
+    """
+    
+    def __init__(self):
+        """Create an empty index."""
+        self.count = 0
+        self.min_ts: Optional[int] = None
+        self.max_ts: Optional[int] = None
+        self.blocks: List[List[int]] = []  # [first offset, min ts, max ts]
+        self.users: Dict[str, Sequence[int]] = {}
+        self.tools: Dict[str, Sequence[int]] = {}
+        self._buffer: Optional[mmap.mmap] = None
+    
+    def add(self, offset: int, timestamp_us: int, user_id: Optional[str], tool: Optional[str]) -> None:
+        """Index one appended record."""
+        if self.count % TIME_BLOCK_RECORDS == 0:
+            self.blocks.append([offset, timestamp_us, timestamp_us])
+        else:
+            block = self.blocks[-1]
+            if timestamp_us < block[1]:
+                block[1] = timestamp_us
+            elif timestamp_us > block[2]:
+                block[2] = timestamp_us
+        self.count += 1
+        if self.min_ts is None or timestamp_us < self.min_ts:
+            self.min_ts = timestamp_us
+        if self.max_ts is None or timestamp_us > self.max_ts:
+            self.max_ts = timestamp_us
+        if user_id is not None:
+            self.users.setdefault(user_id, array("I")).append(offset)
+        if tool is not None:
+            self.tools.setdefault(tool, array("I")).append(offset)
+    
+    def copy(self) -> "SegmentIndex":
+        """Copy an in-memory index, so it can be read while the original keeps growing."""
+        index = SegmentIndex()
+        index.count = self.count
+        index.min_ts = self.min_ts
+        index.max_ts = self.max_ts
+        index.blocks = [list(block) for block in self.blocks]
+        index.users = {key: array("I", offsets) for key, offsets in self.users.items()}
+        index.tools = {key: array("I", offsets) for key, offsets in self.tools.items()}
+        return index
+    
+    def overlaps(self, since_us: Optional[int], until_us: Optional[int]) -> bool:
+        """Check whether the segment may hold records in the time range."""
+        if self.count == 0:
+            return False
+        return (since_us is None or self.max_ts >= since_us) and (until_us is None or self.min_ts <= until_us)
+    
+    def block_ranges(self, since_us: Optional[int], until_us: Optional[int], end: int) -> List[Tuple[int, int]]:
+        """Byte ranges of the blocks overlapping the time range."""
+        ranges: List[Tuple[int, int]] = []
+        for position, (start, block_min, block_max) in enumerate(self.blocks):
+            if (since_us is not None and block_max < since_us) or (until_us is not None and block_min > until_us):
+                continue
+            stop = self.blocks[position + 1][0] if position + 1 < len(self.blocks) else end
+            if ranges and ranges[-1][1] == start:
+                ranges[-1] = (ranges[-1][0], stop)
+            else:
+                ranges.append((start, stop))
+        return ranges
+    
+    def write(self, path: Path) -> None:
+        """Write the index next to its sealed segment."""
+        postings = array("I")
+        users: Dict[str, List[int]] = {}
+        tools: Dict[str, List[int]] = {}
+        for target, source in ((users, self.users), (tools, self.tools)):
+            for key, offsets in source.items():
+                target[key] = [len(postings), len(offsets)]
+                postings.extend(offsets)
+        header = json.dumps(
+            {
+                "count": self.count,
+                "min_ts": self.min_ts,
+                "max_ts": self.max_ts,
+                "blocks": self.blocks,
+                "users": users,
+                "tools": tools,
+            },
+            separators=(",", ":"),
+        ).encode("utf-8")
+        # Pad so the postings start 4-byte aligned for the uint32 view
+        padding = -(len(INDEX_MAGIC) + 4 + len(header)) % 4
+        temporary = path.with_suffix(path.suffix + ".tmp")
+        with temporary.open("wb") as f:
+            f.write(INDEX_MAGIC + struct.pack("<I", len(header) + padding) + header + b" " * padding)
+            f.write(postings.tobytes())
+        os.replace(temporary, path)
+    
+    @classmethod
+    def load(cls, path: Path) -> "SegmentIndex":
+        """Load a sealed segment index, mapping its postings into memory."""
+        index = cls()
+        with path.open("rb") as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if buffer[:len(INDEX_MAGIC)] != INDEX_MAGIC:
+            buffer.close()
+            raise ValueError(f"Not an audit segment index: {path}")
+        header_end = len(INDEX_MAGIC) + 4 + struct.unpack_from("<I", buffer, len(INDEX_MAGIC))[0]
+        header = json.loads(buffer[len(INDEX_MAGIC) + 4:header_end])
+        postings = memoryview(buffer)[header_end:].cast("I")
+        index.count = header["count"]
+        index.min_ts = header["min_ts"]
+        index.max_ts = header["max_ts"]
+        index.blocks = header["blocks"]
+        index.users = {key: postings[start:start + size] for key, (start, size) in header["users"].items()}
+        index.tools = {key: postings[start:start + size] for key, (start, size) in header["tools"].items()}
+        index._buffer = buffer
+        return index
+
+
+class SegmentedAuditSink(AuditSink):
+    """Audit sink appending binary records to size- and age-rotated segments.
+    
+    Segment names carry the creation time in microseconds, the process id and
+    a sequence number, so several workers can share a directory. The index of the active segment
+    is kept in memory and written to ``<segment>.idx`` when it is sealed. Readers in other threads
+    use :meth:`snapshot`, which is taken under the lock held while writing and rotating.
+    """
+    
+    def __init__(
+        self,
+        directory: str,
+        max_bytes: int = 64 * 1024 * 1024,
+        max_age: float = 3600.0,
+        clock: Any = time.time,
+    ):
+        """Initialize the sink; the first segment is opened on the first write."""
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self._clock = clock
+        self._file: Optional[Any] = None
+        self.active_path: Optional[Path] = None
+        self.active_index = SegmentIndex()
+        self._opened_at = 0.0
+        self._size = 0
+        self._sequence = 0
+        self._lock = threading.Lock()
+        self.segments_sealed = 0
+    
+    def _open_segment(self) -> None:
+        """Start a new active segment."""
+        self._opened_at = self._clock()
+        self._sequence += 1
+        self.active_path = self.directory / (
+            f"audit-{int(self._opened_at * 1_000_000):016d}-{os.getpid()}-{self._sequence:06d}{SEGMENT_SUFFIX}"
+        )
+        self._file = self.active_path.open("ab")
+        self._size = self._file.tell()
+        self.active_index = SegmentIndex()
+    
+    def snapshot(self) -> Optional[Tuple[Path, SegmentIndex]]:
+        """The active segment and a copy of its index covering every record written so far."""
+        with self._lock:
+            if self.active_path is None:
+                return None
+            return self.active_path, self.active_index.copy()
+    
+    def rotate(self) -> None:
+        """Seal the active segment and write its index."""
+        with self._lock:
+            self._seal()
+    
+    def _seal(self) -> None:
+        """Seal the active segment with the lock held."""
+        if self._file is None:
+            return
+        self._file.close()
+        self._file = None
+        if self.active_index.count:
+            self.active_index.write(self.active_path.with_suffix(INDEX_SUFFIX))
+            self.segments_sealed += 1
+        else:
+            self.active_path.unlink(missing_ok=True)
+        self.active_path = None
+    
+    def write(self, batch: List[Dict[str, Any]]) -> None:
+        """Append a batch of events to the active segment."""
+        records = [encode_record(event) for event in batch]
+        with self._lock:
+            if self._file is not None and (
+                self._size >= self.max_bytes or self._clock() - self._opened_at >= self.max_age
+            ):
+                self._seal()
+            if self._file is None:
+                self._open_segment()
+            
+            for record, timestamp_us, user_id, tool in records:
+                self.active_index.add(self._size, timestamp_us, user_id, tool)
+                self._size += len(record)
+            self._file.write(b"".join(record for record, *_ in records))
+            self._file.flush()
+    
+    def close(self) -> None:
+        """Seal the active segment."""
+        self.rotate()
+
+
+class SegmentReader:
+    """Memory-mapped reader of one segment file."""
+    
+    def __init__(self, path: Path):
+        """Map the segment; records appended later are not visible."""
+        self.path = path
+        with path.open("rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            self._buffer = mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ) if size else b""
+        self.size = size
+    
+    def read(self, offset: int) -> Optional[Dict[str, Any]]:
+        """Decode the record at ``offset``, or None if it lies past the mapped end."""
+        if offset + _HEADER.size > self.size or offset + 4 + struct.unpack_from("<I", self._buffer, offset)[0] > self.size:
+            return None
+        return decode_record(self._buffer, offset)[0]
+    
+    def header(self, offset: int) -> Optional[Tuple[int, int, int]]:
+        """Read ``(timestamp µs, result code, role code)`` of a record without decoding it."""
+        if offset + _HEADER.size > self.size:
+            return None
+        _, timestamp_us, _, result, role, *_ = _HEADER.unpack_from(self._buffer, offset)
+        return timestamp_us, result, role
+    
+    def offsets(self, start: int = 0, stop: Optional[int] = None) -> Iterator[int]:
+        """Yield the offsets of the complete records between two offsets."""
+        stop = self.size if stop is None else min(stop, self.size)
+        offset = start
+        while offset + _HEADER.size <= stop:
+            next_offset = offset + 4 + struct.unpack_from("<I", self._buffer, offset)[0]
+            if next_offset > self.size:
+                break  # Partially written record at the end of an active segment
+            yield offset
+            offset = next_offset
+    
+    def scan(self, start: int = 0, stop: Optional[int] = None) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """Yield ``(offset, event)`` for the records between two offsets."""
+        for offset in self.offsets(start, stop):
+            yield offset, decode_record(self._buffer, offset)[0]
+    
+    def index_into(self, index: SegmentIndex, start: int = 0) -> int:
+        """Add the records from ``start`` on to ``index``, returning the offset after the last one."""
+        end = start
+        for offset in self.offsets(start):
+            event, end = decode_record(self._buffer, offset)
+            index.add(offset, int(round(event["timestamp"] * 1_000_000)), event.get("user_id"),
+                      event.get("tool_name", event.get("resource")))
+        return end
+    
+    def build_index(self) -> SegmentIndex:
+        """Index a segment that has no index file yet."""
+        index = SegmentIndex()
+        self.index_into(index)
+        return index
+    
+    def close(self) -> None:
+        """Unmap the segment."""
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
+
+
+def encode_cursor(segment: str, offset: int) -> str:
+    """Encode the position after the last returned record as an opaque cursor."""
+    return base64.urlsafe_b64encode(f"{segment}:{offset}".encode()).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, int]:
+    """Decode a cursor produced by :func:`encode_cursor`."""
+    try:
+        segment, offset = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8").rsplit(":", 1)
+        return segment, int(offset)
+    except (binascii.Error, UnicodeError, ValueError) as e:
+        raise ValueError("Invalid audit query cursor") from e
+
+
+class AuditSegmentStore:
+    """Read access to every audit segment in a directory.
+    
+    Sealed segment indexes are loaded once and cached. Segments still being
+    written by other processes are indexed incrementally by scanning what was
+    appended since the last query; the active segment of ``sink`` uses a
+    snapshot of its in-memory index.
+    """
+    
+    def __init__(self, directory: str, sink: Optional[SegmentedAuditSink] = None):
+        """Initialize the store."""
+        self.directory = Path(directory)
+        self.sink = sink
+        self._indexes: Dict[Path, SegmentIndex] = {}
+        self._partial: Dict[Path, Tuple[SegmentIndex, int]] = {}
+    
+    def segments(self) -> List[Tuple[Path, SegmentIndex]]:
+        """List ``(segment path, index)`` pairs ordered by segment creation time."""
+        result: List[Tuple[Path, SegmentIndex]] = []
+        active = self.sink.snapshot() if self.sink is not None else None
+        for path in sorted(self.directory.glob(f"*{SEGMENT_SUFFIX}")):
+            if active is not None and path == active[0]:
+                result.append(active)
+                continue
+            index = self._indexes.get(path)
+            if index is None:
+                index_path = path.with_suffix(INDEX_SUFFIX)
+                if index_path.exists():
+                    self._partial.pop(path, None)
+                    index = self._indexes[path] = SegmentIndex.load(index_path)
+                else:
+                    index, scanned = self._partial.get(path, (SegmentIndex(), 0))
+                    reader = SegmentReader(path)
+                    self._partial[path] = (index, reader.index_into(index, scanned))
+                    reader.close()
+            result.append((path, index))
+        return result
+    
+    def query(
+        self,
+        since_us: Optional[int] = None,
+        until_us: Optional[int] = None,
+        user_id: Optional[str] = None,
+        user_role: Optional[str] = None,
+        tool: Optional[str] = None,
+        result: Optional[str] = None,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Find audit events matching every given filter, oldest segment first.
+        
+        User and tool filters read the index postings, time filters skip whole
+        segments and record blocks, and role/result filters compare header
+        codes, so only matching records are decoded. Returns the events and a
+        cursor for the next page, or None when there are no more results.
+        """
+        cursor_segment, cursor_offset = decode_cursor(cursor) if cursor else (None, -1)
+        role_code = _ROLE_CODES.get(user_role) if user_role is not None else None
+        result_code = _RESULT_CODES.get(result) if result is not None else None
+        events: List[Dict[str, Any]] = []
+        
+        for path, index in self.segments():
+            if cursor_segment is not None and path.name < cursor_segment:
+                continue
+            if not index.overlaps(since_us, until_us):
+                continue
+            if (user_id is not None and user_id not in index.users) or (tool is not None and tool not in index.tools):
+                continue
+            
+            after = cursor_offset if path.name == cursor_segment else -1
+            reader = SegmentReader(path)
+            try:
+                for offset in self._candidates(index, reader, since_us, until_us, user_id, tool, after):
+                    header = reader.header(offset)
+                    if header is None:
+                        continue
+                    timestamp_us, record_result, record_role = header
+                    if (since_us is not None and timestamp_us < since_us) or (
+                        until_us is not None and timestamp_us > until_us
+                    ):
+                        continue
+                    if user_role is not None and record_role != (role_code or 0):
+                        continue
+                    if result is not None and record_result != (result_code or 0):
+                        continue
+                    event = reader.read(offset)
+                    if event is None:
+                        continue
+                    # Roles and results outside the code tables are stored as plain fields
+                    if (user_role is not None and event.get("user_role") != user_role) or (
+                        result is not None and event.get("result") != result
+                    ):
+                        continue
+                    events.append(event)
+                    if len(events) >= limit:
+                        return events, encode_cursor(path.name, offset)
+            finally:
+                reader.close()
+        return events, None
+    
+    def _candidates(
+        self,
+        index: SegmentIndex,
+        reader: SegmentReader,
+        since_us: Optional[int],
+        until_us: Optional[int],
+        user_id: Optional[str],
+        tool: Optional[str],
+        after: int,
+    ) -> Iterator[int]:
+        """Yield candidate record offsets in one segment, in ascending order."""
+        if user_id is None and tool is None:
+            for start, stop in index.block_ranges(since_us, until_us, reader.size):
+                for offset in reader.offsets(start, stop):
+                    if offset > after:
+                        yield offset
+            return
+        
+        postings = [index.users[user_id]] if user_id is not None else []
+        if tool is not None:
+            postings.append(index.tools[tool])
+        postings.sort(key=len)
+        offsets = postings[0]
+        start = bisect_right(offsets, after)
+        if len(postings) == 1:
+            for position in range(start, len(offsets)):
+                yield offsets[position]
+            return
+        # Both postings are sorted: look each offset of the shorter one up in the longer one
+        others = postings[1]
+        low = 0
+        for position in range(start, len(offsets)):
+            offset = offsets[position]
+            low = bisect_left(others, offset, low)
+            if low == len(others):
+                return
+            if others[low] == offset:
+                yield offset
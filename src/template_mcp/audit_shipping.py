@@ -0,0 +1,241 @@
+"""Ship audit batches to a local sidecar process over a Unix domain socket."""
+
+import os
+import socket
+import socketserver
+import struct
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from loguru import logger
+
+from .audit_pipeline import AuditSink, encode_event
+from .rotation import RotatingFile
+
+# Frame header: payload length and batch sequence number; the sidecar acks
+# a batch by echoing its sequence number once the batch is written
+_FRAME = struct.Struct(">IQ")
+_ACK = struct.Struct(">Q")
+
+# Largest batch the sidecar accepts, guarding against corrupt length prefixes
+MAX_FRAME_BYTES = 64 * 1024 * 1024
+
+SPILL_SUFFIX = ".batch"
+
+
+def _recv_exactly(sock: socket.socket, size: int) -> bytes:
+    """Read exactly ``size`` bytes or raise ConnectionError on EOF."""
+    chunks = []
+    while size:
+        chunk = sock.recv(size)
+        if not chunk:
+            raise ConnectionError("Audit sidecar connection closed")
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+
+class SocketAuditSink(AuditSink):
+    """Send audit batches to the audit sidecar, spilling to disk while it is unreachable.
+    
+    Each batch is one length-prefixed frame of JSON lines and is only
+    considered delivered once the sidecar acknowledges it. Batches that
+    cannot be delivered are written to ``spill_dir`` and replayed, oldest
+    first, before the next batch once the sidecar is back. A batch whose ack
+    was lost is sent again, so delivery is at-least-once.
+    """
+    
+    def __init__(
+        self,
+        socket_path: str,
+        spill_dir: str,
+        timeout: float = 5.0,
+        retry_interval: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize the sink; the connection is opened on the first write."""
+        self.socket_path = socket_path
+        self.spill_dir = Path(spill_dir)
+        self.spill_dir.mkdir(parents=True, exist_ok=True)
+        self.timeout = timeout
+        self.retry_interval = retry_interval
+        self._clock = clock
+        self._sock: Optional[socket.socket] = None
+        self._next_attempt = 0.0
+        self._sequence = 0
+        self._spill_sequence = 0
+        # Batches spilled by a previous run are replayed too
+        self._has_spill = any(self.spill_dir.glob(f"*{SPILL_SUFFIX}"))
+        self.shipped = 0
+        self.spilled = 0
+        self.replayed = 0
+        self.connects = 0
+    
+    def write(self, batch: List[Dict[str, Any]]) -> None:
+        """Deliver a batch to the sidecar, or spill it to disk."""
+        payload = "".join(encode_event(event) for event in batch).encode("utf-8")
+        if self._connect():
+            try:
+                if self._has_spill:
+                    self._replay_spill()
+                self._send(payload)
+                self.shipped += 1
+                return
+            except OSError as e:
+                logger.warning("Audit sidecar unreachable, spilling to {}: {}", self.spill_dir, e)
+                self._disconnect()
+        self._spill(payload)
+    
+    def _connect(self) -> bool:
+        """Connect to the sidecar unless connected or still waiting to retry."""
+        if self._sock is not None:
+            return True
+        now = self._clock()
+        if now < self._next_attempt:
+            return False
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.socket_path)
+        except OSError:
+            sock.close()
+            self._next_attempt = now + self.retry_interval
+            return False
+        self._sock = sock
+        self.connects += 1
+        return True
+    
+    def _disconnect(self) -> None:
+        """Drop the connection and wait before reconnecting."""
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+        self._next_attempt = self._clock() + self.retry_interval
+    
+    def _send(self, payload: bytes) -> None:
+        """Send one frame and wait for its acknowledgement."""
+        self._sequence += 1
+        self._sock.sendall(_FRAME.pack(len(payload), self._sequence) + payload)
+        (acked,) = _ACK.unpack(_recv_exactly(self._sock, _ACK.size))
+        if acked != self._sequence:
+            raise ConnectionError(f"Audit sidecar acknowledged batch {acked}, expected {self._sequence}")
+    
+    def _spill(self, payload: bytes) -> None:
+        """Write an undelivered batch to the spill directory."""
+        self._spill_sequence += 1
+        name = f"{time.time_ns():020d}-{os.getpid()}-{self._spill_sequence:06d}"
+        temporary = self.spill_dir / f"{name}.tmp"
+        with temporary.open("wb") as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        # Renamed once complete so a crash never leaves a partial batch to replay
+        temporary.rename(self.spill_dir / f"{name}{SPILL_SUFFIX}")
+        self._has_spill = True
+        self.spilled += 1
+    
+    def _replay_spill(self) -> None:
+        """Send spilled batches in order, deleting each once acknowledged."""
+        for path in sorted(self.spill_dir.glob(f"*{SPILL_SUFFIX}")):
+            self._send(path.read_bytes())
+            path.unlink()
+            self.replayed += 1
+        self._has_spill = False
+    
+    def close(self) -> None:
+        """Close the connection."""
+        self._disconnect()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get delivery counters."""
+        return {
+            "connected": self._sock is not None,
+            "shipped": self.shipped,
+            "spilled": self.spilled,
+            "replayed": self.replayed,
+            "connects": self.connects,
+        }
+
+
+class RotatingAuditFile(RotatingFile):
+    """JSON lines audit file rotated by size and age, with gzip and retention.
+    
+    Rotated files are compressed on a background thread so writes and acks
+    never wait for compression.
+    """
+    
+    def __init__(
+        self,
+        path: str,
+        max_bytes: int = 64 * 1024 * 1024,
+        max_age: float = 86400.0,
+        retention: float = 30 * 86400.0,
+        compression: bool = True,
+        clock: Callable[[], float] = time.time,
+    ):
+        """Open the audit file for appending."""
+        super().__init__(
+            path,
+            max_age=max_age,
+            retention=retention,
+            compression=compression,
+            max_bytes=max_bytes,
+            background_compression=True,
+            clock=clock,
+        )
+    
+    def write(self, payload: bytes) -> None:
+        """Append a batch and flush it to the OS."""
+        super().write(payload)
+        self.flush()
+
+
+class _SidecarHandler(socketserver.BaseRequestHandler):
+    """Receive frames from one server process and acknowledge them once written."""
+    
+    server: "AuditSidecar"
+    
+    def handle(self) -> None:
+        """Serve one connection until the client disconnects."""
+        while True:
+            try:
+                length, sequence = _FRAME.unpack(_recv_exactly(self.request, _FRAME.size))
+                if length > MAX_FRAME_BYTES:
+                    logger.error("Dropping audit connection: {} byte frame exceeds the limit", length)
+                    return
+                payload = _recv_exactly(self.request, length)
+            except ConnectionError:
+                return
+            self.server.store(payload)
+            self.request.sendall(_ACK.pack(sequence))
+
+
+class AuditSidecar(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Audit sidecar: owns the audit file, its rotation, compression and retention."""
+    
+    daemon_threads = True
+    
+    def __init__(self, socket_path: str, output: RotatingAuditFile):
+        """Bind the socket, replacing a stale one left by a previous run."""
+        Path(socket_path).parent.mkdir(parents=True, exist_ok=True)
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        self.output = output
+        self._lock = threading.Lock()
+        self.batches = 0
+        super().__init__(socket_path, _SidecarHandler)
+    
+    def store(self, payload: bytes) -> None:
+        """Append one batch to the audit file."""
+        with self._lock:
+            self.output.write(payload)
+            self.batches += 1
+    
+    def server_close(self) -> None:
+        """Close the socket and the audit file."""
+        super().server_close()
+        self.output.close()
+        if os.path.exists(self.server_address):
+            os.unlink(self.server_address)
@@ -0,0 +1,492 @@
+"""Authorization middleware for tool calls backed by pluggable authorizers."""
+
+import asyncio
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, replace
+from typing import Any, Dict, FrozenSet, List, Optional, Sequence, Tuple
+
+from fastmcp.exceptions import ToolError
+from fastmcp.server.auth.providers.jwt import JWTVerifier
+from fastmcp.server.dependencies import get_access_token
+from fastmcp.server.middleware import Middleware, MiddlewareContext
+from loguru import logger
+
+from .cache import MISSING, TTLCache
+from .circuit_breaker import CircuitBreaker
+from .config import AuthConfig, EunomiaConfig
+from .eunomia_client import EunomiaClient
+from .logging import AuditLogger, get_audit_logger
+from .models import UserRole
+from .policies import AuthorizationDecision, PolicyStore
+from .tool_listing import ToolListCache
+from .tracing import Tracer, get_tracer
+
+# Actions from the policies file used for each MCP operation
+TOOL_CALL_ACTION = "read"
+TOOL_LIST_ACTION = "list"
+
+ActionResource = Tuple[str, str]
+
+
+class AuthorizationUnavailableError(Exception):
+    """Raised when no authorization decision can be obtained."""
+
+
+def tool_resource(tool_name: str) -> str:
+    """Build the policy resource identifier for a tool."""
+    return f"tools/{tool_name}"
+
+
+@dataclass(frozen=True, slots=True)
+class Principal:
+    """Caller identity used for authorization decisions."""
+    
+    user_id: Optional[str] = None
+    role: str = UserRole.GUEST.value
+
+
+# Most privileged first, for tokens granting several roles through their scopes
+ROLE_PRECEDENCE = (UserRole.ADMIN.value, UserRole.USER.value, UserRole.GUEST.value)
+
+
+def current_access_token() -> Optional[Any]:
+    """Get the verified access token of the current request, if any."""
+    try:
+        return get_access_token()
+    except RuntimeError:
+        # Outside of a request context
+        return None
+
+
+class PrincipalResolver:
+    """Resolve the calling principal from the authenticated request.
+    
+    Tool arguments are client controlled and never consulted. With a
+    verified access token, the user id is the token subject (or client id)
+    and the role comes from the ``role_claim`` claim, falling back to the
+    most privileged role granted as a scope. Callers without a token (stdio
+    clients, HTTP without an auth provider) and tokens naming no known role
+    get ``default_role``.
+    """
+    
+    def __init__(self, default_role: str = UserRole.GUEST.value, role_claim: str = "role"):
+        """Initialize the resolver."""
+        self.default_role = default_role
+        self.role_claim = role_claim
+    
+    def __call__(self) -> Principal:
+        """Resolve the principal of the current request."""
+        return self.from_token(current_access_token())
+    
+    def from_token(self, token: Optional[Any]) -> Principal:
+        """Build the principal identified by a verified access token."""
+        if token is None:
+            return Principal(role=self.default_role)
+        
+        claims = getattr(token, "claims", None) or {}
+        role = claims.get(self.role_claim)
+        if role not in ROLE_PRECEDENCE:
+            scopes = set(token.scopes or ())
+            role = next((candidate for candidate in ROLE_PRECEDENCE if candidate in scopes), self.default_role)
+        return Principal(user_id=claims.get("sub") or token.client_id, role=role)
+
+
+def create_auth_provider(config: AuthConfig) -> Optional[JWTVerifier]:
+    """Build the bearer token verifier for the HTTP transports, if configured."""
+    if not config.jwt_jwks_uri and not config.jwt_public_key:
+        return None
+    return JWTVerifier(
+        jwks_uri=config.jwt_jwks_uri,
+        public_key=config.jwt_public_key,
+        issuer=config.jwt_issuer,
+        audience=config.jwt_audience,
+    )
+
+
+class Authorizer(ABC):
+    """Base class for authorization decision sources."""
+    
+    @abstractmethod
+    async def authorize(self, principal: Principal, action: str, resource: str) -> AuthorizationDecision:
+        """Decide whether the principal may perform the action on the resource."""
+    
+    async def authorize_many(self, principal: Principal, requests: Sequence[ActionResource]) -> List[AuthorizationDecision]:
+        """Decide several (action, resource) pairs for one principal, in order."""
+        return [await self.authorize(principal, action, resource) for action, resource in requests]
+    
+    @property
+    def circuit_state(self) -> Optional[str]:
+        """State of the circuit breaker guarding this authorizer, if any."""
+        return None
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get authorizer statistics for server_info."""
+        return {}
+
+
+class LocalAuthorizer(Authorizer):
+    """Authorizer evaluating decisions against the embedded policy engine."""
+    
+    def __init__(self, store: PolicyStore):
+        """Initialize the authorizer with the policy store holding the active engine."""
+        self.store = store
+    
+    async def authorize(self, principal: Principal, action: str, resource: str) -> AuthorizationDecision:
+        """Evaluate the decision in-process."""
+        return self.store.engine.evaluate(principal.role, action, resource)
+    
+    async def authorize_many(self, principal: Principal, requests: Sequence[ActionResource]) -> List[AuthorizationDecision]:
+        """Evaluate all pairs in-process without yielding to the event loop."""
+        return self.store.engine.evaluate_many(principal.role, requests)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get policy engine statistics."""
+        return {"mode": "local", **self.store.get_stats()}
+
+
+class RemoteAuthorizer(Authorizer):
+    """Authorizer delegating decisions to the Eunomia server ``/check`` endpoint."""
+    
+    def __init__(self, client: EunomiaClient):
+        """Initialize the authorizer with the shared Eunomia connection pool."""
+        self.client = client
+    
+    @staticmethod
+    def _check_payload(principal: Principal, action: str, resource: str) -> Dict[str, Any]:
+        """Build an Eunomia check request body."""
+        principal_check: Dict[str, Any] = {"attributes": {"role": principal.role}}
+        if principal.user_id:
+            principal_check["uri"] = principal.user_id
+        return {
+            "principal": principal_check,
+            "resource": {"uri": resource},
+            "action": action,
+        }
+    
+    async def authorize(self, principal: Principal, action: str, resource: str) -> AuthorizationDecision:
+        """Ask the Eunomia server for a decision."""
+        return self._decision(await self.client.check(self._check_payload(principal, action, resource)))
+    
+    async def authorize_many(self, principal: Principal, requests: Sequence[ActionResource]) -> List[AuthorizationDecision]:
+        """Resolve all pairs with a single ``/check/bulk`` round trip."""
+        if not requests:
+            return []
+        payloads = [self._check_payload(principal, action, resource) for action, resource in requests]
+        return [self._decision(body) for body in await self.client.check_bulk(payloads)]
+    
+    @staticmethod
+    def _decision(body: Dict[str, Any]) -> AuthorizationDecision:
+        """Convert an Eunomia check response into a decision."""
+        return AuthorizationDecision(allowed=bool(body.get("allowed")), reason=body.get("reason") or "")
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get remote authorizer statistics."""
+        return {"mode": "remote", "connection_pool": self.client.get_stats()}
+
+
+class CircuitBreakerAuthorizer(Authorizer):
+    """Authorizer protecting a remote authorizer with a circuit breaker.
+    
+    Calls are bounded by ``call_timeout``. While the circuit is open (or a
+    call fails) the ``fallback`` policy applies: ``fail_fast`` raises
+    :class:`AuthorizationUnavailableError`, ``stale`` serves the last known
+    decision for the same request if it is at most ``max_staleness`` seconds
+    old, and raises otherwise.
+    """
+    
+    def __init__(
+        self,
+        inner: Authorizer,
+        breaker: CircuitBreaker,
+        call_timeout: float,
+        fallback: str = "fail_fast",
+        max_staleness: float = 300.0,
+        last_known_size: int = 10000,
+    ):
+        """Initialize the circuit breaker authorizer."""
+        self.inner = inner
+        self.breaker = breaker
+        self.call_timeout = call_timeout
+        self.fallback = fallback
+        self.max_staleness = max_staleness
+        self.last_known = TTLCache(last_known_size)
+        self.stale_served = 0
+    
+    @property
+    def circuit_state(self) -> Optional[str]:
+        """Current breaker state."""
+        return self.breaker.state
+    
+    def _fallback(self, key: Tuple[Principal, str, str]) -> AuthorizationDecision:
+        """Serve a stale decision or fail fast while the dependency is unavailable."""
+        if self.fallback == "stale" and self.max_staleness > 0:
+            decision = self.last_known.get(key)
+            if decision is not MISSING:
+                self.stale_served += 1
+                return replace(decision, stale=True)
+        raise AuthorizationUnavailableError(f"Authorization unavailable (circuit {self.breaker.state})")
+    
+    async def _guarded(self, call: Any) -> Any:
+        """Run a call to the wrapped authorizer under the breaker."""
+        start = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(call, self.call_timeout)
+        except asyncio.CancelledError:
+            self.breaker.record_cancelled()
+            raise
+        except Exception:
+            self.breaker.record_failure()
+            raise
+        self.breaker.record_success(time.perf_counter() - start)
+        return result
+    
+    async def authorize(self, principal: Principal, action: str, resource: str) -> AuthorizationDecision:
+        """Ask the wrapped authorizer unless the circuit is open."""
+        key = (principal, action, resource)
+        if not self.breaker.allow_request():
+            return self._fallback(key)
+        try:
+            decision = await self._guarded(self.inner.authorize(principal, action, resource))
+        except Exception:
+            return self._fallback(key)
+        self.last_known.set(key, decision, self.max_staleness)
+        return decision
+    
+    async def authorize_many(self, principal: Principal, requests: Sequence[ActionResource]) -> List[AuthorizationDecision]:
+        """Batched variant of :meth:`authorize` sharing one breaker decision."""
+        keys = [(principal, action, resource) for action, resource in requests]
+        if not self.breaker.allow_request():
+            return [self._fallback(key) for key in keys]
+        try:
+            decisions = await self._guarded(self.inner.authorize_many(principal, requests))
+        except Exception:
+            return [self._fallback(key) for key in keys]
+        for key, decision in zip(keys, decisions, strict=True):
+            self.last_known.set(key, decision, self.max_staleness)
+        return decisions
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get wrapped authorizer statistics with breaker state."""
+        return {
+            **self.inner.get_stats(),
+            "circuit_breaker": {**self.breaker.get_stats(), "fallback": self.fallback, "stale_served": self.stale_served},
+        }
+
+
+class CachingAuthorizer(Authorizer):
+    """Authorizer caching decisions of another authorizer with separate allow/deny TTLs."""
+    
+    def __init__(self, inner: Authorizer, cache: TTLCache, allow_ttl: float, deny_ttl: float):
+        """Initialize the caching authorizer."""
+        self.inner = inner
+        self.cache = cache
+        self.allow_ttl = allow_ttl
+        self.deny_ttl = deny_ttl
+    
+    async def authorize(self, principal: Principal, action: str, resource: str) -> AuthorizationDecision:
+        """Serve the decision from cache, falling back to the wrapped authorizer."""
+        key = (principal, action, resource)
+        decision = self.cache.get(key)
+        if decision is MISSING:
+            decision = await self.inner.authorize(principal, action, resource)
+            self._remember(key, decision)
+        return decision
+    
+    async def authorize_many(self, principal: Principal, requests: Sequence[ActionResource]) -> List[AuthorizationDecision]:
+        """Serve cached pairs and resolve the misses with one batched call."""
+        decisions: List[Optional[AuthorizationDecision]] = []
+        misses: List[int] = []
+        for index, (action, resource) in enumerate(requests):
+            decision = self.cache.get((principal, action, resource))
+            if decision is MISSING:
+                misses.append(index)
+                decision = None
+            decisions.append(decision)
+        
+        if misses:
+            resolved = await self.inner.authorize_many(principal, [requests[index] for index in misses])
+            if len(resolved) != len(misses):
+                # Checked up front so no decision is cached against the wrong pair
+                raise ValueError(f"Expected {len(misses)} authorization decisions, got {len(resolved)}")
+            for index, decision in zip(misses, resolved, strict=True):
+                action, resource = requests[index]
+                self._remember((principal, action, resource), decision)
+                decisions[index] = decision
+        return decisions
+    
+    def _remember(self, key: Tuple[Principal, str, str], decision: AuthorizationDecision) -> None:
+        """Cache a fresh decision; stale fallbacks are bounded by the breaker's max staleness, not these TTLs."""
+        if not decision.stale:
+            self.cache.set(key, decision, self.allow_ttl if decision.allowed else self.deny_ttl)
+    
+    @property
+    def circuit_state(self) -> Optional[str]:
+        """State of the wrapped authorizer's circuit breaker."""
+        return self.inner.circuit_state
+    
+    def invalidate(
+        self,
+        principal: Optional[Principal] = None,
+        resource: Optional[str] = None,
+    ) -> int:
+        """Drop cached decisions, optionally only those for a principal and/or resource."""
+        if principal is None and resource is None:
+            return self.cache.invalidate()
+        return self.cache.invalidate(
+            lambda key: (principal is None or key[0] == principal) and (resource is None or key[2] == resource)
+        )
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get wrapped authorizer statistics with cache counters."""
+        return {**self.inner.get_stats(), "cache": self.cache.get_stats()}
+
+
+def create_authorizer(
+    config: EunomiaConfig,
+    client: Optional[EunomiaClient] = None,
+    store: Optional[PolicyStore] = None,
+    audit_logger: Optional[AuditLogger] = None,
+) -> Optional[Authorizer]:
+    """Build the authorizer for the configured decision mode.
+    
+    Returns None in ``middleware`` mode, where decisions are left to the stock
+    Eunomia middleware. Remote mode uses ``client`` so the connection pool is
+    shared with any direct authorization calls; local mode evaluates against
+    ``store`` so policy reloads are picked up.
+    """
+    if config.mode == "local":
+        store = store or PolicyStore(config.policies_file)
+        authorizer: Authorizer = LocalAuthorizer(store)
+    elif config.mode == "remote":
+        authorizer = RemoteAuthorizer(client or EunomiaClient(config))
+        if config.breaker_enabled:
+            audit_logger = audit_logger or get_audit_logger()
+            authorizer = CircuitBreakerAuthorizer(
+                authorizer,
+                CircuitBreaker(
+                    failure_threshold=config.breaker_failure_threshold,
+                    slow_call_seconds=config.breaker_slow_call_ms / 1000,
+                    open_seconds=config.breaker_open_seconds,
+                    on_state_change=lambda previous, state: audit_logger.log_server_event(
+                        "authorization_circuit_changed",
+                        f"Authorization circuit breaker {previous} -> {state}",
+                        previous_state=previous,
+                        circuit_state=state,
+                    ),
+                ),
+                call_timeout=config.breaker_call_timeout,
+                fallback=config.breaker_fallback,
+                max_staleness=config.breaker_max_staleness,
+            )
+    else:
+        return None
+    
+    if config.cache_enabled:
+        caching = CachingAuthorizer(
+            authorizer,
+            TTLCache(config.cache_max_size),
+            allow_ttl=config.cache_allow_ttl,
+            deny_ttl=config.cache_deny_ttl,
+        )
+        if store is not None:
+            # Decisions cached under the previous policy set are no longer valid
+            store.subscribe(lambda engine: caching.invalidate())
+        authorizer = caching
+    return authorizer
+
+
+class AuthorizationMiddleware(Middleware):
+    """FastMCP middleware enforcing authorizer decisions on tool calls and listings."""
+    
+    def __init__(
+        self,
+        authorizer: Authorizer,
+        audit_logger: Optional[AuditLogger] = None,
+        tracer: Optional[Tracer] = None,
+        tool_lists: Optional[ToolListCache] = None,
+        principals: Optional[PrincipalResolver] = None,
+    ):
+        """Initialize the middleware; ``tool_lists`` caches tools/list visibility and results."""
+        self.authorizer = authorizer
+        self.audit_logger = audit_logger or get_audit_logger()
+        self.tracer = tracer or get_tracer()
+        self.tool_lists = tool_lists
+        self.principals = principals or PrincipalResolver()
+    
+    async def on_call_tool(self, context: MiddlewareContext, call_next: Any) -> Any:
+        """Reject tool calls the principal is not allowed to make."""
+        principal = self.principals()
+        resource = tool_resource(context.message.name)
+        extra: Dict[str, Any] = {}
+        if self.authorizer.circuit_state is not None:
+            extra["circuit_state"] = self.authorizer.circuit_state
+        
+        try:
+            with self.tracer.span("authorization", resource=resource):
+                decision = await self.authorizer.authorize(principal, TOOL_CALL_ACTION, resource)
+        except AuthorizationUnavailableError as e:
+            self.audit_logger.log_authorization_check(
+                user_id=principal.user_id,
+                user_role=principal.role,
+                resource=resource,
+                action=TOOL_CALL_ACTION,
+                result="error",
+                error_message=str(e),
+                **extra,
+            )
+            raise ToolError("Authorization service unavailable") from e
+        
+        if decision.stale:
+            extra["stale"] = True
+        self.audit_logger.log_authorization_check(
+            user_id=principal.user_id,
+            user_role=principal.role,
+            resource=resource,
+            action=TOOL_CALL_ACTION,
+            result="allowed" if decision.allowed else "denied",
+            policy_id=decision.policy_id,
+            policy_version=decision.policy_version,
+            **extra,
+        )
+        
+        if not decision.allowed:
+            raise ToolError(f"Access denied to tool '{context.message.name}'")
+        return await call_next(context)
+    
+    async def on_list_tools(self, context: MiddlewareContext, call_next: Any) -> Any:
+        """Only list the tools the principal is allowed to see."""
+        tools = await call_next(context)
+        if self.tool_lists is not None:
+            # Tools may be registered on the FastMCP app directly, bypassing the server
+            self.tool_lists.sync(tools)
+        principal = self.principals()
+        visible = await self.visible_tool_names(principal, tools)
+        if self.tool_lists is None:
+            return [tool for tool in tools if tool.name in visible]
+        return self.tool_lists.tools(visible, tools)
+    
+    async def visible_tool_names(self, principal: Principal, tools: Sequence[Any]) -> FrozenSet[str]:
+        """Get the names of the tools the principal may list."""
+        if self.tool_lists is not None:
+            visible = self.tool_lists.visibility(principal)
+            if visible is not None:
+                return visible
+        
+        try:
+            decisions = await self.authorizer.authorize_many(
+                principal, [(TOOL_LIST_ACTION, tool_resource(tool.name)) for tool in tools]
+            )
+            visible = frozenset(tool.name for tool, decision in zip(tools, decisions, strict=True) if decision.allowed)
+        except AuthorizationUnavailableError:
+            # Fail closed: without decisions no tool is visible
+            return frozenset()
+        except ValueError:
+            # Fail closed as well when the decisions do not match the requested tools one to one
+            logger.error("Authorizer returned a mismatched number of tools/list decisions")
+            return frozenset()
+        
+        # Stale fallback decisions are served but not remembered
+        if self.tool_lists is not None and not any(decision.stale for decision in decisions):
+            self.tool_lists.remember_visibility(principal, visible)
+        return visible
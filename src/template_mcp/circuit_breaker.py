@@ -0,0 +1,103 @@
+"""Circuit breaker guarding calls to remote dependencies."""
+
+import time
+from typing import Any, Callable, Dict, Optional
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker with a single half-open probe.
+    
+    A call counts as failed when it raises or takes longer than
+    ``slow_call_seconds``. After ``failure_threshold`` consecutive failures the
+    circuit opens and callers are rejected for ``open_seconds``; the next
+    caller then becomes the half-open probe, whose outcome closes or re-opens
+    the circuit.
+    """
+    
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        slow_call_seconds: float = 1.0,
+        open_seconds: float = 30.0,
+        on_state_change: Optional[Callable[[str, str], None]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize the breaker in the closed state."""
+        self.failure_threshold = failure_threshold
+        self.slow_call_seconds = slow_call_seconds
+        self.open_seconds = open_seconds
+        self.on_state_change = on_state_change
+        self._clock = clock
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self._probe_in_flight = False
+        self.total_failures = 0
+        self.slow_calls = 0
+        self.rejected = 0
+        self.times_opened = 0
+    
+    def _transition(self, state: str) -> None:
+        """Move to a new state and notify the listener."""
+        previous, self.state = self.state, state
+        if state == OPEN:
+            self.opened_at = self._clock()
+            self.times_opened += 1
+        if previous != state and self.on_state_change is not None:
+            self.on_state_change(previous, state)
+    
+    def allow_request(self) -> bool:
+        """Check whether a call may go through, claiming the probe slot when half-open."""
+        if self.state == CLOSED:
+            return True
+        
+        if self.state == OPEN and self._clock() - self.opened_at >= self.open_seconds:
+            self._transition(HALF_OPEN)
+        
+        if self.state == HALF_OPEN and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return True
+        
+        self.rejected += 1
+        return False
+    
+    def record_success(self, duration: float) -> None:
+        """Record a completed call; slow calls count as failures."""
+        if duration > self.slow_call_seconds:
+            self.slow_calls += 1
+            self.record_failure()
+            return
+        
+        self._probe_in_flight = False
+        self.consecutive_failures = 0
+        if self.state == HALF_OPEN:
+            self._transition(CLOSED)
+    
+    def record_cancelled(self) -> None:
+        """Release the probe slot of a call that was cancelled before completing."""
+        self._probe_in_flight = False
+    
+    def record_failure(self) -> None:
+        """Record a failed call."""
+        self._probe_in_flight = False
+        self.total_failures += 1
+        self.consecutive_failures += 1
+        if self.state == HALF_OPEN or (
+            self.state == CLOSED and self.consecutive_failures >= self.failure_threshold
+        ):
+            self._transition(OPEN)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get breaker state and counters."""
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "total_failures": self.total_failures,
+            "slow_calls": self.slow_calls,
+            "rejected": self.rejected,
+            "times_opened": self.times_opened,
+        }
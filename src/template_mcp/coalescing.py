@@ -0,0 +1,163 @@
+"""Singleflight coalescing of identical in-flight tool calls."""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Sequence, Tuple
+
+from fastmcp.server.middleware import Middleware, MiddlewareContext
+
+from .authorization import Principal, PrincipalResolver
+from .counters import SharedCounters
+from .logging import AuditLogger, get_audit_logger
+from .result_cache import canonical_arguments
+
+# (user id, role, tool name, canonical arguments)
+CallKey = Tuple[Optional[str], str, str, str]
+
+
+class _Flight:
+    """One shared execution and the number of callers awaiting it."""
+    
+    __slots__ = ("task", "waiters")
+    
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class Singleflight:
+    """Run at most one execution per key; concurrent callers with the same key share it.
+    
+    The execution runs as its own task, so a cancelled caller does not
+    cancel it for the others; it is cancelled only once every caller has
+    gone. Results and exceptions are delivered to every caller, and the key
+    is released as soon as the execution finishes, so later calls (including
+    retries after an error) start a new one.
+    """
+    
+    def __init__(self):
+        """Initialize the group."""
+        self._flights: Dict[Hashable, _Flight] = {}
+        self.executions = 0
+        self.coalesced = 0
+    
+    def __len__(self) -> int:
+        """Return the number of executions in flight."""
+        return len(self._flights)
+    
+    def __contains__(self, key: Hashable) -> bool:
+        """Whether an execution for ``key`` is in flight."""
+        return key in self._flights
+    
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Await ``fn()``, or the execution already in flight for ``key``."""
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = _Flight(asyncio.ensure_future(fn()))
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda task: self._finished(key, flight))
+            self.executions += 1
+        else:
+            self.coalesced += 1
+        
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                # Every caller was cancelled; nobody is left to use the result
+                flight.task.cancel()
+    
+    def _finished(self, key: Hashable, flight: _Flight) -> None:
+        """Release the key of a finished execution."""
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+        if not flight.task.cancelled():
+            # Marks the exception retrieved when every caller was cancelled first
+            flight.task.exception()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get execution and coalescing counters."""
+        calls = self.executions + self.coalesced
+        return {
+            "in_flight": len(self._flights),
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "coalesced_ratio": self.coalesced / calls if calls else 0.0,
+        }
+
+
+def _is_error(result: Any) -> bool:
+    """Whether a tool result (a handler dict or an MCP result object) reports an error."""
+    if isinstance(result, dict):
+        return bool(result.get("isError"))
+    return bool(getattr(result, "isError", False))
+
+
+class CoalescingMiddleware(Middleware):
+    """Share one execution between identical concurrent calls of the same principal.
+    
+    Placed outside the authorization middleware, so coalesced calls share
+    the authorization check as well as the handler. Calls are identical when
+    tool name, canonicalized arguments, user id and role all match. Only the
+    first call runs the handler, which counts and audits it; every joined
+    call is counted and audited here with ``coalesced=True``, like result
+    cache hits, so request counts and the audit trail stay complete.
+    """
+    
+    def __init__(
+        self,
+        tools: Optional[Sequence[str]] = None,
+        principals: Optional[PrincipalResolver] = None,
+        counters: Optional[SharedCounters] = None,
+        audit_logger: Optional[AuditLogger] = None,
+    ):
+        """Initialize the middleware; ``tools`` limits coalescing to those tools (all when empty)."""
+        self.tools = frozenset(tools or ())
+        self.principals = principals or PrincipalResolver()
+        self.counters = counters
+        self.audit_logger = audit_logger or get_audit_logger()
+        self.flights = Singleflight()
+    
+    async def on_call_tool(self, context: MiddlewareContext, call_next: Any) -> Any:
+        """Join an identical in-flight call, or start one."""
+        name = context.message.name
+        if self.tools and name not in self.tools:
+            return await call_next(context)
+        
+        principal = self.principals()
+        key: CallKey = (principal.user_id, principal.role, name, canonical_arguments(context.message.arguments))
+        if key not in self.flights:
+            return await self.flights.do(key, lambda: call_next(context))
+        
+        start_ns = time.perf_counter_ns()
+        try:
+            result = await self.flights.do(key, lambda: call_next(context))
+        except Exception as e:
+            self._record_joined(name, principal, start_ns, "error", str(e))
+            raise
+        self._record_joined(name, principal, start_ns, "error" if _is_error(result) else "success")
+        return result
+    
+    def _record_joined(
+        self, name: str, principal: Principal, start_ns: int, outcome: str, error_message: Optional[str] = None
+    ) -> None:
+        """Count and audit a call answered by another call's execution."""
+        duration_ns = time.perf_counter_ns() - start_ns
+        if self.counters is not None:
+            self.counters.start(name)
+            self.counters.finish(name, duration_ns, error=outcome == "error")
+        self.audit_logger.log_tool_execution(
+            tool_name=name,
+            user_id=principal.user_id,
+            user_role=principal.role,
+            result=outcome,
+            execution_time_ms=duration_ns / 1_000_000,
+            error_message=error_message,
+            coalesced=True,
+        )
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get coalescing counters."""
+        return {"tools": sorted(self.tools) or "all", **self.flights.get_stats()}
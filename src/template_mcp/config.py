@@ -2,7 +2,7 @@
 
 import os
 from pathlib import Path
-from typing import Optional
+from typing import Dict, List, Literal, Optional
 
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -16,6 +16,59 @@ class LoggingConfig(BaseSettings):
     file_enabled: bool = Field(default=True, description="Enable file logging")
     file_path: str = Field(default="logs/mcp_server.log", description="Log file path")
     console_enabled: bool = Field(default=True, description="Enable console logging")
+    console_output: Literal["auto", "stdout", "stderr", "file", "socket"] = Field(
+        default="auto",
+        description="Console log destination: auto (stderr with the stdio transport, stdout otherwise), "
+        "stdout, stderr, file or socket",
+    )
+    console_path: str = Field(
+        default="logs/console.log", description="File (console_output=file) or Unix socket (console_output=socket)"
+    )
+    json_encoder: Literal["stdlib", "orjson"] = Field(
+        default="stdlib", description="JSON encoder for serialized logs: stdlib or orjson (requires the orjson extra)"
+    )
+    caller_info: bool = Field(
+        default=True, description="Record the calling module, function and line (walks stack frames per record)"
+    )
+
+
+class AuditConfig(BaseSettings):
+    """Audit pipeline configuration."""
+    
+    file_path: str = Field(default="logs/audit.log", description="Audit events file (JSON lines)")
+    buffer_size: int = Field(default=10000, description="Audit events buffered before overflow", gt=0)
+    batch_size: int = Field(default=256, description="Maximum audit events written per batch", gt=0)
+    flush_interval: float = Field(default=0.5, description="Seconds between writes of partial batches", gt=0)
+    overflow_policy: Literal["block", "drop_oldest", "drop_success"] = Field(
+        default="drop_oldest",
+        description="When the buffer is full: block, drop_oldest or drop_success (shed success events only)",
+    )
+    storage: Literal["jsonl", "segments", "sidecar"] = Field(
+        default="jsonl",
+        description="Audit storage: jsonl (file_path), segments (segment_dir) or sidecar (shipped to audit-sidecar)",
+    )
+    segment_dir: str = Field(default="logs/audit", description="Directory of binary audit segments")
+    segment_max_bytes: int = Field(default=64 * 1024 * 1024, description="Segment size that triggers rotation", gt=0)
+    segment_max_age: float = Field(default=3600.0, description="Segment age in seconds that triggers rotation", gt=0)
+    sidecar_socket: str = Field(default="logs/audit-sidecar.sock", description="Unix socket of the audit sidecar")
+    sidecar_timeout: float = Field(default=5.0, description="Seconds to wait for a sidecar acknowledgement", gt=0)
+    spill_dir: str = Field(default="logs/audit-spill", description="Batches kept here while the sidecar is down")
+    sidecar_max_bytes: int = Field(default=64 * 1024 * 1024, description="Sidecar file size for rotation", gt=0)
+    sidecar_max_age: float = Field(default=86400.0, description="Sidecar file age in seconds for rotation", gt=0)
+    sidecar_retention: float = Field(default=30 * 86400.0, description="Seconds rotated sidecar files are kept", gt=0)
+    sidecar_compression: bool = Field(default=True, description="Gzip rotated sidecar files")
+    sample_rate: float = Field(
+        default=1.0,
+        description="Fraction of routine success events written; errors, denials and admin actions are always kept",
+        ge=0,
+        le=1,
+    )
+    sample_rates: Dict[str, float] = Field(
+        default_factory=dict, description="Sample rate overrides keyed by 'tool', 'tool:role' or '*:role'"
+    )
+    sample_report_interval: float = Field(
+        default=60.0, description="Seconds between summary records counting sampled-out events", gt=0
+    )
 
 
 class EunomiaConfig(BaseSettings):
@@ -24,7 +77,59 @@ class EunomiaConfig(BaseSettings):
     server_url: str = Field(default="http://localhost:8000", description="Eunomia authorization server URL")
     policies_file: str = Field(default="configs/eunomia_policies.json", description="Path to policies file")
     timeout: int = Field(default=30, description="Request timeout in seconds")
+    connect_timeout: float = Field(default=5.0, description="Connection timeout in seconds", gt=0)
+    read_timeout: float = Field(default=10.0, description="Read timeout in seconds", gt=0)
+    pool_max_connections: int = Field(default=100, description="Maximum pooled connections", gt=0)
+    pool_max_keepalive: int = Field(default=20, description="Maximum idle keep-alive connections", ge=0)
+    pool_keepalive_expiry: float = Field(default=30.0, description="Seconds an idle connection is kept open", ge=0)
+    http2: bool = Field(default=False, description="Use HTTP/2 multiplexing (requires the http2 extra)")
     enabled: bool = Field(default=True, description="Enable Eunomia authorization")
+    mode: Literal["middleware", "remote", "local"] = Field(
+        default="middleware",
+        description="Decision mode: middleware (stock Eunomia middleware), remote (Eunomia server) "
+        "or local (embedded policy engine)",
+    )
+    policy_reload_interval: float = Field(
+        default=0.0, description="Seconds between policy file change checks in local mode (0 disables)", ge=0
+    )
+    policy_reload_on_sighup: bool = Field(default=True, description="Reload the policy file on SIGHUP in local mode")
+    breaker_enabled: bool = Field(default=True, description="Guard remote decisions with a circuit breaker")
+    breaker_failure_threshold: int = Field(default=5, description="Consecutive failures that open the circuit", gt=0)
+    breaker_slow_call_ms: float = Field(default=1000.0, description="Calls slower than this count as failures", gt=0)
+    breaker_call_timeout: float = Field(default=2.0, description="Seconds to wait for a remote decision", gt=0)
+    breaker_open_seconds: float = Field(default=30.0, description="Seconds the circuit stays open before probing", gt=0)
+    breaker_fallback: Literal["fail_fast", "stale"] = Field(
+        default="fail_fast", description="Behaviour while open: fail_fast or stale (serve last known decisions)"
+    )
+    breaker_max_staleness: float = Field(
+        default=300.0, description="Maximum age in seconds of last known decisions served while open", ge=0
+    )
+    cache_enabled: bool = Field(default=False, description="Cache authorization decisions")
+    cache_max_size: int = Field(default=10000, description="Maximum number of cached decisions", gt=0)
+    cache_allow_ttl: float = Field(default=60.0, description="Seconds an allow decision stays cached", ge=0)
+    cache_deny_ttl: float = Field(default=5.0, description="Seconds a deny decision stays cached", ge=0)
+
+
+class AuthConfig(BaseSettings):
+    """Caller authentication configuration."""
+    
+    jwt_jwks_uri: Optional[str] = Field(default=None, description="JWKS URI verifying bearer tokens on HTTP transports")
+    jwt_public_key: Optional[str] = Field(default=None, description="PEM public key verifying bearer tokens")
+    jwt_issuer: Optional[str] = Field(default=None, description="Required issuer of bearer tokens")
+    jwt_audience: Optional[str] = Field(default=None, description="Required audience of bearer tokens")
+    role_claim: str = Field(default="role", description="Token claim holding the caller's role")
+    default_role: Literal["admin", "user", "guest"] = Field(
+        default="guest", description="Role of callers without a token or role (e.g. stdio clients)"
+    )
+
+
+class TracingConfig(BaseSettings):
+    """Span tracing configuration."""
+    
+    enabled: bool = Field(default=False, description="Record spans for sampled tool calls")
+    sample_rate: float = Field(default=0.01, description="Fraction of tool calls traced", ge=0, le=1)
+    export_path: str = Field(default="logs/traces.jsonl", description="File receiving OTLP JSON trace batches")
+    batch_size: int = Field(default=256, description="Spans buffered before each export", gt=0)
 
 
 class McpServerConfig(BaseSettings):
@@ -34,6 +139,44 @@ class McpServerConfig(BaseSettings):
     version: str = Field(default="0.1.0", description="Server version")
     port: int = Field(default=3000, description="Server port")
     host: str = Field(default="localhost", description="Server host")
+    transport: Literal["stdio", "http", "sse"] = Field(
+        default="stdio", description="Transport: stdio, http (streamable HTTP) or sse"
+    )
+    http_path: str = Field(default="/mcp", description="Endpoint path for the HTTP and SSE transports")
+    stdio_buffer_size: int = Field(
+        default=64 * 1024, description="Buffer size of the stdout writer dedicated to the stdio transport", gt=0
+    )
+    workers: int = Field(default=1, description="Worker processes sharing the port (HTTP transports only)", ge=1)
+    worker_socket_mode: Literal["reuseport", "prefork"] = Field(
+        default="reuseport", description="How workers share the port: reuseport (SO_REUSEPORT) or prefork"
+    )
+    worker_max_restart_delay: float = Field(
+        default=60.0, description="Upper bound in seconds of the backoff between restarts of a crashing worker", gt=0
+    )
+    greetings_file: Optional[str] = Field(
+        default=None, description="Greeting catalog JSON file for the hello tool (the packaged catalog when unset)"
+    )
+    greeting_cache_size: int = Field(
+        default=0, description="Rendered hello results kept in an LRU cache (0 disables the cache)", ge=0
+    )
+    result_cache_enabled: bool = Field(default=True, description="Cache results of tools declared cacheable")
+    result_cache_ttls: Dict[str, float] = Field(
+        default_factory=dict, description="Result cache TTL overrides in seconds by tool name (0 disables a tool)"
+    )
+    coalesce_enabled: bool = Field(
+        default=False, description="Share one execution between identical concurrent calls of the same principal"
+    )
+    coalesce_tools: List[str] = Field(
+        default_factory=list, description="Tools whose identical calls are coalesced (all tools when empty)"
+    )
+    tools_list_cache_enabled: bool = Field(
+        default=True, description="Cache tools/list results per tool registry version and visibility set"
+    )
+    tools_list_visibility_ttl: float = Field(
+        default=60.0, description="Seconds the tools visible to a principal are remembered", gt=0
+    )
+    metrics_enabled: bool = Field(default=True, description="Serve Prometheus metrics next to the HTTP transports")
+    metrics_path: str = Field(default="/metrics", description="Path of the Prometheus metrics endpoint")
     debug: bool = Field(default=False, description="Enable debug mode")
 
 
@@ -52,8 +195,11 @@ class AppConfig(BaseSettings):
     
     # Nested configurations
     logging: LoggingConfig = Field(default_factory=LoggingConfig)
+    audit: AuditConfig = Field(default_factory=AuditConfig)
+    auth: AuthConfig = Field(default_factory=AuthConfig)
     eunomia: EunomiaConfig = Field(default_factory=EunomiaConfig)
     mcp_server: McpServerConfig = Field(default_factory=McpServerConfig)
+    tracing: TracingConfig = Field(default_factory=TracingConfig)
     
     def __init__(self, **kwargs):
         """Initialize configuration with environment-specific settings."""
@@ -74,7 +220,7 @@ class AppConfig(BaseSettings):
                 self.model_config["env_file"] = env_file
         
         super().__init__(**kwargs)
-        
+    
     @property
     def is_development(self) -> bool:
         """Check if running in development environment."""
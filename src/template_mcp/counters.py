@@ -0,0 +1,180 @@
+"""Shared-memory request counters aggregated across worker processes."""
+
+import mmap
+from typing import Dict, List, Optional, Tuple
+
+# Counter fields reported for every tool
+FIELDS = ("requests", "errors", "in_flight")
+
+# Latency histograms: bucket i counts durations below 2 ** (LATENCY_BASE_SHIFT + i)
+# nanoseconds (1 µs, 2 µs, ... ~34 s); the last bucket catches everything slower
+LATENCY_BASE_SHIFT = 10
+LATENCY_BUCKETS = 26
+OUTCOMES = ("success", "error")
+
+# Slot layout: started calls, then one histogram per outcome made of the
+# finite buckets, the overflow bucket and the sum of durations. Completed and
+# failed calls are the histogram counts, so a call costs three writes.
+_REQUESTS = 0
+_HISTOGRAM_SIZE = LATENCY_BUCKETS + 2
+_SUCCESS_HISTOGRAM = 1
+_ERROR_HISTOGRAM = 1 + _HISTOGRAM_SIZE
+_SLOT_SIZE = 1 + len(OUTCOMES) * _HISTOGRAM_SIZE
+
+OTHER_TOOL = "_other"
+
+# Bucket counts (finite buckets followed by the overflow bucket) and total nanoseconds
+Histogram = Tuple[List[int], int]
+
+
+class SharedCounters:
+    """Per-tool request, error and in-flight counters in shared memory.
+    
+    The block is an anonymous shared mapping of int64 values laid out as
+    ``[worker][tool][field]``, each tool slot holding its started calls and
+    one log2 latency histogram per outcome. It is created before workers are
+    forked so every worker maps the same pages. Each worker only writes its
+    own slot, so updates need no locks; reads sum the slots of all workers.
+    
+    Tool slots are assigned in registration order. Workers only agree on
+    that order for tools registered before forking, so the supervisor calls
+    :meth:`seal` first; tools first seen afterwards, or registered past
+    ``max_tools``, share an overflow slot.
+    """
+    
+    def __init__(self, workers: int = 1, max_tools: int = 64):
+        """Allocate the shared counter block."""
+        if workers < 1 or max_tools < 1:
+            raise ValueError("SharedCounters needs at least one worker and one tool slot")
+        self.workers = workers
+        self.max_tools = max_tools
+        self._stride = max_tools * _SLOT_SIZE
+        self._buffer = mmap.mmap(-1, workers * self._stride * 8)
+        self._values = memoryview(self._buffer).cast("q")
+        self._tools: Dict[str, int] = {}
+        self._next_index = 0
+        self._offsets: Dict[str, int] = {}
+        self._sealed = False
+        self.worker_id = 0
+        self._base = 0
+    
+    def bind_worker(self, worker_id: int) -> None:
+        """Select the slot this process writes to."""
+        if not 0 <= worker_id < self.workers:
+            raise ValueError(f"Worker id {worker_id} out of range for {self.workers} workers")
+        self.worker_id = worker_id
+        self._base = worker_id * self._stride
+        # Offsets were computed for the previous slot
+        self._offsets = {name: self._base + index * _SLOT_SIZE for name, index in self._tools.items()}
+    
+    def seal(self) -> None:
+        """Stop assigning new slots so forked workers keep identical slot indexes."""
+        self._sealed = True
+    
+    def register_tool(self, name: str) -> None:
+        """Assign a counter slot to a tool."""
+        if name in self._tools:
+            return
+        if not self._sealed and self._next_index < self.max_tools - 1:
+            self._tools[name] = self._next_index
+            self._next_index += 1
+        else:
+            self._tools[name] = self.max_tools - 1
+        self._offsets[name] = self._base + self._tools[name] * _SLOT_SIZE
+    
+    def _offset(self, tool: str) -> int:
+        """Get this worker's offset for a tool, registering it on first use."""
+        offset = self._offsets.get(tool)
+        if offset is None:
+            self.register_tool(tool)
+            offset = self._offsets[tool]
+        return offset
+    
+    def start(self, tool: str) -> None:
+        """Record the start of a tool call."""
+        offset = self._offsets.get(tool)
+        if offset is None:
+            offset = self._offset(tool)
+        self._values[offset + _REQUESTS] += 1
+    
+    def finish(self, tool: str, duration_ns: int, error: bool = False) -> None:
+        """Record the end of a tool call started with :meth:`start` and its latency."""
+        offset = self._offsets.get(tool)
+        if offset is None:
+            offset = self._offset(tool)
+        bucket = (duration_ns >> LATENCY_BASE_SHIFT).bit_length()
+        if bucket > LATENCY_BUCKETS:
+            bucket = LATENCY_BUCKETS
+        histogram = offset + (_ERROR_HISTOGRAM if error else _SUCCESS_HISTOGRAM)
+        values = self._values
+        values[histogram + bucket] += 1
+        values[histogram + LATENCY_BUCKETS + 1] += duration_ns
+    
+    def _slots(self) -> Dict[str, List[int]]:
+        """Sum the slot of every tool across all workers."""
+        overflow = self.max_tools - 1
+        names: Dict[int, str] = {}
+        for name, index in self._tools.items():
+            if index == overflow and index in names:
+                names[index] = OTHER_TOOL
+            else:
+                names.setdefault(index, name)
+        if self._sealed:
+            # Other workers may have written tools this process has never seen
+            names[overflow] = OTHER_TOOL
+        
+        result: Dict[str, List[int]] = {}
+        for index, name in names.items():
+            totals: List[int] = [0] * _SLOT_SIZE
+            for worker in range(self.workers):
+                offset = worker * self._stride + index * _SLOT_SIZE
+                slot = self._values[offset:offset + _SLOT_SIZE]
+                for field in range(_SLOT_SIZE):
+                    totals[field] += slot[field]
+            result[name] = totals
+        return result
+    
+    def snapshot(self) -> Dict[str, Dict[str, int]]:
+        """Aggregate counters for every tool across all workers."""
+        result: Dict[str, Dict[str, int]] = {}
+        for name, slot in self._slots().items():
+            succeeded = sum(slot[_SUCCESS_HISTOGRAM:_SUCCESS_HISTOGRAM + LATENCY_BUCKETS + 1])
+            failed = sum(slot[_ERROR_HISTOGRAM:_ERROR_HISTOGRAM + LATENCY_BUCKETS + 1])
+            requests = slot[_REQUESTS]
+            # Slots are read without locks, so a call may be seen finished before started
+            in_flight = max(0, requests - succeeded - failed)
+            result[name] = dict(zip(FIELDS, (requests, failed, in_flight), strict=True))
+        return result
+    
+    def histograms(self) -> Dict[str, Dict[str, Histogram]]:
+        """Aggregate latency histograms for every tool and outcome across all workers."""
+        result: Dict[str, Dict[str, Histogram]] = {}
+        for name, slot in self._slots().items():
+            result[name] = {}
+            for outcome, start in zip(OUTCOMES, (_SUCCESS_HISTOGRAM, _ERROR_HISTOGRAM), strict=True):
+                result[name][outcome] = (slot[start:start + LATENCY_BUCKETS + 1], slot[start + LATENCY_BUCKETS + 1])
+        return result
+    
+    def total(self, field: str = "requests") -> int:
+        """Sum one counter field over all tools and workers."""
+        return sum(counters[field] for counters in self.snapshot().values())
+    
+    def close(self) -> None:
+        """Release the mapping."""
+        self._values.release()
+        self._buffer.close()
+
+
+# Counter block shared with forked workers, set by the supervisor process
+_shared_counters: Optional[SharedCounters] = None
+
+
+def get_shared_counters() -> Optional[SharedCounters]:
+    """Get the counter block shared across workers, if running in worker mode."""
+    return _shared_counters
+
+
+def set_shared_counters(counters: Optional[SharedCounters]) -> None:
+    """Set the counter block shared across workers."""
+    global _shared_counters
+    _shared_counters = counters
@@ -0,0 +1,94 @@
+"""Pooled keep-alive HTTP client for the Eunomia authorization server."""
+
+import importlib.util
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from .config import EunomiaConfig
+from .logging import get_logger
+
+
+class EunomiaClient:
+    """Shared connection pool for every call made to the Eunomia server."""
+    
+    def __init__(self, config: EunomiaConfig, transport: Optional[httpx.AsyncBaseTransport] = None):
+        """Initialize the client settings; the pool is created on first use."""
+        self.config = config
+        self._transport = transport
+        self.base_url = config.server_url.rstrip("/")
+        self.logger = get_logger(__name__)
+        self._client: Optional[httpx.AsyncClient] = None
+        self.requests = 0
+    
+    @property
+    def http2(self) -> bool:
+        """Whether HTTP/2 multiplexing is enabled and available."""
+        return self.config.http2 and importlib.util.find_spec("h2") is not None
+    
+    def _build_client(self) -> httpx.AsyncClient:
+        """Create the pooled HTTP client from configuration."""
+        if self.config.http2 and not self.http2:
+            self.logger.warning("HTTP/2 requested for Eunomia but 'h2' is not installed, using HTTP/1.1")
+        
+        return httpx.AsyncClient(
+            base_url=self.base_url,
+            http2=self.http2,
+            transport=self._transport,
+            limits=httpx.Limits(
+                max_connections=self.config.pool_max_connections,
+                max_keepalive_connections=self.config.pool_max_keepalive,
+                keepalive_expiry=self.config.pool_keepalive_expiry,
+            ),
+            timeout=httpx.Timeout(
+                self.config.timeout,
+                connect=self.config.connect_timeout,
+                read=self.config.read_timeout,
+            ),
+        )
+    
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Get the pooled HTTP client, creating it if needed."""
+        if self._client is None or self._client.is_closed:
+            self._client = self._build_client()
+        return self._client
+    
+    async def start(self) -> None:
+        """Open the pool and warm a connection to the Eunomia server."""
+        try:
+            response = await self.client.get("/health")
+            response.raise_for_status()
+            self.logger.info("Eunomia connection pool warmed ({})", self.base_url)
+        except httpx.HTTPError as e:
+            self.logger.warning("Could not warm Eunomia connection pool: {}", e)
+    
+    async def close(self) -> None:
+        """Close all pooled connections."""
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
+    
+    async def check(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Send a single authorization check."""
+        self.requests += 1
+        response = await self.client.post("/check", json=payload)
+        response.raise_for_status()
+        return response.json()
+    
+    async def check_bulk(self, payloads: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Send several authorization checks in one request."""
+        self.requests += 1
+        response = await self.client.post("/check/bulk", json=payloads)
+        response.raise_for_status()
+        return response.json()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get connection pool settings and counters."""
+        return {
+            "server_url": self.base_url,
+            "http2": self.http2,
+            "max_connections": self.config.pool_max_connections,
+            "requests": self.requests,
+            "open": self._client is not None and not self._client.is_closed,
+        }
@@ -0,0 +1,108 @@
+"""Greeting catalog for the hello tool, loaded once from a JSON data file."""
+
+import json
+import string
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .cache import MISSING, LRUCache
+
+DEFAULT_CATALOG = Path(__file__).parent / "data" / "greetings.json"
+
+# Literal text before and after the ``{name}`` field of a greeting template
+CompiledTemplate = Tuple[str, str]
+
+
+def compile_template(template: str) -> CompiledTemplate:
+    """Split a greeting template around its single ``{name}`` field."""
+    parts = list(string.Formatter().parse(template))
+    fields = [(field, spec, conversion) for _, field, spec, conversion in parts if field is not None]
+    if fields != [("name", "", None)]:
+        raise ValueError(f"Greeting template must contain exactly one plain {{name}} field: {template!r}")
+    
+    # Escaped braces split the literal text into several parts
+    field_index = next(i for i, part in enumerate(parts) if part[1] is not None)
+    prefix = "".join(literal for literal, _, _, _ in parts[:field_index + 1])
+    suffix = "".join(literal for literal, _, _, _ in parts[field_index + 1:])
+    return prefix, suffix
+
+
+class GreetingCatalog:
+    """Precompiled greetings per language tag, with fallback from regional tags.
+    
+    Tags are matched case-insensitively and fall back by dropping subtags,
+    then to the default language: ``pt-BR`` tries ``pt-br``, ``pt`` and
+    finally ``en``. With ``cache_size`` set, rendered plain and HTML results
+    are kept in an LRU keyed by (name, language, format); JSON results carry
+    a timestamp and are always rendered.
+    """
+    
+    def __init__(self, greetings: Dict[str, str], default_language: str = "en", cache_size: int = 0):
+        """Compile the templates of the catalog."""
+        self._templates: Dict[str, CompiledTemplate] = {
+            tag.lower(): compile_template(template) for tag, template in greetings.items()
+        }
+        self.default_language = default_language.lower()
+        if self.default_language not in self._templates:
+            raise ValueError(f"Greeting catalog has no template for default language {default_language}")
+        self.cache: Optional[LRUCache] = LRUCache(cache_size) if cache_size else None
+    
+    @classmethod
+    def load(cls, path: Optional[str] = None, cache_size: int = 0) -> "GreetingCatalog":
+        """Load a catalog file, the packaged catalog by default."""
+        with open(path or DEFAULT_CATALOG, encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(data["greetings"], data.get("default_language", "en"), cache_size)
+    
+    def __len__(self) -> int:
+        """Return the number of languages in the catalog."""
+        return len(self._templates)
+    
+    def languages(self) -> List[str]:
+        """Get the language tags of the catalog, lowercased."""
+        return list(self._templates)
+    
+    def resolve(self, language: str) -> str:
+        """Get the catalog tag used for a requested language."""
+        tag = language.lower()
+        while tag:
+            if tag in self._templates:
+                return tag
+            tag = tag.rpartition("-")[0]
+        return self.default_language
+    
+    def greeting(self, name: str, language: str) -> str:
+        """Render the greeting for a name in a language."""
+        prefix, suffix = self._templates[self.resolve(language)]
+        return prefix + name + suffix
+    
+    def render(self, name: str, language: str, format: str) -> str:
+        """Render the hello tool result text in the plain, html or json format."""
+        if format == "json":
+            # The fields of HelloResponse as a JSON document, without building the model
+            return json.dumps({
+                "greeting": self.greeting(name, language),
+                "name": name,
+                "language": language,
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+            }, ensure_ascii=False)
+        
+        key = (name, language, format)
+        if self.cache is not None:
+            text = self.cache.get(key)
+            if text is not MISSING:
+                return text
+        
+        greeting = self.greeting(name, language)
+        text = f"<h1>{greeting}</h1><p>Welcome, <strong>{name}</strong>!</p>" if format == "html" else greeting
+        if self.cache is not None:
+            self.cache.set(key, text)
+        return text
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get catalog size and result cache counters."""
+        return {
+            "languages": len(self._templates),
+            "cache": self.cache.get_stats() if self.cache is not None else None,
+        }
@@ -0,0 +1,118 @@
+"""orjson-backed JSON serializers for loguru sinks and structlog output."""
+
+import sys
+import time
+from datetime import timedelta
+from typing import Any, BinaryIO, Callable, Dict, Optional
+
+import structlog
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # Optional dependency, installed with the orjson extra
+    orjson = None
+
+from .rotation import RotatingFile
+
+JSON_ENCODERS = ("stdlib", "orjson")
+
+
+def orjson_available() -> bool:
+    """Whether the orjson encoder can be used."""
+    return orjson is not None
+
+
+def orjson_default(value: Any) -> Any:
+    """Encode values orjson does not handle natively (datetimes and enums are native)."""
+    if isinstance(value, BaseModel):
+        return value.model_dump()
+    if isinstance(value, timedelta):
+        return value.total_seconds()
+    return str(value)
+
+
+def loguru_record(text: str, record: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the same document as loguru's ``serialize=True`` for one record."""
+    exception = record["exception"]
+    if exception is not None:
+        exception = {
+            "type": None if exception.type is None else exception.type.__name__,
+            "value": str(exception.value),
+            "traceback": bool(exception.traceback),
+        }
+    
+    return {
+        "text": text,
+        "record": {
+            "elapsed": {"repr": str(record["elapsed"]), "seconds": record["elapsed"].total_seconds()},
+            "exception": exception,
+            "extra": record["extra"],
+            "file": {"name": record["file"].name, "path": record["file"].path},
+            "function": record["function"],
+            "level": {"icon": record["level"].icon, "name": record["level"].name, "no": record["level"].no},
+            "line": record["line"],
+            "message": record["message"],
+            "module": record["module"],
+            "name": record["name"],
+            "process": {"id": record["process"].id, "name": record["process"].name},
+            "thread": {"id": record["thread"].id, "name": record["thread"].name},
+            "time": {"repr": record["time"], "timestamp": record["time"].timestamp()},
+        },
+    }
+
+
+class OrjsonStreamSink:
+    """Loguru sink writing each record as one orjson-encoded line to a binary stream.
+    
+    The encoded bytes go straight to the stream's buffer, without building
+    an intermediate str. Loguru treats it as a stream: it calls
+    :meth:`write` per record, then :meth:`flush`.
+    """
+    
+    def __init__(self, stream: Optional[BinaryIO] = None):
+        """Initialize the sink; defaults to the binary buffer of stdout."""
+        if orjson is None:
+            raise RuntimeError("The orjson serializer requires the 'orjson' package")
+        self.stream = stream if stream is not None else sys.stdout.buffer
+    
+    def write(self, message: Any) -> None:
+        """Write one record."""
+        document = loguru_record(message, message.record)
+        self.stream.write(orjson.dumps(document, default=orjson_default, option=orjson.OPT_APPEND_NEWLINE))
+    
+    def flush(self) -> None:
+        """Flush the stream."""
+        self.stream.flush()
+
+
+class OrjsonFileSink(OrjsonStreamSink):
+    """Binary log file sink with age-based rotation, retention and gzip compression.
+    
+    Mirrors the loguru file sink options used by :func:`setup_logging`
+    (``rotation="1 day"``, ``retention="30 days"``, ``compression="gz"``)
+    while writing orjson bytes without decoding them to str.
+    """
+    
+    def __init__(
+        self,
+        path: str,
+        rotation: float = 86400.0,
+        retention: float = 30 * 86400.0,
+        compression: bool = True,
+        clock: Callable[[], float] = time.time,
+    ):
+        """Open the log file for appending."""
+        self.file = RotatingFile(path, max_age=rotation, retention=retention, compression=compression, clock=clock)
+        super().__init__(self.file)
+    
+    def stop(self) -> None:
+        """Close the file; loguru calls this when the sink is removed."""
+        self.file.close()
+
+
+def orjson_renderer() -> structlog.processors.JSONRenderer:
+    """Get a structlog renderer producing orjson bytes, for ``BytesLoggerFactory``."""
+    if orjson is None:
+        raise RuntimeError("The orjson serializer requires the 'orjson' package")
+    return structlog.processors.JSONRenderer(serializer=orjson.dumps, default=orjson_default)
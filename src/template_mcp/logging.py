@@ -1,20 +1,72 @@
 """Structured logging setup for Template MCP server using loguru and structlog."""
 
+import io
 import logging
+import os
+import socket
 import sys
+import threading
+import time
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterator, Optional, TextIO
 
 import structlog
 from loguru import logger
 
-from .config import LoggingConfig
+from .audit_pipeline import AuditPipeline, AuditSink, JsonLinesFileSink
+from .audit_sampling import AuditSampler, create_sampler
+from .audit_segments import SegmentedAuditSink
+from .audit_shipping import SocketAuditSink
+from .config import AuditConfig, LoggingConfig
+from .log_serializers import JSON_ENCODERS, OrjsonFileSink, OrjsonStreamSink, orjson_available, orjson_renderer
 from .models import AuditLogEntry, LogLevel
 
 
+# Numeric severities of the loguru levels, matching the stdlib values
+LEVELS: Dict[str, int] = {
+    "TRACE": 5,
+    "DEBUG": 10,
+    "INFO": 20,
+    "SUCCESS": 25,
+    "WARNING": 30,
+    "ERROR": 40,
+    "CRITICAL": 50,
+}
+
+# Lowest severity any sink accepts; loguru's default stderr sink takes DEBUG
+_min_level = LEVELS["DEBUG"]
+
+# Caller fields, only recorded when LoggingConfig.caller_info is set
+_CALLER_FORMAT = "{name}:{function}:{line} | "
+
+CONSOLE_OUTPUTS = ("auto", "stdout", "stderr", "file", "socket")
+
+# Console stream opened by setup_logging for file and socket outputs
+_console_stream: Optional[TextIO] = None
+
+
+def level_number(level: str) -> int:
+    """Get the numeric severity of a level name."""
+    try:
+        return LEVELS[level.upper()]
+    except KeyError:
+        raise ValueError(f"Unsupported log level: {level}") from None
+
+
+def is_enabled(level: int) -> bool:
+    """Whether a record of the given severity would reach any sink."""
+    return level >= _min_level
+
+
 class LoguruHandler(logging.Handler):
     """Handler to bridge Python's logging to loguru."""
     
+    def __init__(self, level: int = logging.NOTSET, caller_info: bool = True):
+        """Initialize the handler; without caller info no stack frames are walked."""
+        super().__init__(level)
+        self.caller_info = caller_info
+    
     def emit(self, record: logging.LogRecord) -> None:
         """Emit a log record using loguru."""
         # Get corresponding loguru level if it exists
@@ -22,18 +74,92 @@ class LoguruHandler(logging.Handler):
             level = logger.level(record.levelname).name
         except ValueError:
             level = record.levelno
+        
+        depth = 0
+        if self.caller_info:
+            # Find caller from where the logging call was made
+            frame, depth = sys._getframe(6), 6
+            while frame and frame.f_code.co_filename == logging.__file__:
+                frame = frame.f_back
+                depth += 1
+        
+        logger.opt(depth=depth, exception=record.exc_info).log(level, record.getMessage())
 
-        # Find caller from where the logging call was made
-        frame, depth = sys._getframe(6), 6
-        while frame and frame.f_code.co_filename == logging.__file__:
-            frame = frame.f_back
-            depth += 1
 
-        logger.opt(depth=depth, exception=record.exc_info).log(level, record.getMessage())
+class GatedLogger:
+    """Loguru logger facade that returns after one comparison for disabled levels.
+    
+    Messages may use ``{}`` placeholders, filled from the extra arguments only
+    when a record is actually emitted, so hot paths pay no formatting cost
+    while their level is off. Loguru looks up the caller only for emitted
+    records.
+    """
+    
+    __slots__ = ("name", "_logger")
+    
+    def __init__(self, name: str):
+        """Bind a loguru logger to the name."""
+        self.name = name
+        # depth=1 attributes records to the facade's caller
+        self._logger = logger.bind(logger_name=name).opt(depth=1)
+    
+    def debug(self, message: str, *args: Any, **kwargs: Any) -> None:
+        """Log a debug message."""
+        if _min_level > 10:
+            return
+        self._logger.debug(message, *args, **kwargs)
+    
+    def info(self, message: str, *args: Any, **kwargs: Any) -> None:
+        """Log an info message."""
+        if _min_level > 20:
+            return
+        self._logger.info(message, *args, **kwargs)
+    
+    def warning(self, message: str, *args: Any, **kwargs: Any) -> None:
+        """Log a warning message."""
+        if _min_level > 30:
+            return
+        self._logger.warning(message, *args, **kwargs)
+    
+    def error(self, message: str, *args: Any, **kwargs: Any) -> None:
+        """Log an error message."""
+        if _min_level > 40:
+            return
+        self._logger.error(message, *args, **kwargs)
+    
+    def exception(self, message: str, *args: Any, **kwargs: Any) -> None:
+        """Log an error message with the current exception."""
+        if _min_level > 40:
+            return
+        self._logger.exception(message, *args, **kwargs)
+    
+    def critical(self, message: str, *args: Any, **kwargs: Any) -> None:
+        """Log a critical message."""
+        if _min_level > 50:
+            return
+        self._logger.critical(message, *args, **kwargs)
+    
+    def log(self, level: str, message: str, *args: Any, **kwargs: Any) -> None:
+        """Log a message at a level given by name."""
+        if LEVELS.get(level.upper(), _min_level) < _min_level:
+            return
+        self._logger.log(level.upper(), message, *args, **kwargs)
 
 
-def setup_structlog() -> None:
+def setup_structlog(level: str = "INFO", json_encoder: str = "stdlib", stream: Optional[TextIO] = None) -> None:
     """Configure structlog for structured logging."""
+    stream = stream if stream is not None else sys.stdout
+    if stream.isatty():
+        renderer: Any = structlog.dev.ConsoleRenderer()
+        logger_factory: Any = structlog.WriteLoggerFactory(file=stream)
+    elif json_encoder == "orjson":
+        # orjson renders bytes, written to the stream's buffer without decoding
+        renderer = orjson_renderer()
+        logger_factory = structlog.BytesLoggerFactory(file=stream.buffer)
+    else:
+        renderer = structlog.processors.JSONRenderer()
+        logger_factory = structlog.WriteLoggerFactory(file=stream)
+    
     structlog.configure(
         processors=[
             structlog.contextvars.merge_contextvars,
@@ -41,37 +167,119 @@ def setup_structlog() -> None:
             structlog.processors.StackInfoRenderer(),
             structlog.dev.set_exc_info,
             structlog.processors.TimeStamper(fmt="ISO"),
-            structlog.dev.ConsoleRenderer() if sys.stdout.isatty() else structlog.processors.JSONRenderer(),
+            renderer,
         ],
-        wrapper_class=structlog.make_filtering_bound_logger(logging.INFO),
-        logger_factory=structlog.WriteLoggerFactory(),
+        wrapper_class=structlog.make_filtering_bound_logger(level_number(level)),
+        logger_factory=logger_factory,
         cache_logger_on_first_use=True,
     )
 
 
-def setup_logging(config: LoggingConfig) -> None:
-    """Setup logging configuration using loguru and structlog."""
+def open_console_stream(config: LoggingConfig, transport: Optional[str] = None) -> TextIO:
+    """Open the stream console logs are written to.
+    
+    With the stdio transport stdout carries the JSON-RPC protocol, so logs
+    go to stderr by default and may never be sent to stdout.
+    """
+    output = config.console_output
+    if output == "auto":
+        output = "stderr" if transport == "stdio" else "stdout"
+    
+    if output == "stdout":
+        if transport == "stdio":
+            raise ValueError("Console logs cannot be written to stdout with the stdio transport")
+        return sys.stdout
+    if output == "stderr":
+        return sys.stderr
+    if output == "file":
+        path = Path(config.console_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        return path.open("a", encoding="utf-8", buffering=1)
+    if output == "socket":
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.connect(config.console_path)
+        except OSError:
+            sock.close()
+            raise
+        stream = sock.makefile("w", buffering=1, encoding="utf-8")
+        sock.close()  # The file object keeps the connection open
+        return stream
+    raise ValueError(f"Unsupported console output: {output}")
+
+
+@contextmanager
+def protocol_stdout(buffer_size: int = 64 * 1024) -> Iterator[TextIO]:
+    """Give the stdio transport its own buffered writer on stdout.
+    
+    The writer owns a duplicate of the stdout descriptor; ``sys.stdout``
+    points at it while the transport runs, so the transport's writes are
+    buffered together and flushed once per message instead of sharing the
+    interpreter's stdout object with anything else.
+    """
+    sys.stdout.flush()
+    writer = io.BufferedWriter(io.FileIO(os.dup(sys.stdout.fileno()), "wb"), buffer_size)
+    stream = io.TextIOWrapper(writer, encoding="utf-8", newline="\n")
+    original, sys.stdout = sys.stdout, stream
+    try:
+        yield stream
+    finally:
+        sys.stdout = original
+        stream.close()
+
+
+def resolve_json_encoder(json_encoder: str) -> str:
+    """Check the configured JSON encoder, falling back to stdlib json when orjson is missing."""
+    if json_encoder not in JSON_ENCODERS:
+        raise ValueError(f"Unsupported JSON encoder: {json_encoder}")
+    if json_encoder == "orjson" and not orjson_available():
+        logger.warning("orjson log serialization requested but 'orjson' is not installed, using json")
+        return "stdlib"
+    return json_encoder
+
+
+def setup_logging(config: LoggingConfig, transport: Optional[str] = None) -> None:
+    """Setup logging configuration using loguru and structlog.
+    
+    ``transport`` is the MCP transport in use; console logs are routed
+    according to it (see :func:`open_console_stream`).
+    """
+    global _min_level, _console_stream
+    level = config.level.upper()
+    level_no = level_number(level)
+    caller = _CALLER_FORMAT if config.caller_info else ""
+    json_format = "{time:YYYY-MM-DD HH:mm:ss.SSS} | {level} | " + caller + "{message}"
+    
     # Remove default loguru handler
     logger.remove()
+    json_encoder = resolve_json_encoder(config.json_encoder)
+    if _console_stream is not None:
+        _console_stream.close()
+        _console_stream = None
+    console = open_console_stream(config, transport)
+    if console not in (sys.stdout, sys.stderr):
+        _console_stream = console
     
     # Setup console logging if enabled
     if config.console_enabled:
-        if config.format == "json":
+        if config.format == "json" and json_encoder == "orjson":
+            logger.add(OrjsonStreamSink(console.buffer), level=level, format=json_format, enqueue=True)
+        elif config.format == "json":
             logger.add(
-                sys.stdout,
-                level=config.level.upper(),
-                format="{time:YYYY-MM-DD HH:mm:ss.SSS} | {level} | {name}:{function}:{line} | {message}",
+                console,
+                level=level,
+                format=json_format,
                 serialize=True,
                 enqueue=True,
             )
         else:
             logger.add(
-                sys.stdout,
-                level=config.level.upper(),
+                console,
+                level=level,
                 format="<green>{time:YYYY-MM-DD HH:mm:ss.SSS}</green> | "
                        "<level>{level: <8}</level> | "
-                       "<cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> | "
-                       "<level>{message}</level>",
+                       + ("<cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> | " if caller else "")
+                       + "<level>{message}</level>",
                 enqueue=True,
             )
     
@@ -81,28 +289,54 @@ def setup_logging(config: LoggingConfig) -> None:
         log_path = Path(config.file_path)
         log_path.parent.mkdir(parents=True, exist_ok=True)
         
-        logger.add(
-            config.file_path,
-            level=config.level.upper(),
-            format="{time:YYYY-MM-DD HH:mm:ss.SSS} | {level} | {name}:{function}:{line} | {message}",
-            rotation="1 day",
-            retention="30 days",
-            compression="gz",
-            serialize=True,
-            enqueue=True,
-        )
+        if json_encoder == "orjson":
+            logger.add(OrjsonFileSink(config.file_path), level=level, format=json_format, enqueue=True)
+        else:
+            logger.add(
+                config.file_path,
+                level=level,
+                format=json_format,
+                rotation="1 day",
+                retention="30 days",
+                compression="gz",
+                serialize=True,
+                enqueue=True,
+            )
+    
+    # With no sink every level is disabled
+    _min_level = level_no if config.console_enabled or config.file_enabled else LEVELS["CRITICAL"] + 1
     
-    # Bridge Python's logging to loguru
-    logging.basicConfig(handlers=[LoguruHandler()], level=0, force=True)
+    # Bridge Python's logging to loguru; the root level drops disabled records before any handler work
+    logging.basicConfig(
+        handlers=[LoguruHandler(caller_info=config.caller_info)],
+        level=_min_level,
+        force=True,
+    )
     
     # Setup structlog
-    setup_structlog()
+    setup_structlog(level, json_encoder, console)
 
 
-def get_logger(name: str) -> Any:
+def setup_supervisor_logging(config: LoggingConfig) -> None:
+    """Setup synchronous console logging for a process that forks workers.
+    
+    No sink threads or queues are started, so forked workers inherit no
+    lock held by another thread; each worker calls :func:`setup_logging`
+    after the fork.
+    """
+    global _min_level
+    level = config.level.upper()
+    logger.remove()
+    if config.console_enabled:
+        logger.add(sys.stderr, level=level, format="{time:YYYY-MM-DD HH:mm:ss.SSS} | {level: <8} | {message}")
+    _min_level = level_number(level) if config.console_enabled else LEVELS["CRITICAL"] + 1
+    logging.basicConfig(handlers=[LoguruHandler(caller_info=False)], level=_min_level, force=True)
+    setup_structlog(level, "stdlib", sys.stderr)
+
+
+def get_logger(name: str) -> GatedLogger:
     """Get a logger instance with the given name."""
-    # Bind the logger name for better tracking
-    return logger.bind(logger_name=name)
+    return GatedLogger(name)
 
 
 def get_structured_logger(name: str) -> Any:
@@ -111,12 +345,89 @@ def get_structured_logger(name: str) -> Any:
 
 
 class AuditLogger:
-    """Specialized logger for audit events."""
+    """Specialized logger for audit events.
     
-    def __init__(self):
+    Each event is written once: to the audit pipeline when one is set up,
+    otherwise through structlog. With a sampler, routine success events may
+    be sampled out and are then counted in summary records, written by a
+    reporter thread at the end of every window even when traffic stops.
+    """
+    
+    def __init__(self, pipeline: Optional[AuditPipeline] = None, sampler: Optional[AuditSampler] = None):
         """Initialize audit logger."""
-        self._logger = get_logger("audit")
         self._structured_logger = get_structured_logger("audit")
+        self._pipeline = pipeline
+        self._sampler: Optional[AuditSampler] = None
+        self._reporter: Optional[threading.Thread] = None
+        self._reporter_stop = threading.Event()
+        self.set_sampler(sampler)
+    
+    @property
+    def pipeline(self) -> Optional[AuditPipeline]:
+        """The audit pipeline events are routed to, if any."""
+        return self._pipeline
+    
+    def set_pipeline(self, pipeline: Optional[AuditPipeline]) -> None:
+        """Route audit events to a pipeline, or back to structlog with None."""
+        self._pipeline = pipeline
+    
+    def set_sampler(self, sampler: Optional[AuditSampler]) -> None:
+        """Sample routine success events, or keep every event with None."""
+        if self._reporter is not None:
+            self._reporter_stop.set()
+            self._reporter.join()
+            self._reporter = None
+        if self._sampler is not None:
+            self.report_samples()
+        self._sampler = sampler
+        if sampler is not None:
+            self._reporter_stop = threading.Event()
+            self._reporter = threading.Thread(
+                target=self._report_loop, args=(sampler, self._reporter_stop), name="audit-sample-report", daemon=True
+            )
+            self._reporter.start()
+    
+    def _report_loop(self, sampler: AuditSampler, stop: threading.Event) -> None:
+        """Reporter loop: write the summaries of each window as it ends, until stopped."""
+        while not stop.wait(sampler.seconds_until_due()):
+            if sampler.due():
+                self._report(sampler)
+    
+    def _sample(self, event_type: str, target: str, user_role: Any, result: str) -> Optional[float]:
+        """Apply the sampler to an event, returning None if it must not be written."""
+        sampler = self._sampler
+        rate = sampler.sample(event_type, target, getattr(user_role, "value", user_role), result)
+        if sampler.due():
+            self._report(sampler)
+        return rate
+    
+    def report_samples(self) -> None:
+        """Write summary records for the events sampled out since the last report."""
+        if self._sampler is not None:
+            self._report(self._sampler)
+    
+    def _report(self, sampler: AuditSampler) -> None:
+        """Write one summary record per key the sampler suppressed events for."""
+        for summary in sampler.drain():
+            self._emit("Audit sample summary", summary)
+    
+    def _emit(self, message: str, audit_data: Dict[str, Any]) -> None:
+        """Write one audit event."""
+        if self._pipeline is None:
+            self._structured_logger.info(message, **audit_data)
+            return
+        audit_data["event"] = message
+        audit_data["timestamp"] = time.time()
+        self._pipeline.submit(audit_data)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get audit pipeline buffer and drop counters."""
+        stats: Dict[str, Any] = {"pipeline": False}
+        if self._pipeline is not None:
+            stats = {"pipeline": True, **self._pipeline.get_stats()}
+        if self._sampler is not None:
+            stats["sampling"] = self._sampler.get_stats()
+        return stats
     
     def log_tool_execution(
         self,
@@ -129,6 +440,12 @@ class AuditLogger:
         **kwargs: Any
     ) -> None:
         """Log tool execution for audit purposes."""
+        if self._sampler is not None:
+            rate = self._sample("tool_execution", tool_name, user_role, result)
+            if rate is None:
+                return
+            if rate < 1.0:
+                kwargs["sample_rate"] = rate
         audit_data = {
             "event_type": "tool_execution",
             "tool_name": tool_name,
@@ -140,13 +457,7 @@ class AuditLogger:
             **kwargs
         }
         
-        self._structured_logger.info("Tool execution", **audit_data)
-        
-        # Also log via regular logger for file output
-        self._logger.info(
-            f"Tool execution: {tool_name} by {user_id or 'anonymous'} "
-            f"({user_role or 'unknown'}) - {result}"
-        )
+        self._emit("Tool execution", audit_data)
     
     def log_authorization_check(
         self,
@@ -158,6 +469,12 @@ class AuditLogger:
         **kwargs: Any
     ) -> None:
         """Log authorization check for audit purposes."""
+        if self._sampler is not None:
+            rate = self._sample("authorization_check", resource, user_role, result)
+            if rate is None:
+                return
+            if rate < 1.0:
+                kwargs["sample_rate"] = rate
         audit_data = {
             "event_type": "authorization_check",
             "user_id": user_id,
@@ -168,12 +485,7 @@ class AuditLogger:
             **kwargs
         }
         
-        self._structured_logger.info("Authorization check", **audit_data)
-        
-        self._logger.info(
-            f"Authorization check: {user_id or 'anonymous'} "
-            f"({user_role or 'unknown'}) {action} on {resource} - {result}"
-        )
+        self._emit("Authorization check", audit_data)
     
     def log_server_event(
         self,
@@ -188,30 +500,24 @@ class AuditLogger:
             **kwargs
         }
         
-        self._structured_logger.info("Server event", **audit_data)
-        self._logger.info(f"Server event: {event_type} - {description}")
+        self._emit("Server event", audit_data)
     
     def log_audit_entry(self, entry: AuditLogEntry) -> None:
         """Log a complete audit entry."""
-        audit_data = entry.model_dump()
-        
-        self._structured_logger.info(
+        self._emit(
             "Audit entry",
-            event_id=entry.event_id,
-            event_type=entry.event_type,
-            user_id=entry.user_id,
-            user_role=entry.user_role.value if entry.user_role else None,
-            resource=entry.resource,
-            action=entry.action,
-            result=entry.result,
-            timestamp=entry.timestamp.isoformat(),
-            ip_address=entry.ip_address,
-            additional_data=entry.additional_data,
-        )
-        
-        self._logger.info(
-            f"Audit: {entry.event_type} - {entry.user_id or 'anonymous'} "
-            f"{entry.action} on {entry.resource} - {entry.result}"
+            {
+                "event_id": entry.event_id,
+                "event_type": entry.event_type,
+                "user_id": entry.user_id,
+                "user_role": entry.user_role.value if entry.user_role else None,
+                "resource": entry.resource,
+                "action": entry.action,
+                "result": entry.result,
+                "event_timestamp": entry.timestamp.isoformat(),
+                "ip_address": entry.ip_address,
+                "additional_data": entry.additional_data,
+            },
         )
 
 
@@ -227,9 +533,44 @@ def get_audit_logger() -> AuditLogger:
     return _audit_logger
 
 
+def setup_audit(config: AuditConfig) -> AuditPipeline:
+    """Start the audit pipeline and route the global audit logger through it."""
+    if config.storage == "segments":
+        sink: AuditSink = SegmentedAuditSink(config.segment_dir, config.segment_max_bytes, config.segment_max_age)
+    elif config.storage == "jsonl":
+        sink = JsonLinesFileSink(config.file_path)
+    elif config.storage == "sidecar":
+        sink = SocketAuditSink(config.sidecar_socket, config.spill_dir, config.sidecar_timeout)
+    else:
+        raise ValueError(f"Unsupported audit storage: {config.storage}")
+    
+    pipeline = AuditPipeline(
+        sink,
+        capacity=config.buffer_size,
+        batch_size=config.batch_size,
+        flush_interval=config.flush_interval,
+        overflow_policy=config.overflow_policy,
+    )
+    pipeline.start()
+    audit_logger = get_audit_logger()
+    audit_logger.set_pipeline(pipeline)
+    audit_logger.set_sampler(create_sampler(config))
+    return pipeline
+
+
+def shutdown_audit() -> None:
+    """Write buffered audit events and stop the audit pipeline."""
+    audit_logger = get_audit_logger()
+    audit_logger.set_sampler(None)  # Reports the remaining sampled-out counts
+    pipeline = audit_logger.pipeline
+    audit_logger.set_pipeline(None)
+    if pipeline is not None:
+        pipeline.close()
+
+
 def log_startup(server_name: str, version: str, port: int) -> None:
     """Log server startup information."""
-    logger.info(f"Starting {server_name} v{version} on port {port}")
+    logger.info("Starting {} v{} on port {}", server_name, version, port)
     get_audit_logger().log_server_event(
         "server_startup",
         f"Server {server_name} v{version} starting on port {port}",
@@ -241,7 +582,7 @@ def log_startup(server_name: str, version: str, port: int) -> None:
 
 def log_shutdown(server_name: str) -> None:
     """Log server shutdown information."""
-    logger.info(f"Shutting down {server_name}")
+    logger.info("Shutting down {}", server_name)
     get_audit_logger().log_server_event(
         "server_shutdown",
         f"Server {server_name} shutting down",
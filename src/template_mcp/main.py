@@ -1,13 +1,31 @@
 """Main entry point for the Template MCP server."""
 
+import argparse
 import asyncio
+import contextlib
+import importlib
 import os
+import signal
+import socket
 import sys
 from pathlib import Path
+from typing import Optional
 
-from .config import load_config
-from .logging import setup_logging, log_startup, log_shutdown
-from .server import run_server
+from .audit_shipping import AuditSidecar, RotatingAuditFile
+from .config import AppConfig, load_config
+from .counters import SharedCounters, get_shared_counters, set_shared_counters
+from .logging import (
+    get_logger,
+    log_shutdown,
+    log_startup,
+    setup_audit,
+    setup_logging,
+    setup_supervisor_logging,
+    shutdown_audit,
+)
+from .policies import load_policy_engine
+from .server import BUILTIN_TOOLS, run_server
+from .supervisor import WorkerSupervisor
 
 
 async def main() -> None:
@@ -18,7 +36,8 @@ async def main() -> None:
         config = load_config(environment)
         
         # Setup logging
-        setup_logging(config.logging)
+        setup_logging(config.logging, config.mcp_server.transport)
+        setup_audit(config.audit)
         
         # Log startup
         log_startup(
@@ -29,9 +48,9 @@ async def main() -> None:
         
         # Run the server
         await run_server(config)
-        
+    
     except KeyboardInterrupt:
-        print("\nReceived interrupt signal")
+        print("\nReceived interrupt signal", file=sys.stderr)
     except Exception as e:
         print(f"Failed to start server: {e}", file=sys.stderr)
         sys.exit(1)
@@ -39,10 +58,119 @@ async def main() -> None:
         # Log shutdown
         if 'config' in locals():
             log_shutdown(config.mcp_server.name)
+            shutdown_audit()
+
+
+# Modules the HTTP stack imports lazily on first use; importing them before
+# forking lets every worker share the pages copy-on-write.
+WORKER_PRELOAD_MODULES = (
+    "uvicorn.lifespan.on",
+    "uvicorn.loops.auto",
+    "uvicorn.protocols.http.auto",
+    "uvicorn.protocols.http.h11_impl",
+    "starlette.routing",
+    "sse_starlette",
+)
+
+
+def preload_worker_modules(config: AppConfig) -> None:
+    """Import worker modules and validate the policy file before forking."""
+    for module in WORKER_PRELOAD_MODULES:
+        with contextlib.suppress(ImportError):
+            importlib.import_module(module)
+    if config.eunomia.mode == "local":
+        load_policy_engine(config.eunomia.policies_file)
+
+
+def run_worker(config: AppConfig, worker_id: int, sock: Optional[socket.socket]) -> None:
+    """Run one server worker process on the shared listening socket."""
+    # Sink threads and the audit writer are started after the fork, never inherited
+    setup_logging(config.logging, config.mcp_server.transport)
+    setup_audit(config.audit)
+    counters = get_shared_counters()
+    if counters is not None:
+        counters.bind_worker(worker_id)
+    try:
+        asyncio.run(run_server(config, sock))
+    finally:
+        shutdown_audit()
+
+
+def run_workers(config: AppConfig) -> None:
+    """Run the HTTP transport in several supervised worker processes."""
+    # The supervisor forks, so it starts no logging or audit threads itself
+    setup_supervisor_logging(config.logging)
+    log_startup(
+        config.mcp_server.name,
+        config.mcp_server.version,
+        config.mcp_server.port,
+    )
+    
+    # Allocated before forking so every worker maps the same counter block,
+    # with the slot order fixed here rather than by each worker's first calls
+    counters = SharedCounters(workers=config.mcp_server.workers)
+    for tool_name in BUILTIN_TOOLS:
+        counters.register_tool(tool_name)
+    counters.seal()
+    set_shared_counters(counters)
+    
+    supervisor = WorkerSupervisor(
+        target=lambda worker_id, sock: run_worker(config, worker_id, sock),
+        workers=config.mcp_server.workers,
+        host=config.mcp_server.host,
+        port=config.mcp_server.port,
+        socket_mode=config.mcp_server.worker_socket_mode,
+        preload=lambda: preload_worker_modules(config),
+        max_restart_delay=config.mcp_server.worker_max_restart_delay,
+    )
+    try:
+        supervisor.run()
+    finally:
+        log_shutdown(config.mcp_server.name)
+
+
+def run_audit_sidecar(config: AppConfig) -> None:
+    """Receive audit batches from server processes and own the audit files."""
+    setup_logging(config.logging)
+    audit = config.audit
+    output = RotatingAuditFile(
+        audit.file_path,
+        max_bytes=audit.sidecar_max_bytes,
+        max_age=audit.sidecar_max_age,
+        retention=audit.sidecar_retention,
+        compression=audit.sidecar_compression,
+    )
+    sidecar = AuditSidecar(audit.sidecar_socket, output)
+    # serve_forever returns on shutdown(), which must come from another thread
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    get_logger(__name__).info("Audit sidecar listening on {}", audit.sidecar_socket)
+    try:
+        sidecar.serve_forever()
+    except (KeyboardInterrupt, SystemExit):
+        pass
+    finally:
+        sidecar.server_close()
 
 
 def sync_main() -> None:
     """Synchronous wrapper for the main async function."""
+    parser = argparse.ArgumentParser(prog="template-mcp", description="Template MCP server")
+    parser.add_argument(
+        "command",
+        nargs="?",
+        default="serve",
+        choices=("serve", "audit-sidecar"),
+        help="serve (default) runs the MCP server; audit-sidecar receives audit batches shipped by servers",
+    )
+    args = parser.parse_args()
+    config = load_config(os.getenv("ENVIRONMENT", "development"))
+    if args.command == "audit-sidecar":
+        run_audit_sidecar(config)
+        return
+    if config.mcp_server.workers > 1 and config.mcp_server.transport != "stdio":
+        # Workers are forked before any event loop exists
+        run_workers(config)
+        return
     asyncio.run(main())
 
 
@@ -0,0 +1,108 @@
+"""Latency summaries and Prometheus exposition for the shared tool counters."""
+
+from typing import Any, Dict, List
+
+from .counters import LATENCY_BASE_SHIFT, LATENCY_BUCKETS, OUTCOMES, SharedCounters
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Upper bound of every finite histogram bucket, in nanoseconds
+BUCKET_BOUNDS_NS: List[int] = [1 << (LATENCY_BASE_SHIFT + i) for i in range(LATENCY_BUCKETS)]
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+def estimate_quantile(counts: List[int], quantile: float) -> float:
+    """Estimate a latency quantile in nanoseconds by interpolating within its bucket."""
+    total = sum(counts)
+    if total == 0:
+        return 0.0
+    
+    rank = quantile * total
+    seen = 0
+    for bucket, count in enumerate(counts):
+        if count and seen + count >= rank:
+            lower = BUCKET_BOUNDS_NS[bucket - 1] if bucket > 0 else 0
+            if bucket >= LATENCY_BUCKETS:
+                return float(lower)
+            upper = BUCKET_BOUNDS_NS[bucket]
+            return lower + (upper - lower) * (rank - seen) / count
+        seen += count
+    return float(BUCKET_BOUNDS_NS[-1])
+
+
+def summarize_histogram(counts: List[int], sum_ns: int) -> Dict[str, float]:
+    """Summarize one latency histogram in milliseconds."""
+    count = sum(counts)
+    summary: Dict[str, float] = {
+        "count": count,
+        "mean_ms": round(sum_ns / count / 1e6, 4) if count else 0.0,
+    }
+    for quantile in QUANTILES:
+        summary[f"p{int(quantile * 100)}_ms"] = round(estimate_quantile(counts, quantile) / 1e6, 4)
+    return summary
+
+
+def collect_metrics(counters: SharedCounters, uptime_seconds: float) -> Dict[str, Any]:
+    """Build the per-tool rate and latency summary reported by server_info."""
+    snapshot = counters.snapshot()
+    histograms = counters.histograms()
+    tools: Dict[str, Any] = {}
+    for tool, totals in snapshot.items():
+        requests = totals["requests"]
+        tools[tool] = {
+            "request_rate": round(requests / uptime_seconds, 4) if uptime_seconds > 0 else 0.0,
+            "error_rate": round(totals["errors"] / requests, 4) if requests else 0.0,
+            "latency": {
+                outcome: summarize_histogram(*histograms[tool][outcome]) for outcome in OUTCOMES
+            },
+        }
+    return {"uptime_seconds": uptime_seconds, "tools": tools}
+
+
+def _escape_label(value: str) -> str:
+    """Escape a Prometheus label value."""
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def render_prometheus(counters: SharedCounters, uptime_seconds: float, prefix: str = "template_mcp") -> str:
+    """Render the tool counters and latency histograms in the Prometheus text format."""
+    snapshot = counters.snapshot()
+    histograms = counters.histograms()
+    bounds = [f"{bound / 1e9:.9g}" for bound in BUCKET_BOUNDS_NS]
+    lines = [
+        f"# HELP {prefix}_uptime_seconds Seconds since the server started.",
+        f"# TYPE {prefix}_uptime_seconds gauge",
+        f"{prefix}_uptime_seconds {uptime_seconds:.3f}",
+        f"# HELP {prefix}_workers Worker processes sharing these counters.",
+        f"# TYPE {prefix}_workers gauge",
+        f"{prefix}_workers {counters.workers}",
+    ]
+    
+    for field, kind, description in (
+        ("requests", "counter", "Tool calls started."),
+        ("errors", "counter", "Tool calls that failed."),
+        ("in_flight", "gauge", "Tool calls currently running."),
+    ):
+        name = f"{prefix}_tool_{field}_total" if kind == "counter" else f"{prefix}_tool_{field}"
+        lines.append(f"# HELP {name} {description}")
+        lines.append(f"# TYPE {name} {kind}")
+        for tool, totals in snapshot.items():
+            lines.append(f'{name}{{tool="{_escape_label(tool)}"}} {totals[field]}')
+    
+    name = f"{prefix}_tool_duration_seconds"
+    lines.append(f"# HELP {name} Tool call latency by outcome.")
+    lines.append(f"# TYPE {name} histogram")
+    for tool, outcomes in histograms.items():
+        for outcome, (counts, sum_ns) in outcomes.items():
+            labels = f'tool="{_escape_label(tool)}",outcome="{outcome}"'
+            cumulative = 0
+            for bound, count in zip(bounds, counts[:LATENCY_BUCKETS], strict=True):
+                cumulative += count
+                lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+            cumulative += counts[LATENCY_BUCKETS]
+            lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {cumulative}')
+            lines.append(f"{name}_sum{{{labels}}} {sum_ns / 1e9:.9f}")
+            lines.append(f"{name}_count{{{labels}}} {cumulative}")
+    
+    return "\n".join(lines) + "\n"
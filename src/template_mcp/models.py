@@ -1,10 +1,16 @@
 """Pydantic models for Template MCP server business data."""
 
-from datetime import datetime
+from datetime import datetime, timezone
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from typing import Annotated, Any, Dict, List, Literal, Optional
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, StringConstraints, field_validator, model_validator
+
+# Constraints below run inside pydantic-core instead of as Python validators.
+# Its regexes are Unicode-aware: [^\W\d_] is any letter, as str.isalpha.
+LETTER_PATTERN = r"[^\W\d_]"
+# Letters, digits, hyphens and underscores with at least one letter or digit, as the str.isalnum checks
+IDENTIFIER_PATTERN = r"^[\w-]*[^\W_][\w-]*$"
 
 
 class ToolStatus(str, Enum):
@@ -33,22 +39,23 @@ class UserRole(str, Enum):
     GUEST = "guest"
 
 
+class PolicyEffect(str, Enum):
+    """Effect applied when an authorization policy matches."""
+    
+    ALLOW = "allow"
+    DENY = "deny"
+
+
 class ToolRequest(BaseModel):
     """Model for tool execution requests."""
     
-    tool_name: str = Field(..., description="Name of the tool to execute", min_length=1, max_length=100)
+    tool_name: Annotated[
+        str, StringConstraints(min_length=1, max_length=100, pattern=IDENTIFIER_PATTERN, to_lower=True)
+    ] = Field(..., description="Name of the tool to execute (alphanumeric, hyphens and underscores; lowercased)")
     parameters: Dict[str, Any] = Field(default_factory=dict, description="Tool parameters")
     user_id: Optional[str] = Field(None, description="ID of the user making the request", max_length=255)
     user_role: UserRole = Field(default=UserRole.GUEST, description="Role of the user making the request")
     timestamp: datetime = Field(default_factory=datetime.utcnow, description="Request timestamp")
-    
-    @field_validator("tool_name")
-    @classmethod
-    def validate_tool_name(cls, v: str) -> str:
-        """Validate tool name format."""
-        if not v.replace("_", "").replace("-", "").isalnum():
-            raise ValueError("Tool name must contain only alphanumeric characters, hyphens, and underscores")
-        return v.lower()
 
 
 class ToolResponse(BaseModel):
@@ -62,32 +69,27 @@ class ToolResponse(BaseModel):
     timestamp: datetime = Field(default_factory=datetime.utcnow, description="Response timestamp")
     metadata: Dict[str, Any] = Field(default_factory=dict, description="Additional metadata")
     
-    @field_validator("error_message")
-    @classmethod
-    def validate_error_message(cls, v: Optional[str], info) -> Optional[str]:
+    @model_validator(mode="after")
+    def validate_error_message(self) -> "ToolResponse":
         """Ensure error message is present when status is ERROR."""
-        status = info.data.get("status")
-        if status == ToolStatus.ERROR and not v:
+        if self.status == ToolStatus.ERROR and not self.error_message:
             raise ValueError("Error message is required when status is ERROR")
-        return v
+        return self
 
 
 class HelloRequest(BaseModel):
     """Model for hello tool request parameters."""
     
-    name: str = Field(..., description="Name to greet", min_length=1, max_length=100)
-    language: str = Field(default="en", description="Language for greeting", pattern="^[a-z]{2}$")
-    format: str = Field(default="plain", description="Response format", pattern="^(plain|json|html)$")
-    
-    @field_validator("name")
-    @classmethod
-    def validate_name(cls, v: str) -> str:
-        """Validate and clean the name."""
-        # Remove extra whitespace and ensure it contains at least one letter
-        cleaned = v.strip()
-        if not any(c.isalpha() for c in cleaned):
-            raise ValueError("Name must contain at least one letter")
-        return cleaned
+    name: Annotated[
+        str, StringConstraints(strip_whitespace=True, min_length=1, max_length=100, pattern=LETTER_PATTERN)
+    ] = Field(..., description="Name to greet (surrounding whitespace is stripped; must contain a letter)")
+    language: str = Field(
+        default="en",
+        description="Language tag for the greeting, e.g. pt or pt-BR",
+        pattern="^[a-z]{2,3}(-[A-Za-z0-9]{2,8})*$",
+        max_length=35,
+    )
+    format: Literal["plain", "json", "html"] = Field(default="plain", description="Response format")
 
 
 class HelloResponse(BaseModel):
@@ -124,6 +126,27 @@ class AuditLogEntry(BaseModel):
         return v.lower()
 
 
+class AuditQueryRequest(BaseModel):
+    """Model for audit_query tool request parameters."""
+    
+    since: Optional[datetime] = Field(None, description="Earliest event time, inclusive (UTC if no offset)")
+    until: Optional[datetime] = Field(None, description="Latest event time, inclusive (UTC if no offset)")
+    user_id: Optional[str] = Field(None, description="Only events of this user", max_length=255)
+    user_role: Optional[UserRole] = Field(None, description="Only events of users with this role")
+    tool: Optional[str] = Field(None, description="Only events for this tool or resource", max_length=255)
+    result: Optional[str] = Field(None, description="Only events with this result", max_length=20)
+    limit: int = Field(default=100, description="Maximum number of events to return", ge=1, le=1000)
+    cursor: Optional[str] = Field(None, description="Cursor returned by the previous page")
+    
+    @field_validator("since", "until")
+    @classmethod
+    def validate_timezone(cls, v: Optional[datetime]) -> Optional[datetime]:
+        """Treat naive times as UTC."""
+        if v is not None and v.tzinfo is None:
+            return v.replace(tzinfo=timezone.utc)
+        return v
+
+
 class ServerInfo(BaseModel):
     """Model for server information."""
     
@@ -135,6 +158,12 @@ class ServerInfo(BaseModel):
     active_connections: int = Field(default=0, description="Number of active connections", ge=0)
     last_restart: datetime = Field(default_factory=datetime.utcnow, description="Last server restart time")
     capabilities: List[str] = Field(default_factory=list, description="Server capabilities")
+    authorization: Dict[str, Any] = Field(default_factory=dict, description="Authorization mode and decision cache statistics")
+    workers: int = Field(default=1, description="Number of worker processes", ge=1)
+    tools: Dict[str, Dict[str, int]] = Field(default_factory=dict, description="Per-tool request, error and in-flight counts")
+    metrics: Dict[str, Any] = Field(default_factory=dict, description="Per-tool request rates, error rates and latency summaries")
+    audit: Dict[str, Any] = Field(default_factory=dict, description="Audit pipeline buffer depth and drop counters")
+    result_cache: Dict[str, Any] = Field(default_factory=dict, description="Per-tool result cache sizes and hit ratios")
     
     @field_validator("status")
     @classmethod
@@ -149,18 +178,30 @@ class ServerInfo(BaseModel):
 class ErrorDetails(BaseModel):
     """Model for detailed error information."""
     
-    error_code: str = Field(..., description="Error code", max_length=20)
+    error_code: Annotated[
+        str, StringConstraints(max_length=20, pattern=IDENTIFIER_PATTERN, to_upper=True)
+    ] = Field(..., description="Error code (alphanumeric, hyphens and underscores; uppercased)")
     error_message: str = Field(..., description="Human-readable error message")
     error_type: str = Field(..., description="Type/category of error", max_length=50)
     timestamp: datetime = Field(default_factory=datetime.utcnow, description="Error timestamp")
     correlation_id: Optional[str] = Field(None, description="Request correlation ID", max_length=100)
     stack_trace: Optional[str] = Field(None, description="Stack trace for debugging")
     context: Dict[str, Any] = Field(default_factory=dict, description="Additional error context")
+
+
+class PolicyRule(BaseModel):
+    """Model for a single authorization policy from the policies file."""
     
-    @field_validator("error_code")
-    @classmethod
-    def validate_error_code(cls, v: str) -> str:
-        """Validate error code format."""
-        if not v.replace("_", "").replace("-", "").isalnum():
-            raise ValueError("Error code must contain only alphanumeric characters, hyphens, and underscores")
-        return v.upper()
\ No newline at end of file
+    id: str = Field(..., description="Unique policy identifier", min_length=1)
+    description: Optional[str] = Field(None, description="Human-readable policy description")
+    subjects: List[str] = Field(..., description="Subjects (roles) the policy applies to", min_length=1)
+    actions: List[str] = Field(..., description="Actions covered by the policy, '*' for any", min_length=1)
+    resources: List[str] = Field(..., description="Resource patterns covered by the policy", min_length=1)
+    effect: PolicyEffect = Field(default=PolicyEffect.ALLOW, description="Effect when the policy matches")
+
+
+class PolicyDocument(BaseModel):
+    """Model for the authorization policies file."""
+    
+    version: str = Field(default="1.0", description="Policy document version")
+    policies: List[PolicyRule] = Field(default_factory=list, description="Authorization policies")
@@ -0,0 +1,215 @@
+"""Embedded policy engine compiled from the Eunomia policies file."""
+
+import asyncio
+import hashlib
+import json
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+from .logging import get_logger
+from .models import PolicyDocument, PolicyEffect, PolicyRule
+from .resource_matcher import ResourceMatcher
+
+WILDCARD = "*"
+
+
+@dataclass(frozen=True, slots=True)
+class AuthorizationDecision:
+    """Result of a single authorization decision."""
+    
+    allowed: bool
+    policy_id: Optional[str] = None
+    reason: str = ""
+    policy_version: Optional[str] = None
+    stale: bool = False
+
+
+class PolicyEngine:
+    """In-process authorization engine indexed by subject and action.
+    
+    Semantics follow the Eunomia server: requests are denied unless an allow
+    policy matches, and a matching deny policy always wins over an allow.
+    Resource patterns for each (subject, action) pair are compiled into a
+    :class:`ResourceMatcher`, so lookups cost the resource path length rather
+    than the number of policies.
+    """
+    
+    def __init__(self, document: PolicyDocument, revision: Optional[str] = None):
+        """Compile the policy document into the decision index.
+        
+        ``revision`` identifies the policy file contents and is combined with
+        the document version to tag every decision made by this engine.
+        """
+        self.version = document.version
+        self.revision = revision
+        self.policy_version = f"{document.version}@{revision}" if revision else document.version
+        self.policy_count = len(document.policies)
+        self._no_match = AuthorizationDecision(
+            allowed=False, reason="no matching policy", policy_version=self.policy_version
+        )
+        self._index = self._compile(document.policies, self.policy_version)
+        self._default_row = self._index.get(WILDCARD, {})
+    
+    @staticmethod
+    def _compile(
+        policies: List[PolicyRule], policy_version: str
+    ) -> Dict[str, Dict[str, ResourceMatcher[AuthorizationDecision]]]:
+        """Build the subject -> action -> matcher index with wildcards pre-merged."""
+        raw: Dict[str, Dict[str, List[PolicyRule]]] = {}
+        for policy in policies:
+            for subject in policy.subjects:
+                for action in policy.actions:
+                    raw.setdefault(subject, {}).setdefault(action, []).append(policy)
+        
+        # Deny policies rank before allows, then file order breaks ties
+        priorities = {
+            id(policy): (0 if policy.effect == PolicyEffect.DENY else 1, position)
+            for position, policy in enumerate(policies)
+        }
+        decisions = {
+            id(policy): AuthorizationDecision(
+                allowed=policy.effect == PolicyEffect.ALLOW,
+                policy_id=policy.id,
+                reason=f"{'allowed' if policy.effect == PolicyEffect.ALLOW else 'denied'} by policy {policy.id}",
+                policy_version=policy_version,
+            )
+            for policy in policies
+        }
+        
+        subjects = set(raw) | {WILDCARD}
+        actions = {action for row in raw.values() for action in row} | {WILDCARD}
+        wildcard_row = raw.get(WILDCARD, {})
+        
+        index: Dict[str, Dict[str, ResourceMatcher[AuthorizationDecision]]] = {}
+        for subject in subjects:
+            row = raw.get(subject, {})
+            merged: Dict[str, ResourceMatcher[AuthorizationDecision]] = {}
+            for action in actions:
+                applicable = list(row.get(action, []))
+                if action != WILDCARD:
+                    applicable += row.get(WILDCARD, [])
+                if subject != WILDCARD:
+                    applicable += wildcard_row.get(action, [])
+                    if action != WILDCARD:
+                        applicable += wildcard_row.get(WILDCARD, [])
+                
+                matcher: ResourceMatcher[AuthorizationDecision] = ResourceMatcher()
+                for policy in applicable:
+                    for resource in policy.resources:
+                        matcher.insert(resource, decisions[id(policy)], priorities[id(policy)])
+                merged[action] = matcher
+            index[subject] = merged
+        return index
+    
+    def evaluate(self, subject: str, action: str, resource: str) -> AuthorizationDecision:
+        """Decide whether the subject may perform the action on the resource."""
+        row = self._index.get(subject, self._default_row)
+        matcher = row.get(action)
+        if matcher is None:
+            matcher = row.get(WILDCARD)
+            if matcher is None:
+                return self._no_match
+        return matcher.match(resource) or self._no_match
+    
+    def evaluate_many(self, subject: str, requests: Sequence[Tuple[str, str]]) -> List[AuthorizationDecision]:
+        """Evaluate several (action, resource) pairs for one subject.
+        
+        The subject row and per-action matchers are resolved once for the
+        whole batch instead of once per pair.
+        """
+        row = self._index.get(subject, self._default_row)
+        fallback = row.get(WILDCARD)
+        no_match = self._no_match
+        decisions = []
+        for action, resource in requests:
+            matcher = row.get(action, fallback)
+            decisions.append((matcher.match(resource) if matcher is not None else None) or no_match)
+        return decisions
+
+
+def load_policy_document(path: Union[str, Path]) -> PolicyDocument:
+    """Load and validate a policies file."""
+    with open(path, encoding="utf-8") as f:
+        return PolicyDocument.model_validate(json.load(f))
+
+
+def load_policy_engine(path: Union[str, Path]) -> PolicyEngine:
+    """Load a policies file and compile it into a policy engine tagged with its content hash."""
+    raw = Path(path).read_bytes()
+    document = PolicyDocument.model_validate(json.loads(raw))
+    return PolicyEngine(document, revision=hashlib.sha256(raw).hexdigest()[:12])
+
+
+class PolicyStore:
+    """Holds the active policy engine and swaps it atomically on reload.
+    
+    Readers take ``store.engine`` once per decision (or batch) and keep using
+    that snapshot, so a reload never exposes a half-built policy set. New
+    engines are parsed and compiled in a worker thread, off the event loop.
+    """
+    
+    def __init__(self, path: Union[str, Path]):
+        """Load the initial policy set."""
+        self.path = Path(path)
+        self.logger = get_logger(__name__)
+        self.engine = load_policy_engine(self.path)
+        self.reloads = 0
+        self.reload_errors = 0
+        self._file_state = self._stat()
+        self._listeners: List[Callable[[PolicyEngine], None]] = []
+        self._lock = asyncio.Lock()
+    
+    def _stat(self) -> Optional[Tuple[int, int]]:
+        """Get the policy file modification time and size."""
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+    
+    def subscribe(self, listener: Callable[[PolicyEngine], None]) -> None:
+        """Register a callback invoked with the new engine after each swap."""
+        self._listeners.append(listener)
+    
+    async def reload(self) -> bool:
+        """Reload the policy file, keeping the current policy set on failure.
+        
+        Returns True when a new policy version was swapped in.
+        """
+        async with self._lock:
+            self._file_state = self._stat()
+            try:
+                engine = await asyncio.to_thread(load_policy_engine, self.path)
+            except Exception as e:
+                self.reload_errors += 1
+                self.logger.error("Failed to reload policies from {}: {}", self.path, e)
+                return False
+            
+            if engine.policy_version == self.engine.policy_version:
+                return False
+            
+            previous = self.engine.policy_version
+            self.engine = engine
+            self.reloads += 1
+            self.logger.info("Reloaded policies {} -> {}", previous, engine.policy_version)
+            for listener in self._listeners:
+                listener(engine)
+            return True
+    
+    async def watch(self, interval: float) -> None:
+        """Poll the policy file and reload it whenever it changes."""
+        while True:
+            await asyncio.sleep(interval)
+            if self._stat() != self._file_state:
+                await self.reload()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get the active policy version and reload counters."""
+        return {
+            "policy_version": self.engine.policy_version,
+            "policy_count": self.engine.policy_count,
+            "reloads": self.reloads,
+            "reload_errors": self.reload_errors,
+        }
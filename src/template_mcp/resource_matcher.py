@@ -0,0 +1,117 @@
+"""Segment trie matching resource paths against wildcard policy patterns."""
+
+import re
+from fnmatch import translate
+from typing import Any, Dict, List, Optional, Tuple
+
+SEPARATOR = "/"
+WILDCARD_SEGMENT = "*"
+
+# (priority, value): lower priority wins when several patterns match
+_Entry = Tuple[Tuple[int, int], Any]
+
+
+def _has_wildcard(segment: str) -> bool:
+    """Check whether a pattern segment contains glob characters."""
+    return any(c in segment for c in "*?[")
+
+
+class _Node:
+    """Trie node keyed by one resource path segment."""
+    
+    __slots__ = ("literal", "any_segment", "globs", "terminal", "rest")
+    
+    def __init__(self):
+        self.literal: Dict[str, "_Node"] = {}
+        self.any_segment: Optional["_Node"] = None
+        self.globs: List[Tuple[re.Pattern, "_Node"]] = []
+        self.terminal: Optional[_Entry] = None
+        self.rest: Optional[_Entry] = None
+
+
+def _better(current: Optional[_Entry], candidate: _Entry) -> _Entry:
+    """Keep the entry with the lowest priority."""
+    if current is None or candidate[0] < current[0]:
+        return candidate
+    return current
+
+
+class ResourceMatcher[T]:
+    """Match resources against glob patterns in time proportional to path length.
+    
+    Patterns are split on ``/`` and compiled into a trie. A trailing ``*``
+    segment matches the rest of the path (``tools/*`` matches ``tools/a`` and
+    ``tools/a/b``, and ``*`` matches everything); any other wildcard matches
+    within a single segment (``tenants/*/tools`` or ``tools/admin_*``).
+    
+    Each pattern carries a value and a priority; :meth:`match` returns the
+    value of the matching pattern with the lowest priority.
+    """
+    
+    def __init__(self):
+        """Create an empty matcher."""
+        self._root = _Node()
+        self._size = 0
+    
+    def __len__(self) -> int:
+        """Return the number of inserted patterns."""
+        return self._size
+    
+    def insert(self, pattern: str, value: T, priority: Tuple[int, int] = (0, 0)) -> None:
+        """Add a pattern mapping to ``value``."""
+        node = self._root
+        segments = pattern.split(SEPARATOR)
+        last = len(segments) - 1
+        entry = (priority, value)
+        
+        for index, segment in enumerate(segments):
+            if index == last and segment == WILDCARD_SEGMENT:
+                node.rest = _better(node.rest, entry)
+                self._size += 1
+                return
+            
+            if segment == WILDCARD_SEGMENT:
+                if node.any_segment is None:
+                    node.any_segment = _Node()
+                node = node.any_segment
+            elif _has_wildcard(segment):
+                regex = translate(segment)
+                for matcher, child in node.globs:
+                    if matcher.pattern == regex:
+                        node = child
+                        break
+                else:
+                    child = _Node()
+                    node.globs.append((re.compile(regex), child))
+                    node = child
+            else:
+                node = node.literal.setdefault(segment, _Node())
+        
+        node.terminal = _better(node.terminal, entry)
+        self._size += 1
+    
+    def match(self, resource: str) -> Optional[T]:
+        """Return the value of the best matching pattern, or None."""
+        best = self._match(self._root, resource.split(SEPARATOR), 0, None)
+        return best[1] if best is not None else None
+    
+    def _match(self, node: _Node, segments: List[str], index: int, best: Optional[_Entry]) -> Optional[_Entry]:
+        """Walk every trie branch compatible with the remaining segments."""
+        while True:
+            if node.rest is not None and index < len(segments):
+                best = _better(best, node.rest)
+            if index == len(segments):
+                return _better(best, node.terminal) if node.terminal is not None else best
+            
+            segment = segments[index]
+            index += 1
+            if node.any_segment is not None:
+                best = self._match(node.any_segment, segments, index, best)
+            for matcher, child in node.globs:
+                if matcher.match(segment):
+                    best = self._match(child, segments, index, best)
+            
+            child = node.literal.get(segment)
+            if child is None:
+                return best
+            node = child
@@ -0,0 +1,86 @@
+"""Result caching for tools that declare themselves pure functions of their arguments."""
+
+import json
+from dataclasses import dataclass, replace
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from .cache import TTLCache
+
+ResultKey = Tuple[str, str]
+
+
+@dataclass(frozen=True, slots=True)
+class CachePolicy:
+    """How long and how many results of one tool are cached.
+    
+    ``uncached`` lists (argument, value) pairs whose results are not pure,
+    such as a format embedding the current time; such calls always run.
+    """
+    
+    ttl: float
+    max_size: int = 1024
+    uncached: Tuple[Tuple[str, Any], ...] = ()
+    
+    def applies(self, params: Optional[Dict[str, Any]]) -> bool:
+        """Whether the result of a call with these arguments may be cached."""
+        if not self.uncached:
+            return True
+        params = params or {}
+        return not any(params.get(name) == value for name, value in self.uncached)
+
+
+def canonical_arguments(params: Optional[Dict[str, Any]]) -> str:
+    """Serialize tool arguments so equal arguments give equal keys regardless of order."""
+    return json.dumps(params or {}, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+def result_key(params: Optional[Dict[str, Any]], role: str) -> ResultKey:
+    """Build the cache key of a tool call from its arguments and the caller's role."""
+    return role, canonical_arguments(params)
+
+
+class ResultCache:
+    """Per-tool TTL caches of tool results, bounded per tool.
+    
+    Tools opt in with :meth:`declare`; results are keyed by the caller's role
+    and the canonicalized arguments, so callers with different roles never
+    share a result. Only successful results should be stored.
+    """
+    
+    def __init__(self, ttl_overrides: Optional[Dict[str, float]] = None):
+        """Initialize the cache; ``ttl_overrides`` replaces declared TTLs (0 disables a tool)."""
+        self.ttl_overrides = dict(ttl_overrides or {})
+        self.policies: Dict[str, CachePolicy] = {}
+        self._caches: Dict[str, TTLCache] = {}
+    
+    def declare(self, tool_name: str, policy: CachePolicy) -> bool:
+        """Make a tool cacheable; returns False when its TTL is overridden to 0."""
+        ttl = self.ttl_overrides.get(tool_name, policy.ttl)
+        if ttl <= 0:
+            return False
+        self.policies[tool_name] = replace(policy, ttl=ttl)
+        self._caches[tool_name] = TTLCache(policy.max_size)
+        return True
+    
+    def is_cacheable(self, tool_name: str) -> bool:
+        """Whether results of a tool are cached."""
+        return tool_name in self._caches
+    
+    def get(self, tool_name: str, key: Hashable) -> Any:
+        """Return a cached result, or MISSING."""
+        return self._caches[tool_name].get(key)
+    
+    def set(self, tool_name: str, key: Hashable, result: Any) -> None:
+        """Store a result for the tool's TTL."""
+        self._caches[tool_name].set(key, result, self.policies[tool_name].ttl)
+    
+    def invalidate(self, tool_name: Optional[str] = None) -> int:
+        """Drop cached results of one tool, or of every tool."""
+        names = [tool_name] if tool_name is not None else list(self._caches)
+        return sum(self._caches[name].invalidate() for name in names if name in self._caches)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache counters and hit ratios per tool."""
+        return {
+            name: {"ttl": self.policies[name].ttl, **cache.get_stats()} for name, cache in self._caches.items()
+        }
@@ -0,0 +1,112 @@
+"""Append-only files with rotation, gzip compression and retention."""
+
+import gzip
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import Callable, List
+
+from loguru import logger
+
+
+def compress_file(path: Path) -> None:
+    """Gzip a rotated file next to it and remove the original."""
+    try:
+        with path.open("rb") as source, gzip.open(f"{path}.gz", "wb") as target:
+            shutil.copyfileobj(source, target)
+        path.unlink()
+    except OSError as e:
+        # The uncompressed file is kept and still purged with the others
+        logger.error("Failed to compress rotated file {}: {}", path, e)
+
+
+class RotatingFile:
+    """Binary file appended to, rotated by age and optionally by size.
+    
+    A rotated file is renamed next to the live one with a timestamp, gzipped
+    if ``compression`` is set (on a background thread with
+    ``background_compression``, so writers never wait for it), and deleted
+    once older than ``retention``. Rotation happens on the first write past
+    a limit and never leaves an empty file behind.
+    """
+    
+    def __init__(
+        self,
+        path: str,
+        max_age: float = 86400.0,
+        retention: float = 30 * 86400.0,
+        compression: bool = True,
+        max_bytes: int = 0,
+        background_compression: bool = False,
+        clock: Callable[[], float] = time.time,
+    ):
+        """Open the file for appending; ``max_bytes`` of 0 disables size-based rotation."""
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_age = max_age
+        self.retention = retention
+        self.compression = compression
+        self.max_bytes = max_bytes
+        self.background_compression = background_compression
+        self._clock = clock
+        self._file = self.path.open("ab")
+        self._size = self._file.tell()
+        self._opened_at = clock()
+        self._compressors: List[threading.Thread] = []
+    
+    def _due(self, incoming: int) -> bool:
+        """Whether the file must be rotated before writing ``incoming`` bytes."""
+        if not self._size:
+            return False
+        if self.max_bytes and self._size + incoming > self.max_bytes:
+            return True
+        return self._clock() - self._opened_at >= self.max_age
+    
+    def write(self, data: bytes) -> None:
+        """Append data, rotating the file first when a limit is reached."""
+        if self._due(len(data)):
+            self.rotate()
+        self._file.write(data)
+        self._size += len(data)
+    
+    def flush(self) -> None:
+        """Flush written data to the OS."""
+        self._file.flush()
+    
+    def rotate(self) -> None:
+        """Move the current file aside and start a new one."""
+        self._file.close()
+        now = self._clock()
+        stamp = time.strftime("%Y-%m-%d_%H-%M-%S", time.localtime(now))
+        rotated = self.path.with_name(f"{self.path.stem}.{stamp}-{time.time_ns() % 1_000_000:06d}{self.path.suffix}")
+        if self.path.exists():
+            self.path.rename(rotated)
+            if self.compression and self.background_compression:
+                thread = threading.Thread(target=compress_file, args=(rotated,), name="rotate-compress", daemon=True)
+                thread.start()
+                self._compressors = [t for t in self._compressors if t.is_alive()] + [thread]
+            elif self.compression:
+                compress_file(rotated)
+        self._purge(now)
+        self._file = self.path.open("ab")
+        self._size = 0
+        self._opened_at = now
+    
+    def _purge(self, now: float) -> None:
+        """Delete rotated files older than the retention period."""
+        cutoff = now - self.retention
+        for old in self.path.parent.glob(f"{self.path.stem}.*{self.path.suffix}*"):
+            if old == self.path:
+                continue
+            try:
+                if old.stat().st_mtime < cutoff:
+                    old.unlink(missing_ok=True)
+            except FileNotFoundError:
+                continue  # Removed by a background compressor since the listing
+    
+    def close(self) -> None:
+        """Close the file and wait for pending compressions."""
+        self._file.close()
+        for thread in self._compressors:
+            thread.join()
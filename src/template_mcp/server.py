@@ -1,26 +1,62 @@
 """FastMCP server implementation with Eunomia middleware integration."""
 
 import asyncio
+import contextlib
+import functools
+import json
+import signal
+import socket
 import time
-from datetime import datetime
-from typing import Any, Dict, List, Optional
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 from uuid import uuid4
 
+import uvicorn
 from fastmcp import FastMCP
 from fastmcp.tools import Tool
 from eunomia_ai.mcp_middleware import EunomiaMcpMiddleware
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse
 
+from .audit_pipeline import json_default
+from .audit_segments import AuditSegmentStore, SegmentedAuditSink
+from .authorization import (
+    AuthorizationMiddleware,
+    Authorizer,
+    PrincipalResolver,
+    create_auth_provider,
+    create_authorizer,
+)
+from .cache import MISSING
+from .coalescing import CoalescingMiddleware
 from .config import AppConfig, get_config
-from .logging import get_audit_logger, get_logger
+from .counters import SharedCounters, get_shared_counters
+from .eunomia_client import EunomiaClient
+from .greetings import GreetingCatalog
+from .logging import get_audit_logger, get_logger, protocol_stdout
+from .metrics import PROMETHEUS_CONTENT_TYPE, collect_metrics, render_prometheus
 from .models import (
+    AuditQueryRequest,
     HelloRequest,
-    HelloResponse,
     ServerInfo,
     ToolRequest,
     ToolResponse,
     ToolStatus,
     UserRole,
 )
+from .policies import PolicyStore
+from .result_cache import CachePolicy, ResultCache, result_key
+from .tool_listing import ToolListCache
+from .tracing import TracingMiddleware, create_tracer, set_tracer
+from .validators import ValidatorRegistry
+
+ToolHandler = Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]]
+
+# Tools registered by every server, in registration order
+BUILTIN_TOOLS = ("hello", "server_info", "audit_query")
+
+# hello is a pure function of its arguments, except json results which carry the time they were rendered
+HELLO_CACHE_POLICY = CachePolicy(ttl=60.0, max_size=1024, uncached=(("format", "json"),))
 
 
 class TemplateMcpServer:
@@ -32,23 +68,74 @@ class TemplateMcpServer:
         self.logger = get_logger(__name__)
         self.audit_logger = get_audit_logger()
         self.start_time = time.time()
-        self.request_count = 0
+        # Shared with the other workers in worker mode, private otherwise
+        self.counters = get_shared_counters() or SharedCounters()
+        self._audit_store: Optional[AuditSegmentStore] = None
+        self.greetings = GreetingCatalog.load(
+            self.config.mcp_server.greetings_file, self.config.mcp_server.greeting_cache_size
+        )
+        self.result_cache = ResultCache(self.config.mcp_server.result_cache_ttls)
+        self.validators = ValidatorRegistry()
+        self.tool_lists: Optional[ToolListCache] = None
+        if self.config.mcp_server.tools_list_cache_enabled:
+            self.tool_lists = ToolListCache(self.config.mcp_server.tools_list_visibility_ttl)
+        
+        # Callers are identified by verified bearer tokens, never by tool arguments
+        self.principals = PrincipalResolver(self.config.auth.default_role, self.config.auth.role_claim)
         
         # Initialize FastMCP server
         self.app = FastMCP(
             name=self.config.mcp_server.name,
             version=self.config.mcp_server.version,
+            auth=create_auth_provider(self.config.auth),
         )
         
+        # Tracing must be the outermost middleware to time the whole call
+        self.tracer = create_tracer(self.config.tracing, self.config.mcp_server.name)
+        set_tracer(self.tracer)
+        if self.tracer.enabled:
+            self.app.add_middleware(TracingMiddleware(self.tracer))
+        
+        # Outside authorization, so coalesced calls also share the authorization check
+        self.coalescer: Optional[CoalescingMiddleware] = None
+        if self.config.mcp_server.coalesce_enabled:
+            self.coalescer = CoalescingMiddleware(
+                self.config.mcp_server.coalesce_tools, self.principals, self.counters, self.audit_logger
+            )
+            self.app.add_middleware(self.coalescer)
+        
         # Add Eunomia middleware integration in one line as required
-        self.app.add_middleware(EunomiaMcpMiddleware())
+        self.eunomia_client: Optional[EunomiaClient] = None
+        self.policy_store: Optional[PolicyStore] = None
+        self._policy_watch_task: Optional[asyncio.Task] = None
+        if self.config.eunomia.mode == "remote":
+            self.eunomia_client = EunomiaClient(self.config.eunomia)
+        elif self.config.eunomia.mode == "local":
+            self.policy_store = PolicyStore(self.config.eunomia.policies_file)
+        self.authorizer: Optional[Authorizer] = create_authorizer(
+            self.config.eunomia, self.eunomia_client, self.policy_store, self.audit_logger
+        )
+        self.authorization: Optional[AuthorizationMiddleware] = None
+        if self.authorizer is not None:
+            self.authorization = AuthorizationMiddleware(
+                self.authorizer, self.audit_logger, self.tracer, self.tool_lists, self.principals
+            )
+            self.app.add_middleware(self.authorization)
+            if self.policy_store is not None and self.tool_lists is not None:
+                self.policy_store.subscribe(lambda engine: self.tool_lists.invalidate())
+        else:
+            self.app.add_middleware(EunomiaMcpMiddleware())
         
         # Register tools
         self._register_tools()
+        self._register_metrics_route()
         
-        self.logger.info(
-            f"Initialized {self.config.mcp_server.name} v{self.config.mcp_server.version}"
-        )
+        self.logger.info("Initialized {} v{}", self.config.mcp_server.name, self.config.mcp_server.version)
+    
+    @property
+    def request_count(self) -> int:
+        """Total tool calls handled, across all workers."""
+        return self.counters.total("requests")
     
     def _register_tools(self) -> None:
         """Register all available tools."""
@@ -56,10 +143,11 @@ class TemplateMcpServer:
         hello_tool = Tool(
             name="hello",
             description="Simple greeting tool that says hello to a user",
-            input_schema=HelloRequest.model_json_schema(),
+            input_schema=self.validators.register("hello", HelloRequest),
         )
         
         @hello_tool.call
+        @self._cached("hello", HELLO_CACHE_POLICY)
         async def hello_handler(request: Dict[str, Any]) -> Dict[str, Any]:
             """Handle hello tool requests."""
             return await self._handle_hello_tool(request)
@@ -84,79 +172,129 @@ class TemplateMcpServer:
         
         self.app.add_tool(info_tool)
         
-        self.logger.info("Registered tools: hello, server_info")
+        # Register audit query tool (admin only)
+        audit_query_tool = Tool(
+            name="audit_query",
+            description="Search audit events by time range, user, role, tool and result (admin only)",
+            input_schema=self.validators.register("audit_query", AuditQueryRequest),
+        )
+        
+        @audit_query_tool.call
+        async def audit_query_handler(request: Dict[str, Any]) -> Dict[str, Any]:
+            """Handle audit query requests."""
+            return await self._handle_audit_query_tool(request)
+        
+        self.app.add_tool(audit_query_tool)
+        
+        for tool_name in BUILTIN_TOOLS:
+            self.counters.register_tool(tool_name)
+        
+        self.logger.info("Registered tools: {}", ", ".join(BUILTIN_TOOLS))
+    
+    def _cached(self, tool_name: str, policy: CachePolicy) -> Callable[[ToolHandler], ToolHandler]:
+        """Declare a tool cacheable: calls are answered from the result cache before the handler runs."""
+        
+        def decorate(handler: ToolHandler) -> ToolHandler:
+            if not self.config.mcp_server.result_cache_enabled or not self.result_cache.declare(tool_name, policy):
+                return handler
+            
+            @functools.wraps(handler)
+            async def cached_handler(request: Dict[str, Any]) -> Dict[str, Any]:
+                params = request.get("params")
+                if not policy.applies(params):
+                    return await handler(request)
+                
+                start_ns = time.perf_counter_ns()
+                principal = self.principals()
+                key = result_key(params, principal.role)
+                result = self.result_cache.get(tool_name, key)
+                if result is MISSING:
+                    result = await handler(request)
+                    if not result.get("isError"):
+                        self.result_cache.set(tool_name, key, result)
+                    return result
+                
+                # Hits are counted and audited like any other call
+                self.counters.start(tool_name)
+                duration_ns = time.perf_counter_ns() - start_ns
+                self.counters.finish(tool_name, duration_ns)
+                self.audit_logger.log_tool_execution(
+                    tool_name=tool_name,
+                    user_id=principal.user_id,
+                    user_role=principal.role,
+                    result="success",
+                    execution_time_ms=duration_ns / 1_000_000,
+                    cache_hit=True,
+                )
+                return result
+            
+            return cached_handler
+        
+        return decorate
+    
+    def _register_metrics_route(self) -> None:
+        """Serve Prometheus metrics on the HTTP transports."""
+        if not self.config.mcp_server.metrics_enabled:
+            return
+        
+        @self.app.custom_route(self.config.mcp_server.metrics_path, methods=["GET"], include_in_schema=False)
+        async def metrics_handler(request: Request) -> PlainTextResponse:
+            """Expose tool counters and latency histograms."""
+            body = render_prometheus(self.counters, time.time() - self.start_time)
+            return PlainTextResponse(body, media_type=PROMETHEUS_CONTENT_TYPE)
     
     async def _handle_hello_tool(self, request: Dict[str, Any]) -> Dict[str, Any]:
         """Handle hello tool execution."""
-        start_time = time.time()
-        user_id = request.get("user_id")
-        user_role = request.get("user_role", UserRole.GUEST)
+        start_ns = time.perf_counter_ns()
+        self.counters.start("hello")
+        principal = self.principals()
         
         try:
             # Extract and validate parameters
             params = request.get("params", {})
-            hello_request = HelloRequest(**params)
-            
-            # Generate greeting based on language
-            greetings = {
-                "en": f"Hello, {hello_request.name}!",
-                "es": f"¡Hola, {hello_request.name}!",
-                "fr": f"Bonjour, {hello_request.name}!",
-                "de": f"Hallo, {hello_request.name}!",
-                "pt": f"Olá, {hello_request.name}!",
-                "it": f"Ciao, {hello_request.name}!",
-            }
-            
-            greeting = greetings.get(hello_request.language, greetings["en"])
-            
-            # Create response
-            hello_response = HelloResponse(
-                greeting=greeting,
-                name=hello_request.name,
-                language=hello_request.language,
-            )
+            with self.tracer.span("validation"):
+                hello_request = self.validators.validate("hello", params)
             
-            # Format response based on requested format
-            if hello_request.format == "json":
-                result = hello_response.model_dump()
-            elif hello_request.format == "html":
-                result = f"<h1>{greeting}</h1><p>Welcome, <strong>{hello_request.name}</strong>!</p>"
-            else:  # plain text
-                result = greeting
+            with self.tracer.span("handler"):
+                result = self.greetings.render(hello_request.name, hello_request.language, hello_request.format)
             
-            execution_time = (time.time() - start_time) * 1000
+            duration_ns = time.perf_counter_ns() - start_ns
+            execution_time = duration_ns / 1_000_000
             
             # Log successful execution
-            self.audit_logger.log_tool_execution(
-                tool_name="hello",
-                user_id=user_id,
-                user_role=user_role,
-                result="success",
-                execution_time_ms=execution_time,
-                greeting_language=hello_request.language,
-                greeting_format=hello_request.format,
-            )
+            with self.tracer.span("logging"):
+                self.audit_logger.log_tool_execution(
+                    tool_name="hello",
+                    user_id=principal.user_id,
+                    user_role=principal.role,
+                    result="success",
+                    execution_time_ms=execution_time,
+                    greeting_language=hello_request.language,
+                    greeting_format=hello_request.format,
+                )
             
-            self.request_count += 1
+            self.counters.finish("hello", duration_ns)
             
             return {
                 "content": [
                     {
                         "type": "text",
-                        "text": result if isinstance(result, str) else str(result),
+                        "text": result,
                     }
                 ]
             }
-            
+        
         except Exception as e:
-            execution_time = (time.time() - start_time) * 1000
+            duration_ns = time.perf_counter_ns() - start_ns
+            execution_time = duration_ns / 1_000_000
             error_msg = str(e)
             
-            self.logger.error(f"Error in hello tool: {error_msg}")
+            self.counters.finish("hello", duration_ns, error=True)
+            self.logger.error("Error in hello tool: {}", error_msg)
             self.audit_logger.log_tool_execution(
                 tool_name="hello",
-                user_id=user_id,
-                user_role=user_role,
+                user_id=principal.user_id,
+                user_role=principal.role,
                 result="error",
                 execution_time_ms=execution_time,
                 error_message=error_msg,
@@ -174,55 +312,167 @@ class TemplateMcpServer:
     
     async def _handle_server_info_tool(self, request: Dict[str, Any]) -> Dict[str, Any]:
         """Handle server info tool execution."""
-        start_time = time.time()
-        user_id = request.get("user_id")
-        user_role = request.get("user_role", UserRole.GUEST)
+        start_ns = time.perf_counter_ns()
+        self.counters.start("server_info")
+        principal = self.principals()
         
         try:
             # Calculate uptime
             uptime_seconds = time.time() - self.start_time
             
             # Create server info
-            server_info = ServerInfo(
-                name=self.config.mcp_server.name,
-                version=self.config.mcp_server.version,
-                status="running",
-                uptime_seconds=uptime_seconds,
-                total_requests=self.request_count,
-                active_connections=1,  # Simplified for this implementation
-                capabilities=["hello", "server_info"],
-            )
+            with self.tracer.span("handler"):
+                server_info = ServerInfo(
+                    name=self.config.mcp_server.name,
+                    version=self.config.mcp_server.version,
+                    status="running",
+                    uptime_seconds=uptime_seconds,
+                    total_requests=self.request_count,
+                    active_connections=1,  # Simplified for this implementation
+                    capabilities=["hello", "server_info", "audit_query"],
+                    authorization=self.authorizer.get_stats() if self.authorizer else {},
+                    workers=self.counters.workers,
+                    tools=self.counters.snapshot(),
+                    metrics=collect_metrics(self.counters, uptime_seconds),
+                    audit=self.audit_logger.get_stats(),
+                    result_cache=self.result_cache.get_stats(),
+                )
+            
+            duration_ns = time.perf_counter_ns() - start_ns
+            execution_time = duration_ns / 1_000_000
             
-            execution_time = (time.time() - start_time) * 1000
+            self.counters.finish("server_info", duration_ns)
             
             # Log successful execution
+            with self.tracer.span("logging"):
+                self.audit_logger.log_tool_execution(
+                    tool_name="server_info",
+                    user_id=principal.user_id,
+                    user_role=principal.role,
+                    result="success",
+                    execution_time_ms=execution_time,
+                )
+            
+            return {
+                "content": [
+                    {
+                        "type": "text",
+                        "text": server_info.model_dump_json(indent=2),
+                    }
+                ]
+            }
+        
+        except Exception as e:
+            duration_ns = time.perf_counter_ns() - start_ns
+            execution_time = duration_ns / 1_000_000
+            error_msg = str(e)
+            
+            self.counters.finish("server_info", duration_ns, error=True)
+            self.logger.error("Error in server_info tool: {}", error_msg)
             self.audit_logger.log_tool_execution(
                 tool_name="server_info",
-                user_id=user_id,
-                user_role=user_role,
-                result="success",
+                user_id=principal.user_id,
+                user_role=principal.role,
+                result="error",
                 execution_time_ms=execution_time,
+                error_message=error_msg,
             )
             
             return {
                 "content": [
                     {
                         "type": "text",
-                        "text": server_info.model_dump_json(indent=2),
+                        "text": f"Error: {error_msg}",
                     }
-                ]
+                ],
+                "isError": True,
             }
+    
+    def _get_audit_store(self) -> AuditSegmentStore:
+        """Get the store over the audit segment directory, creating it on first use."""
+        if self.config.audit.storage != "segments":
+            raise ValueError("Audit queries require audit storage 'segments'")
+        if self._audit_store is None:
+            pipeline = self.audit_logger.pipeline
+            # The active segment of this process is read through the sink's in-memory index
+            sink = pipeline.sink if pipeline is not None and isinstance(pipeline.sink, SegmentedAuditSink) else None
+            self._audit_store = AuditSegmentStore(self.config.audit.segment_dir, sink)
+        return self._audit_store
+    
+    async def _handle_audit_query_tool(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Handle audit query tool execution."""
+        start_ns = time.perf_counter_ns()
+        self.counters.start("audit_query")
+        principal = self.principals()
+        result_label = "error"
+        
+        try:
+            # Gated on the verified caller; a user_role argument is never trusted
+            if principal.role != UserRole.ADMIN.value:
+                result_label = "denied"
+                raise PermissionError("audit_query is restricted to administrators")
+            
+            params = request.get("params", {})
+            with self.tracer.span("validation"):
+                query = self.validators.validate("audit_query", params)
+                store = self._get_audit_store()
+            
+            with self.tracer.span("handler"):
+                events, next_cursor = await asyncio.to_thread(
+                    store.query,
+                    since_us=int(query.since.timestamp() * 1_000_000) if query.since else None,
+                    until_us=int(query.until.timestamp() * 1_000_000) if query.until else None,
+                    user_id=query.user_id,
+                    user_role=query.user_role.value if query.user_role else None,
+                    tool=query.tool,
+                    result=query.result,
+                    limit=query.limit,
+                    cursor=query.cursor,
+                )
+                for event in events:
+                    event["timestamp"] = datetime.fromtimestamp(event["timestamp"], timezone.utc).isoformat()
+                text = json.dumps(
+                    {"events": events, "count": len(events), "next_cursor": next_cursor},
+                    default=json_default,
+                )
             
+            duration_ns = time.perf_counter_ns() - start_ns
+            execution_time = duration_ns / 1_000_000
+            
+            self.counters.finish("audit_query", duration_ns)
+            
+            # Log successful execution
+            with self.tracer.span("logging"):
+                self.audit_logger.log_tool_execution(
+                    tool_name="audit_query",
+                    user_id=principal.user_id,
+                    user_role=principal.role,
+                    result="success",
+                    execution_time_ms=execution_time,
+                    returned_events=len(events),
+                )
+            
+            return {
+                "content": [
+                    {
+                        "type": "text",
+                        "text": text,
+                    }
+                ]
+            }
+        
         except Exception as e:
-            execution_time = (time.time() - start_time) * 1000
+            duration_ns = time.perf_counter_ns() - start_ns
+            execution_time = duration_ns / 1_000_000
             error_msg = str(e)
             
-            self.logger.error(f"Error in server_info tool: {error_msg}")
+            self.counters.finish("audit_query", duration_ns, error=True)
+            self.logger.error("Error in audit_query tool: {}", error_msg)
             self.audit_logger.log_tool_execution(
-                tool_name="server_info",
-                user_id=user_id,
-                user_role=user_role,
-                result="error",
+                tool_name="audit_query",
+                user_id=principal.user_id,
+                user_role=principal.role,
+                result=result_label,
                 execution_time_ms=execution_time,
                 error_message=error_msg,
             )
@@ -237,12 +487,19 @@ class TemplateMcpServer:
                 "isError": True,
             }
     
-    async def start_server(self) -> None:
-        """Start the MCP server."""
+    async def start_server(self, sock: Optional[socket.socket] = None) -> None:
+        """Start the MCP server.
+        
+        ``sock`` is an already bound listening socket for the HTTP transports,
+        used by worker processes that share a port.
+        """
         try:
             self.logger.info(
-                f"Starting {self.config.mcp_server.name} server on "
-                f"{self.config.mcp_server.host}:{self.config.mcp_server.port}"
+                "Starting {} server on {}:{} ({})",
+                self.config.mcp_server.name,
+                self.config.mcp_server.host,
+                self.config.mcp_server.port,
+                self.config.mcp_server.transport,
             )
             
             self.audit_logger.log_server_event(
@@ -250,15 +507,40 @@ class TemplateMcpServer:
                 f"MCP server starting on {self.config.mcp_server.host}:{self.config.mcp_server.port}",
                 host=self.config.mcp_server.host,
                 port=self.config.mcp_server.port,
+                transport=self.config.mcp_server.transport,
             )
             
-            # Start the FastMCP server
-            await self.app.run(
-                transport="stdio"  # MCP typically uses stdio transport
-            )
+            if self.eunomia_client is not None:
+                await self.eunomia_client.start()
+            self._start_policy_reloading()
             
+            # Start the FastMCP server
+            transport = self.config.mcp_server.transport
+            if transport == "stdio":
+                # Logs were routed off stdout by setup_logging; the protocol has its own writer
+                with protocol_stdout(self.config.mcp_server.stdio_buffer_size):
+                    await self.app.run_async(
+                        transport="stdio"  # One client per process over stdin/stdout
+                    )
+            elif transport in ("http", "sse") and sock is not None:
+                http_app = self.app.http_app(path=self.config.mcp_server.http_path, transport=transport)
+                server = uvicorn.Server(
+                    uvicorn.Config(http_app, log_level=self.config.logging.level.lower(), lifespan="on")
+                )
+                await server.serve(sockets=[sock])
+            elif transport in ("http", "sse"):
+                # Many concurrent clients share this process over HTTP
+                await self.app.run_async(
+                    transport=transport,
+                    host=self.config.mcp_server.host,
+                    port=self.config.mcp_server.port,
+                    path=self.config.mcp_server.http_path,
+                )
+            else:
+                raise ValueError(f"Unsupported transport: {transport}")
+        
         except Exception as e:
-            self.logger.error(f"Failed to start server: {e}")
+            self.logger.error("Failed to start server: {}", e)
             self.audit_logger.log_server_event(
                 "server_start_failed",
                 f"Failed to start MCP server: {e}",
@@ -268,14 +550,56 @@ class TemplateMcpServer:
     
     async def stop_server(self) -> None:
         """Stop the MCP server."""
-        self.logger.info(f"Stopping {self.config.mcp_server.name} server")
+        self.logger.info("Stopping {} server", self.config.mcp_server.name)
         self.audit_logger.log_server_event(
             "server_stop",
             "MCP server stopping",
         )
         
-        # Cleanup if needed
-        # FastMCP handles the cleanup automatically
+        await self._stop_policy_reloading()
+        if self.eunomia_client is not None:
+            await self.eunomia_client.close()
+        self.tracer.close()
+        
+        # FastMCP handles the remaining cleanup automatically
+    
+    def _start_policy_reloading(self) -> None:
+        """Watch the policies file and/or reload it on SIGHUP in local mode."""
+        if self.policy_store is None:
+            return
+        
+        loop = asyncio.get_running_loop()
+        if self.config.eunomia.policy_reload_interval > 0:
+            self._policy_watch_task = loop.create_task(
+                self.policy_store.watch(self.config.eunomia.policy_reload_interval)
+            )
+        if self.config.eunomia.policy_reload_on_sighup and hasattr(signal, "SIGHUP"):
+            loop.add_signal_handler(signal.SIGHUP, lambda: loop.create_task(self.reload_policies()))
+    
+    async def _stop_policy_reloading(self) -> None:
+        """Stop watching the policies file."""
+        if self._policy_watch_task is not None:
+            self._policy_watch_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._policy_watch_task
+            self._policy_watch_task = None
+        if self.policy_store is not None and hasattr(signal, "SIGHUP"):
+            with contextlib.suppress(RuntimeError):
+                asyncio.get_running_loop().remove_signal_handler(signal.SIGHUP)
+    
+    async def reload_policies(self) -> bool:
+        """Reload the policies file in local mode, returning True if a new version was applied."""
+        if self.policy_store is None:
+            return False
+        
+        reloaded = await self.policy_store.reload()
+        if reloaded:
+            self.audit_logger.log_server_event(
+                "policies_reloaded",
+                f"Policies reloaded from {self.policy_store.path}",
+                policy_version=self.policy_store.engine.policy_version,
+            )
+        return reloaded
     
     def get_server_stats(self) -> Dict[str, Any]:
         """Get current server statistics."""
@@ -286,6 +610,15 @@ class TemplateMcpServer:
             "version": self.config.mcp_server.version,
             "uptime_seconds": uptime_seconds,
             "total_requests": self.request_count,
+            "total_errors": self.counters.total("errors"),
+            "in_flight": self.counters.total("in_flight"),
+            "workers": self.counters.workers,
+            "tools": self.counters.snapshot(),
+            "metrics": collect_metrics(self.counters, uptime_seconds),
+            "greetings": self.greetings.get_stats(),
+            "result_cache": self.result_cache.get_stats(),
+            "coalescing": self.coalescer.get_stats() if self.coalescer else None,
+            "tools_list": self.tool_lists.get_stats() if self.tool_lists else None,
             "start_time": datetime.fromtimestamp(self.start_time).isoformat(),
             "status": "running",
         }
@@ -296,12 +629,12 @@ async def create_server(config: Optional[AppConfig] = None) -> TemplateMcpServer
     return TemplateMcpServer(config)
 
 
-async def run_server(config: Optional[AppConfig] = None) -> None:
-    """Run the MCP server."""
+async def run_server(config: Optional[AppConfig] = None, sock: Optional[socket.socket] = None) -> None:
+    """Run the MCP server, optionally on an already bound listening socket."""
     server = await create_server(config)
     
     try:
-        await server.start_server()
+        await server.start_server(sock)
     except KeyboardInterrupt:
         server.logger.info("Received shutdown signal")
     finally:
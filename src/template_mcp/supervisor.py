@@ -0,0 +1,194 @@
+"""Multi-process worker supervisor for the HTTP transports."""
+
+import gc
+import multiprocessing
+import os
+import signal
+import socket
+import time
+from typing import Callable, Dict, List, Optional
+
+from .logging import get_logger
+
+WorkerTarget = Callable[[int, Optional[socket.socket]], None]
+
+# Signals relayed from the supervisor to every worker
+FORWARDED_SIGNALS = tuple(
+    getattr(signal, name) for name in ("SIGTERM", "SIGINT", "SIGHUP") if hasattr(signal, name)
+)
+
+
+def create_listen_socket(host: str, port: int, reuse_port: bool = False, backlog: int = 2048) -> socket.socket:
+    """Create a bound, listening TCP socket.
+    
+    With ``reuse_port`` the socket sets ``SO_REUSEPORT`` so several processes
+    can each bind the same address and let the kernel balance connections.
+    """
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    if reuse_port:
+        if not hasattr(socket, "SO_REUSEPORT"):
+            sock.close()
+            raise RuntimeError("SO_REUSEPORT is not supported on this platform")
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+class WorkerSupervisor:
+    """Fork N workers sharing one port and keep them running.
+    
+    In ``prefork`` mode the supervisor binds the listening socket once and
+    every worker inherits it; in ``reuseport`` mode each worker binds its own
+    ``SO_REUSEPORT`` socket. Modules imported before :meth:`run` (and objects
+    built by ``preload``) are shared copy-on-write with the workers; the
+    garbage collector is frozen before forking so it does not touch them.
+    Dead workers are restarted after ``restart_delay``, doubled after each
+    exit within ``stable_seconds`` of starting up to ``max_restart_delay``,
+    so a crash-looping worker does not spin. SIGTERM/SIGINT/SIGHUP are
+    forwarded; workers ignore SIGHUP unless they install their own handler.
+    """
+    
+    def __init__(
+        self,
+        target: WorkerTarget,
+        workers: int,
+        host: str,
+        port: int,
+        socket_mode: str = "reuseport",
+        preload: Optional[Callable[[], None]] = None,
+        restart_delay: float = 1.0,
+        max_restart_delay: float = 60.0,
+        stable_seconds: float = 10.0,
+        shutdown_timeout: float = 30.0,
+    ):
+        """Initialize the supervisor."""
+        if workers < 1:
+            raise ValueError("At least one worker is required")
+        if socket_mode not in ("reuseport", "prefork"):
+            raise ValueError(f"Unsupported worker socket mode: {socket_mode}")
+        self.target = target
+        self.workers = workers
+        self.host = host
+        self.port = port
+        self.socket_mode = socket_mode
+        self.preload = preload
+        self.restart_delay = restart_delay
+        self.max_restart_delay = max_restart_delay
+        self.stable_seconds = stable_seconds
+        self.shutdown_timeout = shutdown_timeout
+        self.logger = get_logger(__name__)
+        self.restarts = 0
+        self._context = multiprocessing.get_context("fork")
+        self._processes: Dict[int, multiprocessing.process.BaseProcess] = {}
+        self._started_at: Dict[int, float] = {}
+        self._failures: Dict[int, int] = {}
+        self._restart_at: Dict[int, float] = {}
+        self._socket: Optional[socket.socket] = None
+        self._stopping = False
+    
+    def _worker_main(self, worker_id: int) -> None:
+        """Entry point of a forked worker."""
+        for signum in FORWARDED_SIGNALS:
+            signal.signal(signum, signal.SIG_DFL)
+        if hasattr(signal, "SIGHUP"):
+            # Reload requests must not kill workers that have no reload handler
+            signal.signal(signal.SIGHUP, signal.SIG_IGN)
+        sock = self._socket
+        if sock is None:
+            sock = create_listen_socket(self.host, self.port, reuse_port=True)
+        self.target(worker_id, sock)
+    
+    def _spawn(self, worker_id: int) -> None:
+        """Fork a worker process."""
+        process = self._context.Process(
+            target=self._worker_main, args=(worker_id,), name=f"template-mcp-worker-{worker_id}"
+        )
+        process.start()
+        self._processes[worker_id] = process
+        self._started_at[worker_id] = time.monotonic()
+        self.logger.info("Started worker {} (pid {})", worker_id, process.pid)
+    
+    def _forward_signal(self, signum: int, frame: object) -> None:
+        """Relay a signal to all workers; termination signals also stop the supervisor."""
+        if signum != getattr(signal, "SIGHUP", None):
+            self._stopping = True
+        for process in self._processes.values():
+            if process.pid is not None and process.is_alive():
+                os.kill(process.pid, signum)
+    
+    def run(self) -> None:
+        """Start the workers and supervise them until a termination signal arrives."""
+        if self.socket_mode == "prefork":
+            self._socket = create_listen_socket(self.host, self.port)
+        if self.preload is not None:
+            self.preload()
+        
+        previous_handlers = {signum: signal.signal(signum, self._forward_signal) for signum in FORWARDED_SIGNALS}
+        gc.collect()
+        gc.freeze()
+        try:
+            for worker_id in range(self.workers):
+                self._spawn(worker_id)
+            self._supervise()
+        finally:
+            self._shutdown()
+            gc.unfreeze()
+            for signum, handler in previous_handlers.items():
+                signal.signal(signum, handler)
+            if self._socket is not None:
+                self._socket.close()
+                self._socket = None
+    
+    def _next_restart_delay(self, worker_id: int, uptime: float) -> float:
+        """Delay before restarting a worker that exited after ``uptime`` seconds."""
+        if uptime >= self.stable_seconds:
+            self._failures[worker_id] = 0
+        failures = self._failures.get(worker_id, 0)
+        self._failures[worker_id] = failures + 1
+        return min(self.restart_delay * 2 ** failures, self.max_restart_delay)
+    
+    def _supervise(self) -> None:
+        """Restart workers that exit while the supervisor is running, each on its own backoff."""
+        while not self._stopping:
+            now = time.monotonic()
+            for worker_id, process in list(self._processes.items()):
+                if process.is_alive() or worker_id in self._restart_at:
+                    continue
+                delay = self._next_restart_delay(worker_id, now - self._started_at[worker_id])
+                self.logger.warning(
+                    "Worker {} (pid {}) exited with code {}, restarting in {:.1f} s",
+                    worker_id,
+                    process.pid,
+                    process.exitcode,
+                    delay,
+                )
+                self.restarts += 1
+                self._restart_at[worker_id] = now + delay
+            
+            for worker_id, restart_at in list(self._restart_at.items()):
+                if restart_at <= now and not self._stopping:
+                    del self._restart_at[worker_id]
+                    self._spawn(worker_id)
+            time.sleep(0.1)
+    
+    def _shutdown(self) -> None:
+        """Terminate the remaining workers and wait for them to exit."""
+        processes: List[multiprocessing.process.BaseProcess] = list(self._processes.values())
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+        deadline = time.monotonic() + self.shutdown_timeout
+        for process in processes:
+            process.join(max(0.0, deadline - time.monotonic()))
+            if process.is_alive():
+                process.kill()
+                process.join()
+        self._processes.clear()
+    
+    def stop(self) -> None:
+        """Ask the supervisor loop to exit."""
+        self._stopping = True
@@ -0,0 +1,77 @@
+"""tools/list results cached per tool registry version and visibility set."""
+
+import time
+from typing import Any, Callable, Dict, FrozenSet, Hashable, List, Optional, Sequence, Tuple
+
+from .cache import TTLCache
+
+VisibleSet = FrozenSet[str]
+
+
+class ToolListCache:
+    """Filtered tools/list results computed once per registry version and visibility set.
+    
+    The registry version is bumped whenever the tools FastMCP lists differ
+    from the previous listing, however they were added, removed or replaced,
+    or when the policies change, dropping everything derived from the
+    previous one.
+    Each principal maps to the names of the tools it may list, kept for
+    ``visibility_ttl`` seconds so remote decisions are checked again from
+    time to time; principals with the same visibility share one filtered
+    list. FastMCP still converts and serializes the listed tools per request.
+    """
+    
+    def __init__(
+        self,
+        visibility_ttl: float = 60.0,
+        max_principals: int = 1024,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize an empty cache at registry version 0."""
+        self.version = 0
+        self.visibility_ttl = visibility_ttl
+        self.max_sets = max_principals
+        self._visibility = TTLCache(max_principals, clock)
+        self._lists: Dict[VisibleSet, List[Any]] = {}
+        # Tools of the last listing: the registry fingerprint
+        self._registry: Tuple[Any, ...] = ()
+    
+    def sync(self, tools: Sequence[Any]) -> None:
+        """Start a new registry version if ``tools`` differ from the ones listed last time."""
+        registry = tuple(tools)
+        if registry != self._registry:
+            self._registry = registry
+            self.invalidate()
+    
+    def invalidate(self) -> None:
+        """Start a new registry version."""
+        self.version += 1
+        self._visibility.invalidate()
+        self._lists.clear()
+    
+    def visibility(self, principal: Hashable) -> Optional[VisibleSet]:
+        """Get the names of the tools a principal may list, if known for this version."""
+        return self._visibility.get(principal, None)
+    
+    def remember_visibility(self, principal: Hashable, names: VisibleSet) -> None:
+        """Store the names of the tools a principal may list."""
+        self._visibility.set(principal, names, self.visibility_ttl)
+    
+    def tools(self, visible: VisibleSet, tools: Sequence[Any]) -> List[Any]:
+        """Get the registered ``tools`` whose names are in ``visible``; the list is shared, do not mutate it."""
+        listed = self._lists.get(visible)
+        if listed is None:
+            if len(self._lists) >= self.max_sets:
+                # As many visibility sets as principals: start over
+                self._lists.clear()
+            listed = self._lists[visible] = [tool for tool in tools if tool.name in visible]
+        return listed
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics for server_info."""
+        return {
+            "version": self.version,
+            "principals": len(self._visibility),
+            "visibility_sets": len(self._lists),
+            "visibility_hit_ratio": self._visibility.get_stats()["hit_ratio"],
+        }
@@ -0,0 +1,343 @@
+"""Sampled nanosecond span tracing for tool calls with OTLP JSON export."""
+
+import json
+import os
+import queue
+import random
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextvars import ContextVar
+from enum import Enum
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastmcp.server.middleware import Middleware, MiddlewareContext
+from loguru import logger
+
+from .config import TracingConfig
+
+# OTLP span kinds and status codes
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_SERVER = 2
+STATUS_CODE_ERROR = 2
+
+# Offset turning perf_counter_ns readings into Unix epoch nanoseconds
+_EPOCH_OFFSET_NS = time.time_ns() - time.perf_counter_ns()
+
+_current_span: ContextVar[Optional["Span"]] = ContextVar("template_mcp_span", default=None)
+
+
+def random_id(size: int) -> int:
+    """Create a non-zero trace or span id from ``size`` random bytes of the OS source."""
+    return int.from_bytes(os.urandom(size), "big") or 1
+
+
+class Span:
+    """A timed operation; use it as a context manager."""
+    
+    __slots__ = (
+        "tracer", "name", "trace_id", "span_id", "parent_id", "kind",
+        "attributes", "start_ns", "end_ns", "error", "_token",
+    )
+    
+    def __init__(
+        self,
+        tracer: "Tracer",
+        name: str,
+        trace_id: int,
+        parent_id: Optional[int],
+        kind: int,
+        attributes: Dict[str, Any],
+    ):
+        """Create a span; timing starts on enter."""
+        self.tracer = tracer
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = random_id(8)
+        self.parent_id = parent_id
+        self.kind = kind
+        self.attributes = attributes
+        self.start_ns = 0
+        self.end_ns = 0
+        self.error: Optional[str] = None
+        self._token = None
+    
+    def __enter__(self) -> "Span":
+        self._token = _current_span.set(self)
+        self.start_ns = time.perf_counter_ns()
+        return self
+    
+    def __exit__(self, exc_type: Any, exc: Any, traceback: Any) -> bool:
+        self.end_ns = time.perf_counter_ns()
+        _current_span.reset(self._token)
+        if exc is not None:
+            self.error = f"{exc_type.__name__}: {exc}"
+        self.tracer._finish(self)
+        return False
+    
+    @property
+    def duration_ns(self) -> int:
+        """Span duration in nanoseconds."""
+        return self.end_ns - self.start_ns
+    
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Attach an attribute to the span."""
+        self.attributes[key] = value
+
+
+class _NoopSpan:
+    """Stand-in returned when the current call is not sampled."""
+    
+    __slots__ = ()
+    
+    def __enter__(self) -> "_NoopSpan":
+        return self
+    
+    def __exit__(self, exc_type: Any, exc: Any, traceback: Any) -> bool:
+        return False
+    
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Ignore the attribute."""
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    """Encode an attribute value as an OTLP AnyValue."""
+    if isinstance(value, Enum):
+        value = value.value
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def span_to_otlp(span: Span) -> Dict[str, Any]:
+    """Convert a finished span to its OTLP JSON representation."""
+    data: Dict[str, Any] = {
+        "traceId": f"{span.trace_id:032x}",
+        "spanId": f"{span.span_id:016x}",
+        "name": span.name,
+        "kind": span.kind,
+        "startTimeUnixNano": str(span.start_ns + _EPOCH_OFFSET_NS),
+        "endTimeUnixNano": str(span.end_ns + _EPOCH_OFFSET_NS),
+        "attributes": [{"key": key, "value": _otlp_value(value)} for key, value in span.attributes.items()],
+        "status": {},
+    }
+    if span.parent_id is not None:
+        data["parentSpanId"] = f"{span.parent_id:016x}"
+    if span.error is not None:
+        data["status"] = {"code": STATUS_CODE_ERROR, "message": span.error}
+    return data
+
+
+class SpanExporter(ABC):
+    """Destination for batches of finished spans."""
+    
+    @abstractmethod
+    def export(self, spans: List[Span], service_name: str) -> None:
+        """Export a batch of spans."""
+    
+    def close(self) -> None:
+        """Export pending batches and release resources; exporters holding none keep this no-op default."""
+        return None
+
+
+class OtlpJsonFileExporter(SpanExporter):
+    """Append spans to a file as OTLP/JSON trace requests, one per line.
+    
+    Each line is an ``ExportTraceServiceRequest`` in the OTLP JSON encoding,
+    the format written by the OpenTelemetry Collector file exporter, so the
+    file can be replayed into a collector or loaded by trace viewers. Batches
+    are encoded and appended by a writer thread, so exporting never blocks
+    the event loop on file I/O.
+    """
+    
+    def __init__(self, path: str):
+        """Initialize the exporter and start its writer thread."""
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._queue: "queue.SimpleQueue[Optional[Tuple[List[Span], str]]]" = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name="trace-writer", daemon=True)
+        self._thread.start()
+    
+    def export(self, spans: List[Span], service_name: str) -> None:
+        """Queue a batch for the writer thread."""
+        self._queue.put((spans, service_name))
+    
+    def _run(self) -> None:
+        """Writer loop: append queued batches until closed."""
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            try:
+                self._write(*item)
+            except Exception as e:
+                logger.error("Failed to export {} spans: {}", len(item[0]), e)
+    
+    def _write(self, spans: List[Span], service_name: str) -> None:
+        """Append one trace request holding the batch."""
+        request = {
+            "resourceSpans": [
+                {
+                    "resource": {
+                        "attributes": [{"key": "service.name", "value": {"stringValue": service_name}}],
+                    },
+                    "scopeSpans": [
+                        {
+                            "scope": {"name": "template_mcp"},
+                            "spans": [span_to_otlp(span) for span in spans],
+                        }
+                    ],
+                }
+            ]
+        }
+        with self.path.open("a", encoding="utf-8") as f:
+            f.write(json.dumps(request, separators=(",", ":")) + "\n")
+    
+    def close(self, timeout: float = 5.0) -> None:
+        """Write the queued batches and stop the writer thread."""
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+
+class InMemoryExporter(SpanExporter):
+    """Keep exported spans in memory, as a collector stand-in for tests and benchmarks."""
+    
+    def __init__(self):
+        """Initialize the exporter."""
+        self.spans: List[Span] = []
+    
+    def export(self, spans: List[Span], service_name: str) -> None:
+        """Store the batch."""
+        self.spans.extend(spans)
+
+
+class Tracer:
+    """Create sampled spans and export them in batches.
+    
+    The sampling decision is taken once per trace, when :meth:`trace` opens a
+    root span; :meth:`span` only records inside a sampled trace, so an
+    unsampled call costs one context variable lookup per span.
+    """
+    
+    def __init__(
+        self,
+        sample_rate: float = 0.0,
+        exporter: Optional[SpanExporter] = None,
+        batch_size: int = 256,
+        service_name: str = "template-mcp",
+    ):
+        """Initialize the tracer."""
+        self.sample_rate = sample_rate
+        self.exporter = exporter
+        self.batch_size = batch_size
+        self.service_name = service_name
+        self._pending: List[Span] = []
+        self.traces_sampled = 0
+        self.spans_exported = 0
+    
+    @property
+    def enabled(self) -> bool:
+        """Whether any trace can be sampled."""
+        return self.sample_rate > 0 and self.exporter is not None
+    
+    def trace(self, name: str, **attributes: Any) -> Any:
+        """Open a root span for an incoming request, subject to sampling."""
+        parent = _current_span.get()
+        if parent is not None:
+            return Span(self, name, parent.trace_id, parent.span_id, SPAN_KIND_INTERNAL, attributes)
+        if not self.enabled or random.random() >= self.sample_rate:  # noqa: S311 - sampling, not an identifier
+            return NOOP_SPAN
+        self.traces_sampled += 1
+        return Span(self, name, random_id(16), None, SPAN_KIND_SERVER, attributes)
+    
+    def span(self, name: str, **attributes: Any) -> Any:
+        """Open a child span of the current span, if the trace is sampled."""
+        parent = _current_span.get()
+        if parent is None:
+            return NOOP_SPAN
+        return Span(self, name, parent.trace_id, parent.span_id, SPAN_KIND_INTERNAL, attributes)
+    
+    def _finish(self, span: Span) -> None:
+        """Queue a finished span for export."""
+        self._pending.append(span)
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+    
+    def flush(self) -> None:
+        """Export all queued spans."""
+        spans, self._pending = self._pending, []
+        if spans and self.exporter is not None:
+            self.exporter.export(spans, self.service_name)
+            self.spans_exported += len(spans)
+    
+    def close(self) -> None:
+        """Export the queued spans and close the exporter."""
+        self.flush()
+        if self.exporter is not None:
+            self.exporter.close()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get sampling and export counters."""
+        return {
+            "enabled": self.enabled,
+            "sample_rate": self.sample_rate,
+            "traces_sampled": self.traces_sampled,
+            "spans_exported": self.spans_exported,
+            "spans_pending": len(self._pending),
+        }
+
+
+class TracingMiddleware(Middleware):
+    """Outermost middleware opening the root span of every tool call.
+    
+    Its ``middleware`` child span covers the rest of the middleware chain;
+    the handler's own spans nest inside it, so the span's self time is the
+    time spent in middleware.
+    """
+    
+    def __init__(self, tracer: "Tracer"):
+        """Initialize the middleware."""
+        self.tracer = tracer
+    
+    async def on_call_tool(self, context: MiddlewareContext, call_next: Any) -> Any:
+        """Trace a tool call."""
+        with self.tracer.trace("tools/call", tool=context.message.name), self.tracer.span("middleware"):
+            return await call_next(context)
+
+
+def create_tracer(config: TracingConfig, service_name: str) -> Tracer:
+    """Create a tracer from configuration."""
+    if not config.enabled:
+        return Tracer(service_name=service_name)
+    return Tracer(
+        sample_rate=config.sample_rate,
+        exporter=OtlpJsonFileExporter(config.export_path),
+        batch_size=config.batch_size,
+        service_name=service_name,
+    )
+
+
+# Global tracer instance, disabled until the server configures one
+_tracer: Optional[Tracer] = None
+
+
+def get_tracer() -> Tracer:
+    """Get the global tracer instance."""
+    global _tracer
+    if _tracer is None:
+        _tracer = Tracer()
+    return _tracer
+
+
+def set_tracer(tracer: Tracer) -> None:
+    """Set the global tracer instance."""
+    global _tracer
+    _tracer = tracer
@@ -0,0 +1,39 @@
+"""Compiled tool input validators, built once per tool schema."""
+
+from typing import Any, Callable, Dict, Optional
+
+from pydantic import TypeAdapter
+
+
+class ValidatorRegistry:
+    """One ``TypeAdapter`` per tool input schema.
+    
+    Building an adapter compiles the schema into a pydantic-core validator;
+    every call afterwards is a single core call on the decoded arguments.
+    The core validator's method is kept directly, skipping the per-call
+    Python overhead of ``TypeAdapter.validate_python``.
+    """
+    
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._validate_python: Dict[str, Callable[[Any], Any]] = {}
+        self._schemas: Dict[str, Dict[str, Any]] = {}
+    
+    def __contains__(self, tool_name: str) -> bool:
+        """Whether a tool has a registered validator."""
+        return tool_name in self._schemas
+    
+    def register(self, tool_name: str, input_type: Any) -> Dict[str, Any]:
+        """Compile the validator of a tool and return its JSON schema for the tool listing."""
+        adapter = TypeAdapter(input_type)
+        self._validate_python[tool_name] = adapter.validator.validate_python
+        self._schemas[tool_name] = adapter.json_schema()
+        return self._schemas[tool_name]
+    
+    def json_schema(self, tool_name: str) -> Dict[str, Any]:
+        """Get the JSON schema of a tool's input."""
+        return self._schemas[tool_name]
+    
+    def validate(self, tool_name: str, arguments: Optional[Dict[str, Any]]) -> Any:
+        """Validate decoded tool arguments."""
+        return self._validate_python[tool_name](arguments or {})
@@ -0,0 +1,180 @@
+"""Tests for the batched audit pipeline."""
+
+import json
+import threading
+import time
+
+import pytest
+
+from template_mcp.audit_pipeline import AuditPipeline, AuditSink, JsonLinesFileSink, encode_event
+from template_mcp.logging import AuditLogger
+from template_mcp.models import UserRole
+
+
+class MemorySink(AuditSink):
+    """Sink keeping written batches, optionally holding the writer on a gate."""
+    
+    def __init__(self, gate=None):
+        self.batches = []
+        self.gate = gate
+        self.closed = False
+    
+    def write(self, batch):
+        if self.gate is not None:
+            self.gate.wait(5)
+        self.batches.append(batch)
+    
+    def close(self):
+        self.closed = True
+    
+    @property
+    def events(self):
+        return [event for batch in self.batches for event in batch]
+
+
+def event(result, number=0):
+    """Build a minimal audit event."""
+    return {"event": "Tool execution", "timestamp": time.time(), "result": result, "number": number}
+
+
+class TestAuditPipeline:
+    """Test buffering, batching and overflow policies."""
+    
+    def test_events_are_written_in_batches(self):
+        """Test that buffered events are written in batches of at most batch_size."""
+        sink = MemorySink()
+        pipeline = AuditPipeline(sink, capacity=100, batch_size=4, flush_interval=0.01)
+        pipeline.start()
+        
+        for i in range(10):
+            pipeline.submit(event("success", i))
+        assert pipeline.flush()
+        pipeline.close()
+        
+        assert [e["number"] for e in sink.events] == list(range(10))
+        assert all(len(batch) <= 4 for batch in sink.batches)
+        assert pipeline.get_stats()["written"] == 10
+        assert sink.closed is True
+    
+    def test_close_writes_remaining_events(self):
+        """Test that closing drains the buffer."""
+        sink = MemorySink()
+        pipeline = AuditPipeline(sink, batch_size=1000, flush_interval=60)
+        pipeline.start()
+        
+        pipeline.submit(event("success"))
+        pipeline.close()
+        
+        assert len(sink.events) == 1
+    
+    def test_drop_oldest(self):
+        """Test that a full buffer discards its oldest event."""
+        sink = MemorySink()
+        pipeline = AuditPipeline(sink, capacity=3, overflow_policy="drop_oldest")
+        
+        for i in range(5):
+            assert pipeline.submit(event("success", i)) is True
+        pipeline.start()
+        pipeline.close()
+        
+        assert [e["number"] for e in sink.events] == [2, 3, 4]
+        assert pipeline.get_stats()["dropped"] == 2
+    
+    def test_drop_success_keeps_errors(self):
+        """Test that only success events are shed under drop_success."""
+        sink = MemorySink()
+        pipeline = AuditPipeline(sink, capacity=3, overflow_policy="drop_success")
+        
+        pipeline.submit(event("success", 0))
+        pipeline.submit(event("error", 1))
+        pipeline.submit(event("success", 2))
+        assert pipeline.submit(event("success", 3)) is False
+        assert pipeline.submit(event("denied", 4)) is True
+        pipeline.start()
+        pipeline.close()
+        
+        assert [e["number"] for e in sink.events] == [1, 2, 4]
+        stats = pipeline.get_stats()
+        assert stats["dropped"] == 2
+        assert stats["dropped_success"] == 2
+    
+    def test_block_waits_for_writer(self):
+        """Test that the block policy waits for space instead of dropping."""
+        gate = threading.Event()
+        sink = MemorySink(gate)
+        pipeline = AuditPipeline(sink, capacity=2, batch_size=1, flush_interval=0.01, overflow_policy="block")
+        pipeline.start()
+        
+        submitted = []
+        producer = threading.Thread(
+            target=lambda: submitted.extend(pipeline.submit(event("success", i)) for i in range(6))
+        )
+        producer.start()
+        time.sleep(0.1)
+        assert producer.is_alive()  # stuck on a full buffer while the sink is held
+        
+        gate.set()
+        producer.join(5)
+        pipeline.close()
+        
+        assert submitted == [True] * 6
+        assert [e["number"] for e in sink.events] == list(range(6))
+        assert pipeline.get_stats()["blocked"] > 0
+        assert pipeline.get_stats()["dropped"] == 0
+    
+    def test_invalid_policy(self):
+        """Test that unknown overflow policies are rejected."""
+        with pytest.raises(ValueError):
+            AuditPipeline(MemorySink(), overflow_policy="drop_everything")
+
+
+class TestJsonLinesFileSink:
+    """Test the JSON lines file sink."""
+    
+    def test_writes_json_lines(self, tmp_path):
+        """Test that events are appended as JSON lines with ISO timestamps."""
+        sink = JsonLinesFileSink(str(tmp_path / "audit" / "audit.log"))
+        sink.write([{"event": "Tool execution", "timestamp": 0.0, "user_role": UserRole.ADMIN}])
+        sink.close()
+        
+        record = json.loads((tmp_path / "audit" / "audit.log").read_text())
+        assert record["timestamp"] == "1970-01-01T00:00:00+00:00"
+        assert record["user_role"] == "admin"
+    
+    def test_encode_event_keeps_source_event(self):
+        """Test that encoding does not mutate the buffered event."""
+        source = {"event": "Server event", "timestamp": 1.5}
+        encode_event(source)
+        assert source["timestamp"] == 1.5
+    
+    def test_sink_must_implement_write(self):
+        """Test that a sink without write cannot be created."""
+        class IncompleteSink(AuditSink):
+            pass
+        
+        with pytest.raises(TypeError):
+            IncompleteSink()
+
+
+class TestAuditLoggerPipeline:
+    """Test AuditLogger routing through the pipeline."""
+    
+    def test_single_write_per_event(self):
+        """Test that each audit call produces exactly one pipeline event."""
+        sink = MemorySink()
+        pipeline = AuditPipeline(sink)
+        pipeline.start()
+        audit_logger = AuditLogger(pipeline)
+        
+        audit_logger.log_tool_execution("hello", "u1", UserRole.USER, "success", execution_time_ms=1.0)
+        audit_logger.log_authorization_check("u1", UserRole.USER, "tools/hello", "read", "allowed")
+        audit_logger.log_server_event("server_start", "starting")
+        pipeline.close()
+        
+        assert [e["event"] for e in sink.events] == ["Tool execution", "Authorization check", "Server event"]
+        assert sink.events[0]["tool_name"] == "hello"
+        assert audit_logger.get_stats()["written"] == 3
+    
+    def test_without_pipeline(self):
+        """Test that stats report when no pipeline is set up."""
+        assert AuditLogger().get_stats() == {"pipeline": False}
@@ -0,0 +1,152 @@
+"""Tests for sampled audit logging."""
+
+import time
+
+import pytest
+
+from template_mcp.audit_pipeline import SUMMARY_EVENT_TYPE, AuditPipeline, AuditSink, is_sheddable
+from template_mcp.audit_sampling import AuditSampler, create_sampler
+from template_mcp.config import AuditConfig
+from template_mcp.logging import AuditLogger
+from template_mcp.models import UserRole
+
+
+class ListSink(AuditSink):
+    """Sink keeping written events."""
+    
+    def __init__(self):
+        self.events = []
+    
+    def write(self, batch):
+        self.events.extend(batch)
+
+
+class FakeClock:
+    """Manually advanced clock."""
+    
+    def __init__(self, now=1000.0):
+        self.now = now
+    
+    def __call__(self):
+        return self.now
+
+
+def never():
+    """Random source that never keeps a sampled event."""
+    return 1.0
+
+
+class TestAuditSampler:
+    """Test sampling decisions and suppressed counts."""
+    
+    def test_rate_lookup_order(self):
+        """Test that tool:role beats tool, which beats *:role and the default."""
+        sampler = AuditSampler(0.5, {"hello:user": 0.1, "hello": 0.2, "*:guest": 0.3})
+        
+        assert sampler.rate("hello", "user") == 0.1
+        assert sampler.rate("hello", "guest") == 0.2
+        assert sampler.rate("tools/hello", "guest") == 0.2
+        assert sampler.rate("server_info", "guest") == 0.3
+        assert sampler.rate("server_info", "user") == 0.5
+    
+    def test_errors_denials_and_admins_are_kept(self):
+        """Test that only routine non-admin events are sampled."""
+        sampler = AuditSampler(0.0, rng=never)
+        
+        assert sampler.sample("tool_execution", "hello", "user", "error") == 1.0
+        assert sampler.sample("authorization_check", "tools/hello", "guest", "denied") == 1.0
+        assert sampler.sample("tool_execution", "hello", "admin", "success") == 1.0
+        assert sampler.sample("tool_execution", "hello", "user", "success") is None
+        assert sampler.sample("authorization_check", "tools/hello", "user", "allowed") is None
+    
+    def test_drain_counts_suppressed_events(self):
+        """Test that summaries count sampled-out events per key and reset the window."""
+        clock = FakeClock()
+        sampler = AuditSampler(0.0, report_interval=60, clock=clock, rng=never)
+        for _ in range(3):
+            sampler.sample("tool_execution", "hello", "user", "success")
+        sampler.sample("tool_execution", "hello", "guest", "success")
+        clock.now += 60
+        
+        assert sampler.due()
+        summaries = sorted(sampler.drain(), key=lambda summary: summary["suppressed"])
+        
+        assert [(s["tool_name"], s["user_role"], s["suppressed"]) for s in summaries] == [
+            ("hello", "guest", 1),
+            ("hello", "user", 3),
+        ]
+        assert summaries[0]["event_type"] == SUMMARY_EVENT_TYPE
+        assert (summaries[0]["window_start"], summaries[0]["window_end"]) == (1000.0, 1060.0)
+        assert not sampler.due()
+        assert sampler.drain() == []
+    
+    def test_invalid_rate(self):
+        """Test that rates must be fractions."""
+        with pytest.raises(ValueError):
+            AuditSampler(1.0, {"hello": 2.0})
+    
+    def test_create_sampler(self):
+        """Test that no sampler is created when every event is kept."""
+        assert create_sampler(AuditConfig()) is None
+        assert create_sampler(AuditConfig(sample_rates={"hello": 0.1})).rate("hello", "user") == 0.1
+
+
+class TestAuditLoggerSampling:
+    """Test AuditLogger with a sampler."""
+    
+    def test_totals_stay_exact(self):
+        """Test that kept events plus summary counts equal the events logged."""
+        sink = ListSink()
+        pipeline = AuditPipeline(sink)
+        pipeline.start()
+        clock = FakeClock()
+        sampler = AuditSampler(0.25, report_interval=10, clock=clock)
+        audit_logger = AuditLogger(pipeline, sampler)
+        
+        for i in range(1000):
+            audit_logger.log_tool_execution("hello", f"u{i}", UserRole.USER, "success", execution_time_ms=0.1)
+            if i == 500:
+                clock.now += 10
+        audit_logger.log_tool_execution("hello", "u1", UserRole.USER, "error", error_message="boom")
+        audit_logger.set_sampler(None)
+        pipeline.close()
+        
+        kept = [e for e in sink.events if e["event_type"] == "tool_execution" and e["result"] == "success"]
+        summaries = [e for e in sink.events if e["event_type"] == SUMMARY_EVENT_TYPE]
+        
+        assert len(kept) + sum(s["suppressed"] for s in summaries) == 1000
+        assert len(summaries) == 2
+        assert all(e["sample_rate"] == 0.25 for e in kept)
+        assert [e["error_message"] for e in sink.events if e["result"] == "error"] == ["boom"]
+        assert audit_logger.get_stats()["pipeline"] is True
+    
+    def test_summaries_written_without_further_events(self):
+        """Test that a window's summary is written on time after traffic stops."""
+        sink = ListSink()
+        pipeline = AuditPipeline(sink, flush_interval=0.01)
+        pipeline.start()
+        audit_logger = AuditLogger(pipeline, AuditSampler(0.0, report_interval=0.05, rng=never))
+        
+        for i in range(10):
+            audit_logger.log_tool_execution("hello", f"u{i}", UserRole.USER, "success")
+        deadline = time.monotonic() + 5
+        while not sink.events and time.monotonic() < deadline:
+            time.sleep(0.01)
+        summaries = list(sink.events)
+        audit_logger.set_sampler(None)
+        pipeline.close()
+        
+        assert [s["event_type"] for s in summaries] == [SUMMARY_EVENT_TYPE]
+        assert summaries[0]["suppressed"] == 10
+    
+    def test_stats(self):
+        """Test that sampling counters are reported."""
+        audit_logger = AuditLogger(sampler=AuditSampler(0.0, rng=never))
+        audit_logger.log_authorization_check("u1", UserRole.GUEST, "tools/hello", "call", "allowed")
+        
+        assert audit_logger.get_stats()["sampling"]["suppressed"] == 1
+    
+    def test_summaries_are_never_shed(self):
+        """Test that the drop_success overflow policy keeps summary records."""
+        assert is_sheddable({"event_type": "tool_execution", "result": "success"})
+        assert not is_sheddable({"event_type": SUMMARY_EVENT_TYPE, "result": "success"})
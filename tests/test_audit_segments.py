@@ -0,0 +1,336 @@
+"""Tests for binary audit segments and their indexes."""
+
+import threading
+
+import pytest
+
+from template_mcp.audit_pipeline import encode_event
+from template_mcp.audit_segments import (
+    INDEX_SUFFIX,
+    TIME_BLOCK_RECORDS,
+    AuditSegmentStore,
+    SegmentedAuditSink,
+    SegmentIndex,
+    SegmentReader,
+    decode_cursor,
+    decode_record,
+    encode_cursor,
+    encode_record,
+)
+from template_mcp.models import UserRole
+
+
+def tool_event(timestamp, user_id="u1", tool="hello", result="success", role=UserRole.USER):
+    """Build a tool execution audit event."""
+    return {
+        "event": "Tool execution",
+        "event_type": "tool_execution",
+        "timestamp": timestamp,
+        "tool_name": tool,
+        "user_id": user_id,
+        "user_role": role,
+        "result": result,
+        "execution_time_ms": 0.25,
+        "error_message": None,
+    }
+
+
+class FakeClock:
+    """Manually advanced clock."""
+    
+    def __init__(self, now=1000.0):
+        self.now = now
+    
+    def __call__(self):
+        return self.now
+
+
+class TestRecordEncoding:
+    """Test the binary record format."""
+    
+    def test_round_trip(self):
+        """Test that a record decodes to the original event."""
+        event = tool_event(1700000000.123456)
+        record, timestamp_us, user_id, tool = encode_record(event)
+        decoded, next_offset = decode_record(record, 0)
+        
+        assert next_offset == len(record)
+        assert timestamp_us == 1700000000123456
+        assert (user_id, tool) == ("u1", "hello")
+        assert decoded == {**event, "user_role": "user"}
+    
+    def test_unknown_enum_values_are_kept(self):
+        """Test that values outside the code tables survive as plain fields."""
+        event = {
+            "event": "Server event",
+            "event_type": "authorization_circuit_changed",
+            "timestamp": 1.0,
+            "result": "partial",
+            "resource": "tools/hello",
+        }
+        decoded, _ = decode_record(encode_record(event)[0], 0)
+        
+        assert decoded["event_type"] == "authorization_circuit_changed"
+        assert decoded["result"] == "partial"
+        assert decoded["resource"] == "tools/hello"
+        assert decoded["user_id"] is None
+    
+    def test_smaller_than_json_lines(self):
+        """Test that records are more compact than the JSON lines format."""
+        event = tool_event(1700000000.5)
+        assert len(encode_record(event)[0]) < len(encode_event(event)) * 0.75
+
+
+class TestSegmentedAuditSink:
+    """Test segment writing and rotation."""
+    
+    def test_rotates_by_size(self, tmp_path):
+        """Test that a full segment is sealed with its index."""
+        sink = SegmentedAuditSink(str(tmp_path), max_bytes=200, clock=FakeClock())
+        for i in range(5):
+            sink.write([tool_event(1000.0 + i)])
+        sink.close()
+        
+        segments = sorted(tmp_path.glob("*.seg"))
+        assert len(segments) > 1
+        assert all(segment.with_suffix(INDEX_SUFFIX).exists() for segment in segments)
+        assert sink.segments_sealed == len(segments)
+    
+    def test_rotates_by_age(self, tmp_path):
+        """Test that an old segment is sealed before the next write."""
+        clock = FakeClock()
+        sink = SegmentedAuditSink(str(tmp_path), max_age=60, clock=clock)
+        sink.write([tool_event(1000.0)])
+        first = sink.active_path
+        clock.now += 61
+        sink.write([tool_event(1061.0)])
+        
+        assert sink.active_path != first
+        assert first.with_suffix(INDEX_SUFFIX).exists()
+        sink.close()
+    
+    def test_records_are_readable(self, tmp_path):
+        """Test that a sealed segment can be scanned back."""
+        sink = SegmentedAuditSink(str(tmp_path), clock=FakeClock())
+        sink.write([tool_event(1000.0 + i, user_id=f"u{i}") for i in range(3)])
+        sink.close()
+        
+        reader = SegmentReader(next(tmp_path.glob("*.seg")))
+        assert [event["user_id"] for _, event in reader.scan()] == ["u0", "u1", "u2"]
+        reader.close()
+
+
+class TestSegmentIndex:
+    """Test segment indexes."""
+    
+    def test_postings_and_time_blocks_survive_reload(self, tmp_path):
+        """Test that a written index loads with the same postings and blocks."""
+        sink = SegmentedAuditSink(str(tmp_path), clock=FakeClock())
+        events = [
+            tool_event(1000.0 + i, user_id=f"u{i % 3}", tool="hello" if i % 2 else "server_info")
+            for i in range(TIME_BLOCK_RECORDS * 2 + 10)
+        ]
+        sink.write(events)
+        in_memory = sink.active_index
+        path = sink.active_path
+        sink.close()
+        
+        loaded = SegmentIndex.load(path.with_suffix(INDEX_SUFFIX))
+        assert loaded.count == len(events)
+        assert list(loaded.users["u1"]) == list(in_memory.users["u1"])
+        assert list(loaded.tools["hello"]) == list(in_memory.tools["hello"])
+        assert loaded.blocks == in_memory.blocks
+        assert len(loaded.blocks) == 3
+        
+        reader = SegmentReader(path)
+        assert all(reader.read(offset)["user_id"] == "u1" for offset in loaded.users["u1"])
+        reader.close()
+    
+    def test_block_ranges_skip_other_times(self):
+        """Test that time filters select only overlapping blocks."""
+        index = SegmentIndex()
+        for i in range(TIME_BLOCK_RECORDS * 3):
+            index.add(i * 10, 1_000_000 + i, None, None)
+        
+        ranges = index.block_ranges(1_000_000 + TIME_BLOCK_RECORDS, 1_000_000 + TIME_BLOCK_RECORDS + 5, end=99999)
+        assert ranges == [(TIME_BLOCK_RECORDS * 10, TIME_BLOCK_RECORDS * 20)]
+        assert index.overlaps(None, 999_999) is False
+    
+    def test_rejects_foreign_files(self, tmp_path):
+        """Test that a file without the index header is rejected."""
+        path = tmp_path / "bogus.idx"
+        path.write_bytes(b"not an index")
+        with pytest.raises(ValueError):
+            SegmentIndex.load(path)
+
+
+class TestAuditSegmentStore:
+    """Test listing segments with their indexes."""
+    
+    def test_sealed_unsealed_and_active_segments(self, tmp_path):
+        """Test that every kind of segment is listed with an index."""
+        clock = FakeClock()
+        other_worker = SegmentedAuditSink(str(tmp_path), clock=FakeClock(500.0))
+        other_worker.write([tool_event(500.0, user_id="other")])  # left unsealed
+        
+        sink = SegmentedAuditSink(str(tmp_path), max_age=60, clock=clock)
+        sink.write([tool_event(1000.0)])
+        clock.now += 61
+        sink.write([tool_event(1061.0, user_id="active")])
+        
+        store = AuditSegmentStore(str(tmp_path), sink)
+        segments = store.segments()
+        
+        assert len(segments) == 3
+        assert [list(index.users) for _, index in segments] == [["other"], ["u1"], ["active"]]
+        assert segments[-1][1] is not sink.active_index
+        assert segments[-1][1].count == sink.active_index.count
+    
+    def test_active_snapshot_does_not_grow(self, tmp_path):
+        """Test that the active segment's index is copied, so later writes and rotations do not change it."""
+        sink = SegmentedAuditSink(str(tmp_path))
+        sink.write([tool_event(1000.0)])
+        path, index = AuditSegmentStore(str(tmp_path), sink).segments()[-1]
+        
+        sink.write([tool_event(1001.0, user_id="later")])
+        sink.rotate()
+        
+        assert path.with_suffix(INDEX_SUFFIX).exists()
+        assert index.count == 1
+        assert list(index.users) == ["u1"]
+    
+    def test_unsealed_segment_is_indexed_incrementally(self, tmp_path):
+        """Test that records appended by another process appear in later listings."""
+        other_worker = SegmentedAuditSink(str(tmp_path), clock=FakeClock(500.0))
+        other_worker.write([tool_event(500.0, user_id="first")])
+        store = AuditSegmentStore(str(tmp_path))
+        assert list(store.segments()[0][1].users) == ["first"]
+        
+        other_worker.write([tool_event(501.0, user_id="second")])
+        index = store.segments()[0][1]
+        
+        assert sorted(index.users) == ["first", "second"]
+        assert index.count == 2
+
+
+def populate(tmp_path, clock=None):
+    """Write a day of mixed events over several segments, returning the sink."""
+    clock = clock or FakeClock(0.0)
+    sink = SegmentedAuditSink(str(tmp_path), max_age=6 * 3600, clock=clock)
+    for hour in range(24):
+        clock.now = hour * 3600.0
+        batch = []
+        for minute in range(0, 60, 10):
+            timestamp = clock.now + minute * 60
+            batch.append(tool_event(timestamp, user_id=f"u{minute // 10}", tool="hello"))
+            batch.append(tool_event(timestamp + 1, user_id="admin1", tool="server_info",
+                                    role=UserRole.ADMIN, result="error" if minute == 0 else "success"))
+        sink.write(batch)
+    return sink
+
+
+class TestAuditQuery:
+    """Test filtered, paginated audit queries."""
+    
+    def test_filters_by_user_and_tool(self, tmp_path):
+        """Test that user and tool filters read the index postings."""
+        sink = populate(tmp_path)
+        store = AuditSegmentStore(str(tmp_path), sink)
+        
+        events, cursor = store.query(user_id="u3", tool="hello", limit=1000)
+        
+        assert cursor is None
+        assert len(events) == 24
+        assert {(event["user_id"], event["tool_name"]) for event in events} == {("u3", "hello")}
+        assert store.query(user_id="u3", tool="server_info") == ([], None)
+        assert store.query(user_id="nobody") == ([], None)
+    
+    def test_query_while_rotating(self, tmp_path):
+        """Test that queries from another thread stay consistent while the writer rotates segments."""
+        sink = SegmentedAuditSink(str(tmp_path), max_bytes=4096)
+        store = AuditSegmentStore(str(tmp_path), sink)
+        
+        def writer():
+            for second in range(300):
+                sink.write([tool_event(float(second), user_id=f"u{second % 3}") for _ in range(8)])
+        
+        thread = threading.Thread(target=writer)
+        thread.start()
+        seen = 0
+        while thread.is_alive():
+            events, _ = store.query(user_id="u1", limit=10_000)
+            assert {event["user_id"] for event in events} <= {"u1"}
+            assert len(events) >= seen
+            seen = len(events)
+        thread.join()
+        
+        assert sink.segments_sealed > 1
+        assert len(store.query(user_id="u1", limit=10_000)[0]) == 100 * 8
+    
+    def test_filters_by_role_and_result(self, tmp_path):
+        """Test that role and result filters match the stored codes."""
+        sink = populate(tmp_path)
+        store = AuditSegmentStore(str(tmp_path), sink)
+        
+        errors, _ = store.query(result="error", limit=1000)
+        admins, _ = store.query(user_role="admin", limit=1000)
+        
+        assert len(errors) == 24
+        assert {event["user_id"] for event in errors} == {"admin1"}
+        assert len(admins) == 144
+        assert store.query(user_role="guest") == ([], None)
+    
+    def test_unknown_result_values_are_matched(self, tmp_path):
+        """Test that results outside the code table are compared on the decoded event."""
+        sink = SegmentedAuditSink(str(tmp_path))
+        sink.write([tool_event(1.0, result="timeout"), tool_event(2.0, result="cancelled")])
+        store = AuditSegmentStore(str(tmp_path), sink)
+        
+        events, _ = store.query(result="timeout")
+        
+        assert [event["timestamp"] for event in events] == [1.0]
+    
+    def test_time_range(self, tmp_path):
+        """Test that events outside the time range are excluded."""
+        sink = populate(tmp_path)
+        store = AuditSegmentStore(str(tmp_path), sink)
+        
+        events, _ = store.query(since_us=10 * 3600 * 1_000_000, until_us=12 * 3600 * 1_000_000 - 1, limit=1000)
+        
+        assert len(events) == 24
+        assert all(10 * 3600 <= event["timestamp"] < 12 * 3600 for event in events)
+    
+    def test_cursor_pagination(self, tmp_path):
+        """Test that following cursors returns every event exactly once, in order."""
+        sink = populate(tmp_path)
+        store = AuditSegmentStore(str(tmp_path), sink)
+        expected, _ = store.query(tool="hello", limit=1000)
+        
+        pages = []
+        cursor = None
+        while True:
+            events, cursor = store.query(tool="hello", limit=50, cursor=cursor)
+            pages.append(events)
+            if cursor is None:
+                break
+        
+        assert [len(page) for page in pages] == [50, 50, 44]
+        assert [event for page in pages for event in page] == expected
+    
+    def test_scan_pagination_without_index_filters(self, tmp_path):
+        """Test that cursors also resume a time-block scan."""
+        sink = populate(tmp_path)
+        store = AuditSegmentStore(str(tmp_path), sink)
+        
+        first, cursor = store.query(limit=200)
+        rest, end = store.query(limit=200, cursor=cursor)
+        
+        assert len(first) == 200 and len(rest) == 88 and end is None
+        assert first[-1]["timestamp"] < rest[0]["timestamp"]
+    
+    def test_invalid_cursor(self, tmp_path):
+        """Test that a malformed cursor is rejected."""
+        store = AuditSegmentStore(str(tmp_path))
+        with pytest.raises(ValueError):
+            store.query(cursor="not a cursor")
+        assert decode_cursor(encode_cursor("audit-1.seg", 42)) == ("audit-1.seg", 42)
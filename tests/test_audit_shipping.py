@@ -0,0 +1,212 @@
+"""Tests for shipping audit batches to the audit sidecar."""
+
+import gzip
+import json
+import os
+import socket
+import threading
+
+import pytest
+
+from template_mcp.audit_shipping import (
+    SPILL_SUFFIX,
+    AuditSidecar,
+    RotatingAuditFile,
+    SocketAuditSink,
+    _FRAME,
+)
+from template_mcp.config import AuditConfig
+from template_mcp.logging import setup_audit, shutdown_audit
+
+
+class FakeClock:
+    """Manually advanced clock."""
+    
+    def __init__(self, now=1000.0):
+        self.now = now
+    
+    def __call__(self):
+        return self.now
+
+
+def event(n, result="success"):
+    """Build a small audit event."""
+    return {"event_type": "tool_execution", "timestamp": 1000.0 + n, "tool_name": "hello", "n": n, "result": result}
+
+
+def read_events(path):
+    """Read the events of a JSON lines file."""
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+@pytest.fixture
+def sidecar_factory(tmp_path):
+    """Start sidecars on a short socket path and stop them after the test."""
+    started = []
+    
+    def start():
+        sidecar = AuditSidecar(str(tmp_path / "s.sock"), RotatingAuditFile(str(tmp_path / "audit.log")))
+        thread = threading.Thread(target=sidecar.serve_forever, daemon=True)
+        thread.start()
+        started.append((sidecar, thread))
+        return sidecar
+    
+    yield start
+    for sidecar, thread in started:
+        sidecar.shutdown()
+        sidecar.server_close()
+        thread.join()
+
+
+class TestSocketAuditSink:
+    """Test delivery, spilling and replay."""
+    
+    def test_batches_reach_the_sidecar_file(self, tmp_path, sidecar_factory):
+        """Acknowledged batches are in the sidecar's audit file."""
+        sidecar = sidecar_factory()
+        sink = SocketAuditSink(sidecar.server_address, str(tmp_path / "spill"))
+        sink.write([event(1), event(2)])
+        sink.write([event(3)])
+        sink.close()
+        
+        assert [e["n"] for e in read_events(tmp_path / "audit.log")] == [1, 2, 3]
+        assert sink.get_stats()["shipped"] == 2
+        assert sidecar.batches == 2
+    
+    def test_spills_while_sidecar_is_down_and_replays_in_order(self, tmp_path, sidecar_factory):
+        """Batches written while the sidecar is down are delivered first, oldest first."""
+        clock = FakeClock()
+        spill = tmp_path / "spill"
+        sink = SocketAuditSink(str(tmp_path / "s.sock"), str(spill), retry_interval=1.0, clock=clock)
+        sink.write([event(1)])
+        sink.write([event(2)])
+        assert len(list(spill.glob(f"*{SPILL_SUFFIX}"))) == 2
+        assert sink.get_stats()["spilled"] == 2
+        
+        sidecar_factory()
+        sink.write([event(3)])  # Still within the retry interval
+        assert sink.get_stats()["spilled"] == 3
+        
+        clock.now += 1.0
+        sink.write([event(4)])
+        sink.close()
+        
+        assert [e["n"] for e in read_events(tmp_path / "audit.log")] == [1, 2, 3, 4]
+        assert list(spill.iterdir()) == []
+        assert sink.get_stats()["replayed"] == 3
+    
+    def test_replays_spill_left_by_previous_run(self, tmp_path, sidecar_factory):
+        """A new sink delivers batches spilled before a restart."""
+        spill = tmp_path / "spill"
+        SocketAuditSink(str(tmp_path / "s.sock"), str(spill)).write([event(1)])
+        
+        sidecar = sidecar_factory()
+        sink = SocketAuditSink(sidecar.server_address, str(spill))
+        sink.write([event(2)])
+        sink.close()
+        
+        assert [e["n"] for e in read_events(tmp_path / "audit.log")] == [1, 2]
+    
+    def test_unacknowledged_batch_is_spilled(self, tmp_path):
+        """A batch whose ack never arrives is kept for redelivery."""
+        path = str(tmp_path / "s.sock")
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(path)
+        server.listen()
+        
+        def accept_and_close():
+            conn, _ = server.accept()
+            conn.recv(65536)
+            conn.close()
+        
+        thread = threading.Thread(target=accept_and_close)
+        thread.start()
+        sink = SocketAuditSink(path, str(tmp_path / "spill"))
+        sink.write([event(1)])
+        thread.join()
+        server.close()
+        
+        spilled = list((tmp_path / "spill").glob(f"*{SPILL_SUFFIX}"))
+        assert len(spilled) == 1
+        assert json.loads(spilled[0].read_bytes())["n"] == 1
+        assert not sink.get_stats()["connected"]
+
+
+class TestAuditSidecar:
+    """Test the sidecar server."""
+    
+    def test_oversized_frame_drops_connection(self, tmp_path, sidecar_factory):
+        """A corrupt length prefix closes the connection without writing."""
+        sidecar = sidecar_factory()
+        client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        client.connect(sidecar.server_address)
+        client.sendall(_FRAME.pack(0xFFFFFFFF, 1))
+        assert client.recv(8) == b""
+        client.close()
+        assert sidecar.batches == 0
+    
+    def test_replaces_stale_socket(self, tmp_path, sidecar_factory):
+        """A socket file left by a crashed sidecar does not block startup."""
+        (tmp_path / "s.sock").write_text("")
+        sidecar = sidecar_factory()
+        assert os.path.exists(sidecar.server_address)
+
+
+class TestRotatingAuditFile:
+    """Test rotation, compression and retention."""
+    
+    def test_rotates_by_size_and_compresses(self, tmp_path):
+        """Rotated files are gzipped off the write path."""
+        output = RotatingAuditFile(str(tmp_path / "audit.log"), max_bytes=10)
+        output.write(b"first-line\n")
+        output.write(b"second\n")
+        output.close()
+        
+        rotated = list(tmp_path.glob("audit.*.log.gz"))
+        assert len(rotated) == 1
+        assert gzip.decompress(rotated[0].read_bytes()) == b"first-line\n"
+        assert (tmp_path / "audit.log").read_bytes() == b"second\n"
+    
+    def test_rotates_by_age(self, tmp_path):
+        """Files older than max_age are rotated on the next write."""
+        clock = FakeClock()
+        output = RotatingAuditFile(str(tmp_path / "audit.log"), max_age=60, compression=False, clock=clock)
+        output.write(b"a\n")
+        clock.now += 60
+        output.write(b"b\n")
+        output.close()
+        
+        assert len(list(tmp_path.glob("audit.*.log"))) == 1
+        assert (tmp_path / "audit.log").read_bytes() == b"b\n"
+    
+    def test_retention_purges_old_files(self, tmp_path):
+        """Rotated files older than the retention period are deleted."""
+        old = tmp_path / "audit.2020-01-01_00-00-00-000000.log.gz"
+        old.write_bytes(b"")
+        os.utime(old, (0, 0))
+        output = RotatingAuditFile(str(tmp_path / "audit.log"), max_bytes=1, retention=3600)
+        output.write(b"a\n")
+        output.write(b"b\n")
+        output.close()
+        
+        assert not old.exists()
+        assert len(list(tmp_path.glob("audit.*.log.gz"))) == 1
+
+
+class TestSidecarStorage:
+    """Test selecting the sidecar from configuration."""
+    
+    def test_setup_audit_ships_to_sidecar(self, tmp_path, sidecar_factory):
+        """storage=sidecar routes the audit pipeline through the socket sink."""
+        sidecar = sidecar_factory()
+        config = AuditConfig(
+            storage="sidecar", sidecar_socket=sidecar.server_address, spill_dir=str(tmp_path / "spill")
+        )
+        pipeline = setup_audit(config)
+        try:
+            assert isinstance(pipeline.sink, SocketAuditSink)
+            pipeline.submit(event(1))
+        finally:
+            shutdown_audit()
+        
+        assert [e["n"] for e in read_events(tmp_path / "audit.log")] == [1]
@@ -0,0 +1,389 @@
+"""Tests for authorizers and the authorization middleware."""
+
+import asyncio
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastmcp.exceptions import ToolError
+
+from template_mcp.authorization import (
+    AuthorizationMiddleware,
+    AuthorizationUnavailableError,
+    Authorizer,
+    CachingAuthorizer,
+    CircuitBreakerAuthorizer,
+    LocalAuthorizer,
+    Principal,
+    PrincipalResolver,
+    RemoteAuthorizer,
+    create_authorizer,
+)
+from template_mcp.cache import TTLCache
+from template_mcp.circuit_breaker import OPEN, CircuitBreaker
+from template_mcp.config import EunomiaConfig
+from template_mcp.models import UserRole
+from template_mcp.policies import AuthorizationDecision, PolicyStore
+
+POLICIES_FILE = str(Path(__file__).parent.parent / "configs" / "eunomia_policies.json")
+
+
+class CountingAuthorizer(Authorizer):
+    """Authorizer allowing only the user role and counting calls."""
+    
+    def __init__(self):
+        self.calls = 0
+    
+    async def authorize(self, principal, action, resource):
+        self.calls += 1
+        return AuthorizationDecision(allowed=principal.role == "user")
+
+
+def access_token(role=None, scopes=(), sub="u1"):
+    """Build a verified access token with an optional role claim."""
+    claims = {"sub": sub} if role is None else {"sub": sub, "role": role}
+    return SimpleNamespace(client_id="client", scopes=list(scopes), claims=claims)
+
+
+class TestPrincipalResolver:
+    """Test principal resolution from verified access tokens."""
+    
+    def test_without_token_uses_default_role(self):
+        """Test that callers without a token get the default role."""
+        assert PrincipalResolver().from_token(None) == Principal(user_id=None, role="guest")
+        assert PrincipalResolver(default_role="user").from_token(None) == Principal(role="user")
+    
+    def test_role_claim(self):
+        """Test that the role claim and subject identify the caller."""
+        principal = PrincipalResolver().from_token(access_token(UserRole.ADMIN.value))
+        
+        assert principal == Principal(user_id="u1", role="admin")
+    
+    def test_scopes_fallback(self):
+        """Test that the most privileged role scope is used without a role claim."""
+        principal = PrincipalResolver().from_token(access_token(scopes=["read", "user", "admin"]))
+        
+        assert principal.role == "admin"
+    
+    def test_unknown_role_uses_default(self):
+        """Test that roles outside the known set are not trusted."""
+        assert PrincipalResolver().from_token(access_token("root")).role == "guest"
+    
+    def test_current_request_token(self):
+        """Test that the resolver reads the token of the current request."""
+        with patch("template_mcp.authorization.get_access_token", return_value=access_token("user")):
+            assert PrincipalResolver()() == Principal(user_id="u1", role="user")
+
+
+class TestCachingAuthorizer:
+    """Test the decision cache wrapper."""
+    
+    @pytest.fixture
+    def inner(self):
+        """Create the wrapped authorizer."""
+        return CountingAuthorizer()
+    
+    @pytest.mark.asyncio
+    async def test_repeated_decisions_hit_cache(self, inner):
+        """Test that repeated triples are answered from the cache."""
+        authorizer = CachingAuthorizer(inner, TTLCache(100), allow_ttl=60, deny_ttl=60)
+        principal = Principal(user_id="u1", role="user")
+        
+        for _ in range(5):
+            decision = await authorizer.authorize(principal, "read", "tools/hello")
+            assert decision.allowed is True
+        
+        assert inner.calls == 1
+        stats = authorizer.get_stats()["cache"]
+        assert stats["hits"] == 4
+        assert stats["misses"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_deny_ttl(self, inner):
+        """Test that deny decisions use their own TTL."""
+        authorizer = CachingAuthorizer(inner, TTLCache(100), allow_ttl=60, deny_ttl=0)
+        guest = Principal(role="guest")
+        
+        await authorizer.authorize(guest, "read", "tools/hello")
+        await authorizer.authorize(guest, "read", "tools/hello")
+        
+        assert inner.calls == 2
+    
+    @pytest.mark.asyncio
+    async def test_invalidate_by_principal(self, inner):
+        """Test explicit invalidation for one principal."""
+        authorizer = CachingAuthorizer(inner, TTLCache(100), allow_ttl=60, deny_ttl=60)
+        alice = Principal(user_id="alice", role="user")
+        bob = Principal(user_id="bob", role="user")
+        await authorizer.authorize(alice, "read", "tools/hello")
+        await authorizer.authorize(bob, "read", "tools/hello")
+        
+        assert authorizer.invalidate(principal=alice) == 1
+        await authorizer.authorize(alice, "read", "tools/hello")
+        await authorizer.authorize(bob, "read", "tools/hello")
+        
+        assert inner.calls == 3
+
+
+class TestCreateAuthorizer:
+    """Test authorizer construction from configuration."""
+    
+    def test_authorizer_must_implement_authorize(self):
+        """Test that an authorizer without authorize cannot be created."""
+        class IncompleteAuthorizer(Authorizer):
+            pass
+        
+        with pytest.raises(TypeError):
+            IncompleteAuthorizer()
+    
+    def test_middleware_mode(self):
+        """Test that middleware mode leaves decisions to the Eunomia middleware."""
+        assert create_authorizer(EunomiaConfig()) is None
+    
+    def test_local_mode(self):
+        """Test local mode builds the embedded engine."""
+        authorizer = create_authorizer(EunomiaConfig(mode="local", policies_file=POLICIES_FILE))
+        
+        assert isinstance(authorizer, LocalAuthorizer)
+    
+    def test_remote_mode_with_cache(self):
+        """Test remote mode wrapped with the decision cache."""
+        authorizer = create_authorizer(
+            EunomiaConfig(mode="remote", cache_enabled=True, cache_max_size=50, cache_deny_ttl=1)
+        )
+        
+        assert isinstance(authorizer, CachingAuthorizer)
+        assert isinstance(authorizer.inner, CircuitBreakerAuthorizer)
+        assert isinstance(authorizer.inner.inner, RemoteAuthorizer)
+        assert authorizer.cache.max_size == 50
+        assert authorizer.deny_ttl == 1
+    
+    @pytest.mark.asyncio
+    async def test_policy_reload_invalidates_cache(self, tmp_path):
+        """Test that cached local decisions are dropped when policies are reloaded."""
+        policies_file = tmp_path / "policies.json"
+        policies_file.write_text(Path(POLICIES_FILE).read_text())
+        store = PolicyStore(policies_file)
+        authorizer = create_authorizer(EunomiaConfig(mode="local", cache_enabled=True), store=store)
+        await authorizer.authorize(Principal(role="guest"), "list", "tools/hello")
+        
+        policies_file.write_text(policies_file.read_text().replace('"tools/hello"', '"tools/*"'))
+        await store.reload()
+        
+        assert len(authorizer.cache) == 0
+    
+    @pytest.mark.asyncio
+    async def test_local_authorizer_decisions(self):
+        """Test local decisions for the shipped policies, where unauthenticated callers are guests."""
+        authorizer = LocalAuthorizer(PolicyStore(POLICIES_FILE))
+        
+        assert (await authorizer.authorize(Principal(role="user"), "read", "tools/hello")).allowed is True
+        assert (await authorizer.authorize(Principal(role="guest"), "read", "tools/hello")).allowed is True
+        assert (await authorizer.authorize(Principal(role="guest"), "read", "tools/server_info")).allowed is False
+        assert (await authorizer.authorize(Principal(role="guest"), "read", "tools/audit_query")).allowed is False
+
+
+class TestBulkAuthorization:
+    """Test batched evaluation of many (action, resource) pairs."""
+    
+    @pytest.mark.asyncio
+    async def test_local_authorize_many(self):
+        """Test batched local decisions match single decisions."""
+        authorizer = LocalAuthorizer(PolicyStore(POLICIES_FILE))
+        requests = [("list", "tools/hello"), ("list", "tools/server_info"), ("read", "tools/server_info")]
+        guest = Principal(role="guest")
+        
+        decisions = await authorizer.authorize_many(guest, requests)
+        
+        assert [d.allowed for d in decisions] == [True, False, False]
+        for (action, resource), decision in zip(requests, decisions, strict=True):
+            assert decision == await authorizer.authorize(guest, action, resource)
+    
+    @pytest.mark.asyncio
+    async def test_caching_authorize_many_only_resolves_misses(self):
+        """Test that cached pairs are not sent to the wrapped authorizer."""
+        inner = CountingAuthorizer()
+        authorizer = CachingAuthorizer(inner, TTLCache(100), allow_ttl=60, deny_ttl=60)
+        principal = Principal(role="user")
+        await authorizer.authorize(principal, "list", "tools/a")
+        
+        decisions = await authorizer.authorize_many(principal, [("list", "tools/a"), ("list", "tools/b")])
+        
+        assert [d.allowed for d in decisions] == [True, True]
+        assert inner.calls == 2
+    
+    @pytest.mark.asyncio
+    async def test_middleware_filters_tools_list(self):
+        """Test that tools/list only returns tools the principal may list."""
+        authorizer = LocalAuthorizer(PolicyStore(POLICIES_FILE))
+        middleware = AuthorizationMiddleware(authorizer, audit_logger=MagicMock())
+        tools = [SimpleNamespace(name="hello"), SimpleNamespace(name="server_info")]
+        
+        visible = await middleware.on_list_tools(SimpleNamespace(message=None), AsyncMock(return_value=tools))
+        
+        assert [tool.name for tool in visible] == ["hello"]
+    
+    @pytest.mark.asyncio
+    async def test_mismatched_bulk_decisions_fail_closed(self):
+        """Test that fewer decisions than listed tools hides every tool instead of dropping checks."""
+        authorizer = CountingAuthorizer()
+        authorizer.authorize_many = AsyncMock(return_value=[AuthorizationDecision(allowed=True)])
+        middleware = AuthorizationMiddleware(authorizer, audit_logger=MagicMock())
+        tools = [SimpleNamespace(name="hello"), SimpleNamespace(name="server_info")]
+        
+        visible = await middleware.on_list_tools(SimpleNamespace(message=None), AsyncMock(return_value=tools))
+        
+        assert visible == []
+    
+    @pytest.mark.asyncio
+    async def test_caching_authorize_many_rejects_mismatched_decisions(self):
+        """Test that a short batch from the wrapped authorizer is not cached against the wrong pairs."""
+        inner = CountingAuthorizer()
+        inner.authorize_many = AsyncMock(return_value=[AuthorizationDecision(allowed=True)])
+        authorizer = CachingAuthorizer(inner, TTLCache(100), allow_ttl=60, deny_ttl=60)
+        
+        with pytest.raises(ValueError):
+            await authorizer.authorize_many(Principal(role="user"), [("list", "tools/a"), ("list", "tools/b")])
+        assert len(authorizer.cache) == 0
+    
+    @pytest.mark.asyncio
+    async def test_middleware_lists_tools_of_authenticated_caller(self):
+        """Test that tools/list is filtered for the caller's own role, not the guest role."""
+        authorizer = LocalAuthorizer(PolicyStore(POLICIES_FILE))
+        middleware = AuthorizationMiddleware(authorizer, audit_logger=MagicMock())
+        tools = [SimpleNamespace(name="hello"), SimpleNamespace(name="server_info")]
+        
+        with patch("template_mcp.authorization.get_access_token", return_value=access_token("user")):
+            visible = await middleware.on_list_tools(SimpleNamespace(message=None), AsyncMock(return_value=tools))
+        
+        assert [tool.name for tool in visible] == ["hello", "server_info"]
+    
+    @pytest.mark.asyncio
+    async def test_middleware_ignores_role_in_arguments(self):
+        """Test that a role claimed in the tool arguments does not grant access."""
+        authorizer = LocalAuthorizer(PolicyStore(POLICIES_FILE))
+        audit_logger = MagicMock()
+        middleware = AuthorizationMiddleware(authorizer, audit_logger)
+        arguments = {"user_id": "mallory", "user_role": "admin"}
+        context = SimpleNamespace(message=SimpleNamespace(name="server_info", arguments=arguments))
+        call_next = AsyncMock()
+        
+        with pytest.raises(ToolError):
+            await middleware.on_call_tool(context, call_next)
+        
+        call_next.assert_not_called()
+        assert audit_logger.log_authorization_check.call_args.kwargs["user_role"] == "guest"
+        assert audit_logger.log_authorization_check.call_args.kwargs["user_id"] is None
+
+
+class FlakyAuthorizer(Authorizer):
+    """Authorizer that can be switched into failure."""
+    
+    def __init__(self):
+        self.failing = False
+    
+    async def authorize(self, principal, action, resource):
+        if self.failing:
+            raise ConnectionError("eunomia down")
+        return AuthorizationDecision(allowed=True, policy_id="remote")
+
+
+class TestCircuitBreakerAuthorizer:
+    """Test circuit breaker fallbacks for authorization."""
+    
+    @pytest.mark.asyncio
+    async def test_fail_fast(self):
+        """Test that failures raise instead of waiting while the circuit is open."""
+        inner = FlakyAuthorizer()
+        authorizer = CircuitBreakerAuthorizer(inner, CircuitBreaker(failure_threshold=1), call_timeout=1)
+        inner.failing = True
+        
+        with pytest.raises(AuthorizationUnavailableError):
+            await authorizer.authorize(Principal(role="user"), "read", "tools/hello")
+        
+        assert authorizer.circuit_state == OPEN
+        with pytest.raises(AuthorizationUnavailableError):
+            await authorizer.authorize(Principal(role="user"), "read", "tools/hello")
+        assert authorizer.get_stats()["circuit_breaker"]["rejected"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_stale_fallback(self):
+        """Test that last known decisions are served while the circuit is open."""
+        inner = FlakyAuthorizer()
+        authorizer = CircuitBreakerAuthorizer(
+            inner, CircuitBreaker(failure_threshold=1), call_timeout=1, fallback="stale", max_staleness=60
+        )
+        principal = Principal(role="user")
+        await authorizer.authorize(principal, "read", "tools/hello")
+        inner.failing = True
+        
+        decision = await authorizer.authorize(principal, "read", "tools/hello")
+        
+        assert decision.allowed is True
+        assert decision.stale is True
+        with pytest.raises(AuthorizationUnavailableError):
+            await authorizer.authorize(principal, "read", "tools/other")
+    
+    @pytest.mark.asyncio
+    async def test_stale_decisions_are_not_cached(self):
+        """Test that decisions served while the circuit is open are fetched again once it recovers."""
+        now = [0.0]
+        inner = FlakyAuthorizer()
+        breaker = CircuitBreaker(failure_threshold=1, open_seconds=10, clock=lambda: now[0])
+        authorizer = CachingAuthorizer(
+            CircuitBreakerAuthorizer(inner, breaker, call_timeout=1, fallback="stale", max_staleness=60),
+            TTLCache(100),
+            allow_ttl=300,
+            deny_ttl=300,
+        )
+        principal = Principal(role="user")
+        await authorizer.authorize(principal, "read", "tools/hello")
+        authorizer.invalidate()
+        inner.failing = True
+        
+        stale = await authorizer.authorize(principal, "read", "tools/hello")
+        [stale_many] = await authorizer.authorize_many(principal, [("read", "tools/hello")])
+        assert stale.stale and stale_many.stale
+        assert breaker.state == OPEN
+        
+        inner.failing = False
+        now[0] = 11
+        recovered = await authorizer.authorize(principal, "read", "tools/hello")
+        
+        assert recovered.stale is False
+        assert recovered.policy_id == "remote"
+        assert (await authorizer.authorize(principal, "read", "tools/hello")) is recovered
+    
+    @pytest.mark.asyncio
+    async def test_call_timeout_counts_as_failure(self):
+        """Test that a hanging dependency is cut off by the call timeout."""
+        
+        class HangingAuthorizer(Authorizer):
+            async def authorize(self, principal, action, resource):
+                await asyncio.sleep(10)
+        
+        breaker = CircuitBreaker(failure_threshold=1)
+        authorizer = CircuitBreakerAuthorizer(HangingAuthorizer(), breaker, call_timeout=0.01)
+        
+        with pytest.raises(AuthorizationUnavailableError):
+            await authorizer.authorize(Principal(), "read", "tools/hello")
+        assert breaker.state == OPEN
+    
+    @pytest.mark.asyncio
+    async def test_middleware_denies_when_unavailable(self):
+        """Test that tool calls fail closed and are audited when no decision is available."""
+        inner = FlakyAuthorizer()
+        inner.failing = True
+        audit_logger = MagicMock()
+        middleware = AuthorizationMiddleware(
+            CircuitBreakerAuthorizer(inner, CircuitBreaker(failure_threshold=1), call_timeout=1), audit_logger
+        )
+        context = SimpleNamespace(message=SimpleNamespace(name="hello", arguments={"user_role": "user"}))
+        call_next = AsyncMock()
+        
+        with pytest.raises(ToolError):
+            await middleware.on_call_tool(context, call_next)
+        
+        call_next.assert_not_called()
+        assert audit_logger.log_authorization_check.call_args.kwargs["result"] == "error"
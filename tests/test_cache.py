@@ -0,0 +1,117 @@
+"""Tests for the bounded TTL and LRU caches."""
+
+import pytest
+
+from template_mcp.cache import MISSING, LRUCache, TTLCache
+
+
+class FakeClock:
+    """Manually advanced clock for expiry tests."""
+    
+    def __init__(self):
+        self.now = 0.0
+    
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestTTLCache:
+    """Test TTLCache behaviour."""
+    
+    def test_get_and_set(self):
+        """Test basic storage and hit/miss counters."""
+        cache = TTLCache(max_size=10)
+        
+        assert cache.get("a") is MISSING
+        cache.set("a", 1, ttl=60)
+        assert cache.get("a") == 1
+        
+        stats = cache.get_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["size"] == 1
+    
+    def test_expiry(self):
+        """Test that entries expire after their TTL."""
+        clock = FakeClock()
+        cache = TTLCache(max_size=10, clock=clock)
+        cache.set("a", 1, ttl=5)
+        
+        clock.now = 4.9
+        assert cache.get("a") == 1
+        clock.now = 5.0
+        assert cache.get("a") is MISSING
+        assert cache.get_stats()["expirations"] == 1
+    
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted when full."""
+        cache = TTLCache(max_size=2)
+        cache.set("a", 1, ttl=60)
+        cache.set("b", 2, ttl=60)
+        cache.get("a")
+        cache.set("c", 3, ttl=60)
+        
+        assert cache.get("b") is MISSING
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+        assert cache.get_stats()["evictions"] == 1
+    
+    def test_zero_ttl_is_not_stored(self):
+        """Test that a zero TTL disables caching for the entry."""
+        cache = TTLCache(max_size=2)
+        cache.set("a", 1, ttl=0)
+        
+        assert len(cache) == 0
+    
+    def test_invalidate(self):
+        """Test full and predicate-based invalidation."""
+        cache = TTLCache(max_size=10)
+        for key in ("a1", "a2", "b1"):
+            cache.set(key, key, ttl=60)
+        
+        assert cache.invalidate(lambda key: key.startswith("a")) == 2
+        assert cache.get("b1") == "b1"
+        assert cache.invalidate() == 1
+        assert len(cache) == 0
+    
+    def test_invalid_size(self):
+        """Test that a non-positive size is rejected."""
+        with pytest.raises(ValueError):
+            TTLCache(max_size=0)
+
+
+class TestLRUCache:
+    """Test LRUCache behaviour."""
+    
+    def test_get_and_set(self):
+        """Test storage and hit/miss counters."""
+        cache = LRUCache(max_size=10)
+        
+        assert cache.get("a") is MISSING
+        assert cache.get("a", None) is None
+        cache.set("a", 1)
+        assert cache.get("a") == 1
+        
+        stats = cache.get_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 2
+        assert stats["hit_ratio"] == pytest.approx(1 / 3)
+    
+    def test_evicts_least_recently_used(self):
+        """Test that reads refresh recency and the oldest entry is evicted."""
+        cache = LRUCache(max_size=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        
+        assert cache.get("b") is MISSING
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+        assert len(cache) == 2
+        assert cache.get_stats()["evictions"] == 1
+    
+    def test_invalid_size(self):
+        """Test that a non-positive size is rejected."""
+        with pytest.raises(ValueError):
+            LRUCache(max_size=0)
@@ -0,0 +1,95 @@
+"""Tests for the circuit breaker."""
+
+from template_mcp.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+
+
+class FakeClock:
+    """Manually advanced clock."""
+    
+    def __init__(self):
+        self.now = 0.0
+    
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestCircuitBreaker:
+    """Test circuit breaker state transitions."""
+    
+    def test_opens_after_consecutive_failures(self):
+        """Test that the circuit opens at the failure threshold."""
+        breaker = CircuitBreaker(failure_threshold=3)
+        
+        for _ in range(2):
+            breaker.record_failure()
+        assert breaker.state == CLOSED
+        breaker.record_failure()
+        
+        assert breaker.state == OPEN
+        assert breaker.allow_request() is False
+        assert breaker.get_stats()["rejected"] == 1
+    
+    def test_success_resets_failures(self):
+        """Test that a fast success resets the consecutive failure count."""
+        breaker = CircuitBreaker(failure_threshold=2)
+        breaker.record_failure()
+        breaker.record_success(0.01)
+        breaker.record_failure()
+        
+        assert breaker.state == CLOSED
+    
+    def test_slow_calls_count_as_failures(self):
+        """Test the latency threshold."""
+        breaker = CircuitBreaker(failure_threshold=2, slow_call_seconds=0.5)
+        breaker.record_success(0.6)
+        breaker.record_success(0.7)
+        
+        assert breaker.state == OPEN
+        assert breaker.get_stats()["slow_calls"] == 2
+    
+    def test_half_open_single_probe(self):
+        """Test that only one probe is allowed after the open period."""
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=1, open_seconds=10, clock=clock)
+        breaker.record_failure()
+        
+        clock.now = 10
+        assert breaker.allow_request() is True
+        assert breaker.state == HALF_OPEN
+        assert breaker.allow_request() is False
+        
+        breaker.record_success(0.01)
+        assert breaker.state == CLOSED
+        assert breaker.allow_request() is True
+    
+    def test_failed_probe_reopens(self):
+        """Test that a failed probe re-opens the circuit for another period."""
+        clock = FakeClock()
+        changes = []
+        breaker = CircuitBreaker(
+            failure_threshold=1,
+            open_seconds=10,
+            clock=clock,
+            on_state_change=lambda previous, state: changes.append((previous, state)),
+        )
+        breaker.record_failure()
+        clock.now = 10
+        breaker.allow_request()
+        breaker.record_failure()
+        
+        assert breaker.state == OPEN
+        clock.now = 15
+        assert breaker.allow_request() is False
+        assert changes == [(CLOSED, OPEN), (OPEN, HALF_OPEN), (HALF_OPEN, OPEN)]
+    
+    def test_cancelled_probe_releases_slot(self):
+        """Test that a cancelled probe lets the next caller probe."""
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=1, open_seconds=1, clock=clock)
+        breaker.record_failure()
+        clock.now = 1
+        assert breaker.allow_request() is True
+        
+        breaker.record_cancelled()
+        
+        assert breaker.allow_request() is True
@@ -0,0 +1,212 @@
+"""Tests for singleflight coalescing of identical tool calls."""
+
+import asyncio
+from contextvars import ContextVar
+from types import SimpleNamespace
+from typing import Optional
+from unittest.mock import MagicMock
+
+import pytest
+
+from template_mcp.authorization import Principal
+from template_mcp.coalescing import CoalescingMiddleware, Singleflight
+from template_mcp.counters import SharedCounters
+
+# Principal of the simulated request each task runs in
+caller: ContextVar[Optional[Principal]] = ContextVar("caller", default=None)
+
+
+def current_principal() -> Principal:
+    """Get the simulated caller, an anonymous principal outside any request."""
+    principal = caller.get()
+    return principal if principal is not None else Principal()
+
+
+class Gate:
+    """Counted execution that finishes when released."""
+    
+    def __init__(self, result="done", error=None):
+        self.result = result
+        self.error = error
+        self.calls = 0
+        self.cancelled = False
+        self.release = asyncio.Event()
+    
+    async def __call__(self):
+        self.calls += 1
+        try:
+            await self.release.wait()
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+def tool_call(tool="hello", **arguments):
+    """Build a middleware context for a tool call."""
+    return SimpleNamespace(message=SimpleNamespace(name=tool, arguments=arguments))
+
+
+class TestSingleflight:
+    """Test shared executions, errors and cancellation."""
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_share_one_execution(self):
+        """Test that identical in-flight calls run once and all get the result."""
+        flights = Singleflight()
+        gate = Gate()
+        waiters = [asyncio.ensure_future(flights.do("key", gate)) for _ in range(5)]
+        await asyncio.sleep(0)
+        gate.release.set()
+        
+        assert await asyncio.gather(*waiters) == ["done"] * 5
+        assert gate.calls == 1
+        assert len(flights) == 0
+        assert flights.get_stats()["coalesced"] == 4
+    
+    @pytest.mark.asyncio
+    async def test_different_keys_run_separately(self):
+        """Test that only calls with the same key are shared."""
+        flights = Singleflight()
+        gate = Gate()
+        gate.release.set()
+        
+        await asyncio.gather(flights.do("a", gate), flights.do("b", gate))
+        
+        assert gate.calls == 2
+    
+    @pytest.mark.asyncio
+    async def test_error_reaches_every_caller_and_is_not_remembered(self):
+        """Test that an exception is raised in every waiter and the next call runs again."""
+        flights = Singleflight()
+        gate = Gate(error=ValueError("boom"))
+        waiters = [asyncio.ensure_future(flights.do("key", gate)) for _ in range(3)]
+        await asyncio.sleep(0)
+        gate.release.set()
+        
+        results = await asyncio.gather(*waiters, return_exceptions=True)
+        assert all(isinstance(result, ValueError) for result in results)
+        
+        gate.error = None
+        assert await flights.do("key", gate) == "done"
+        assert gate.calls == 2
+    
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_others(self):
+        """Test that cancelling the first caller leaves the execution running for the rest."""
+        flights = Singleflight()
+        gate = Gate()
+        leader = asyncio.ensure_future(flights.do("key", gate))
+        follower = asyncio.ensure_future(flights.do("key", gate))
+        await asyncio.sleep(0)
+        
+        leader.cancel()
+        await asyncio.sleep(0)
+        gate.release.set()
+        
+        assert await follower == "done"
+        assert leader.cancelled()
+        assert not gate.cancelled
+    
+    @pytest.mark.asyncio
+    async def test_execution_cancelled_when_every_caller_is(self):
+        """Test that the shared execution stops once nobody awaits it."""
+        flights = Singleflight()
+        gate = Gate()
+        waiters = [asyncio.ensure_future(flights.do("key", gate)) for _ in range(2)]
+        await asyncio.sleep(0)
+        
+        for waiter in waiters:
+            waiter.cancel()
+        await asyncio.gather(*waiters, return_exceptions=True)
+        await asyncio.sleep(0)
+        
+        assert gate.cancelled
+        assert len(flights) == 0
+    
+    @pytest.mark.asyncio
+    async def test_key_released_before_late_callers(self):
+        """Test that a call made after the execution finished starts a new one."""
+        flights = Singleflight()
+        gate = Gate()
+        gate.release.set()
+        
+        await flights.do("key", gate)
+        await flights.do("key", gate)
+        
+        assert gate.calls == 2
+        assert flights.get_stats()["coalesced"] == 0
+
+
+class TestCoalescingMiddleware:
+    """Test call keys of the middleware."""
+    
+    @pytest.mark.asyncio
+    async def test_identical_calls_of_same_principal_are_coalesced(self):
+        """Test that argument order does not matter but the principal does."""
+        middleware = CoalescingMiddleware(principals=current_principal)
+        gate = Gate()
+        call_next = lambda context: gate()  # noqa: E731
+        calls = [
+            (Principal("u1", "user"), tool_call(name="Ana", language="pt")),
+            (Principal("u1", "user"), tool_call(language="pt", name="Ana")),
+            (Principal("u2", "user"), tool_call(name="Ana", language="pt")),
+            (Principal("u1", "admin"), tool_call(name="Ana", language="pt")),
+        ]
+        waiters = []
+        for principal, context in calls:
+            # Tasks copy the current context, like separate requests
+            token = caller.set(principal)
+            waiters.append(asyncio.ensure_future(middleware.on_call_tool(context, call_next)))
+            caller.reset(token)
+        await asyncio.sleep(0)
+        gate.release.set()
+        await asyncio.gather(*waiters)
+        
+        assert gate.calls == 3
+        assert middleware.get_stats()["coalesced"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_only_listed_tools_are_coalesced(self):
+        """Test that tools outside the configured list always run."""
+        middleware = CoalescingMiddleware(["hello"])
+        gate = Gate()
+        gate.release.set()
+        
+        await asyncio.gather(
+            middleware.on_call_tool(tool_call("server_info"), lambda context: gate()),
+            middleware.on_call_tool(tool_call("server_info"), lambda context: gate()),
+        )
+        
+        assert gate.calls == 2
+        assert middleware.get_stats()["tools"] == ["hello"]
+    
+    @pytest.mark.asyncio
+    async def test_joined_calls_are_counted_and_audited(self):
+        """Test that N coalesced callers produce N requests and N audit records."""
+        counters = SharedCounters()
+        audit_logger = MagicMock()
+        middleware = CoalescingMiddleware(principals=current_principal, counters=counters, audit_logger=audit_logger)
+        gate = Gate()
+        
+        async def handler(context):
+            # The handler counts and audits the call that runs it
+            counters.start("hello")
+            result = await gate()
+            counters.finish("hello", 1000)
+            audit_logger.log_tool_execution(tool_name="hello", result="success")
+            return result
+        
+        waiters = [asyncio.ensure_future(middleware.on_call_tool(tool_call(name="Ana"), handler)) for _ in range(5)]
+        await asyncio.sleep(0)
+        gate.release.set()
+        await asyncio.gather(*waiters)
+        
+        assert gate.calls == 1
+        assert counters.snapshot()["hello"]["requests"] == 5
+        assert audit_logger.log_tool_execution.call_count == 5
+        joined = [call.kwargs for call in audit_logger.log_tool_execution.call_args_list if call.kwargs.get("coalesced")]
+        assert len(joined) == 4
+        assert {entry["result"] for entry in joined} == {"success"}
@@ -6,7 +6,15 @@ from pathlib import Path
 
 import pytest
 
-from template_mcp.config import AppConfig, EunomiaConfig, LoggingConfig, McpServerConfig, load_config
+from template_mcp.config import (
+    AppConfig,
+    AuditConfig,
+    EunomiaConfig,
+    LoggingConfig,
+    McpServerConfig,
+    TracingConfig,
+    load_config,
+)
 
 
 class TestLoggingConfig:
@@ -21,6 +29,7 @@ class TestLoggingConfig:
         assert config.file_enabled is True
         assert config.file_path == "logs/mcp_server.log"
         assert config.console_enabled is True
+        assert config.json_encoder == "stdlib"
     
     def test_custom_values(self):
         """Test custom logging configuration values."""
@@ -48,6 +57,11 @@ class TestEunomiaConfig:
         assert config.policies_file == "configs/eunomia_policies.json"
         assert config.timeout == 30
         assert config.enabled is True
+        assert config.mode == "middleware"
+        assert config.cache_enabled is False
+        assert config.cache_allow_ttl > config.cache_deny_ttl
+        assert config.pool_max_connections == 100
+        assert config.http2 is False
     
     def test_custom_values(self):
         """Test custom Eunomia configuration values."""
@@ -76,6 +90,12 @@ class TestMcpServerConfig:
         assert config.port == 3000
         assert config.host == "localhost"
         assert config.debug is False
+        assert config.transport == "stdio"
+        assert config.http_path == "/mcp"
+        assert config.workers == 1
+        assert config.worker_socket_mode == "reuseport"
+        assert config.metrics_enabled is True
+        assert config.metrics_path == "/metrics"
     
     def test_custom_values(self):
         """Test custom MCP server configuration values."""
@@ -94,6 +114,69 @@ class TestMcpServerConfig:
         assert config.debug is True
 
 
+class TestAuditConfig:
+    """Test audit pipeline configuration."""
+    
+    def test_default_values(self):
+        """Test default audit configuration values."""
+        config = AuditConfig()
+        
+        assert config.file_path == "logs/audit.log"
+        assert config.buffer_size == 10000
+        assert config.batch_size == 256
+        assert config.overflow_policy == "drop_oldest"
+        assert config.storage == "jsonl"
+        assert config.segment_dir == "logs/audit"
+        assert config.sample_rate == 1.0
+        assert config.sample_rates == {}
+        assert config.sample_report_interval == 60.0
+    
+    def test_sample_rate_bounds(self):
+        """Test that the audit sample rate must be a fraction."""
+        with pytest.raises(ValueError):
+            AuditConfig(sample_rate=-0.1)
+
+
+class TestChoiceFields:
+    """Test that settings with a fixed set of values are validated."""
+    
+    @pytest.mark.parametrize(
+        "config_class,field,value",
+        [
+            (LoggingConfig, "console_output", "syslog"),
+            (LoggingConfig, "json_encoder", "ujson"),
+            (AuditConfig, "overflow_policy", "drop_newest"),
+            (AuditConfig, "storage", "sqlite"),
+            (EunomiaConfig, "mode", "Local"),
+            (EunomiaConfig, "breaker_fallback", "fail_closed "),
+            (McpServerConfig, "transport", "websocket"),
+            (McpServerConfig, "worker_socket_mode", "fork"),
+        ],
+    )
+    def test_choice_fields_reject_unknown_values(self, config_class, field, value):
+        """Test that a mistyped choice is rejected instead of silently falling back."""
+        with pytest.raises(ValueError):
+            config_class(**{field: value})
+
+
+class TestTracingConfig:
+    """Test tracing configuration."""
+    
+    def test_default_values(self):
+        """Test default tracing configuration values."""
+        config = TracingConfig()
+        
+        assert config.enabled is False
+        assert config.sample_rate == 0.01
+        assert config.export_path == "logs/traces.jsonl"
+        assert config.batch_size == 256
+    
+    def test_sample_rate_bounds(self):
+        """Test that the sample rate must be a fraction."""
+        with pytest.raises(ValueError):
+            TracingConfig(sample_rate=1.5)
+
+
 class TestAppConfig:
     """Test main application configuration."""
     
@@ -105,6 +188,7 @@ class TestAppConfig:
         assert isinstance(config.logging, LoggingConfig)
         assert isinstance(config.eunomia, EunomiaConfig)
         assert isinstance(config.mcp_server, McpServerConfig)
+        assert isinstance(config.tracing, TracingConfig)
     
     def test_environment_properties(self):
         """Test environment property methods."""
@@ -0,0 +1,110 @@
+"""Tests for shared-memory request counters."""
+
+import os
+
+import pytest
+
+from template_mcp.counters import OTHER_TOOL, SharedCounters
+
+
+class TestSharedCounters:
+    """Test SharedCounters bookkeeping."""
+    
+    def test_start_and_finish(self):
+        """Test request, error and in-flight accounting."""
+        counters = SharedCounters()
+        counters.register_tool("hello")
+        
+        counters.start("hello")
+        counters.start("hello")
+        assert counters.snapshot()["hello"]["in_flight"] == 2
+        counters.finish("hello", 1000)
+        counters.finish("hello", 1000, error=True)
+        
+        assert counters.snapshot()["hello"] == {"requests": 2, "errors": 1, "in_flight": 0}
+        assert counters.total("requests") == 2
+    
+    def test_aggregates_worker_slots(self):
+        """Test that reads sum the slots of every worker."""
+        counters = SharedCounters(workers=3)
+        for worker_id in range(3):
+            counters.bind_worker(worker_id)
+            for _ in range(worker_id + 1):
+                counters.start("hello")
+                counters.finish("hello", 1000)
+        
+        assert counters.snapshot()["hello"]["requests"] == 6
+    
+    def test_overflow_slot(self):
+        """Test that tools beyond the slot limit share the overflow slot."""
+        counters = SharedCounters(max_tools=2)
+        for name in ("a", "b", "c"):
+            counters.start(name)
+            counters.finish(name, 1000)
+        
+        snapshot = counters.snapshot()
+        assert snapshot["a"]["requests"] == 1
+        assert snapshot[OTHER_TOOL]["requests"] == 2
+    
+    def test_invalid_worker(self):
+        """Test that out-of-range worker ids are rejected."""
+        with pytest.raises(ValueError):
+            SharedCounters(workers=2).bind_worker(2)
+    
+    @pytest.mark.skipif(not hasattr(os, "fork"), reason="requires fork")
+    def test_visible_across_fork(self):
+        """Test that a forked worker's updates are visible to the parent."""
+        counters = SharedCounters(workers=2)
+        counters.register_tool("hello")
+        
+        pid = os.fork()
+        if pid == 0:
+            counters.bind_worker(1)
+            for _ in range(10):
+                counters.start("hello")
+                counters.finish("hello", 1000)
+            os._exit(0)
+        os.waitpid(pid, 0)
+        
+        assert counters.snapshot()["hello"]["requests"] == 10
+    
+    def test_latency_histograms(self):
+        """Test that durations land in log2 buckets per outcome."""
+        counters = SharedCounters()
+        for duration_ns, error in ((500, False), (1500, False), (3000, True), (10 ** 12, False)):
+            counters.start("hello")
+            counters.finish("hello", duration_ns, error=error)
+        
+        success_counts, success_sum = counters.histograms()["hello"]["success"]
+        error_counts, error_sum = counters.histograms()["hello"]["error"]
+        assert success_counts[0] == 1  # below 1 µs
+        assert success_counts[1] == 1  # below 2 µs
+        assert success_counts[-1] == 1  # overflow bucket
+        assert success_sum == 500 + 1500 + 10 ** 12
+        assert error_counts[2] == 1  # below 4 µs
+        assert error_sum == 3000
+    
+    @pytest.mark.skipif(not hasattr(os, "fork"), reason="requires fork")
+    def test_tools_first_seen_after_seal_share_overflow_slot(self):
+        """Test that a worker meeting a new tool does not shift the slots of other workers."""
+        counters = SharedCounters(workers=2)
+        counters.register_tool("hello")
+        counters.seal()
+        
+        pid = os.fork()
+        if pid == 0:
+            counters.bind_worker(1)
+            counters.start("dynamic")
+            counters.finish("dynamic", 1000)
+            counters.start("hello")
+            counters.finish("hello", 1000)
+            os._exit(0)
+        os.waitpid(pid, 0)
+        counters.register_tool("other_dynamic")
+        counters.start("hello")
+        counters.finish("hello", 1000)
+        
+        snapshot = counters.snapshot()
+        assert snapshot["hello"]["requests"] == 2
+        assert snapshot[OTHER_TOOL]["requests"] == 1
+        assert "dynamic" not in snapshot and "other_dynamic" not in snapshot
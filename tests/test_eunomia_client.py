@@ -0,0 +1,106 @@
+"""Tests for the pooled Eunomia HTTP client."""
+
+import json
+
+import httpx
+import pytest
+
+from template_mcp.authorization import Principal, RemoteAuthorizer
+from template_mcp.config import EunomiaConfig
+from template_mcp.eunomia_client import EunomiaClient
+
+
+def make_transport(requests):
+    """Create a mock Eunomia server allowing the user role."""
+    
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if request.url.path == "/health":
+            return httpx.Response(200, json={"status": "ok"})
+        if request.url.path == "/check/bulk":
+            checks = json.loads(request.read())
+            return httpx.Response(200, json=[{"allowed": c["principal"]["attributes"]["role"] == "user"} for c in checks])
+        body = request.read()
+        allowed = b'"role": "user"' in body or b'"role":"user"' in body
+        return httpx.Response(200, json={"allowed": allowed, "reason": None})
+    
+    return httpx.MockTransport(handler)
+
+
+class TestEunomiaClient:
+    """Test EunomiaClient lifecycle and requests."""
+    
+    @pytest.fixture
+    def config(self):
+        """Create a pool configuration."""
+        return EunomiaConfig(
+            server_url="http://eunomia.test/",
+            pool_max_connections=4,
+            connect_timeout=1,
+            read_timeout=2,
+        )
+    
+    def test_pool_settings(self, config):
+        """Test that limits and timeouts come from configuration."""
+        client = EunomiaClient(config).client
+        
+        assert client.timeout.connect == 1
+        assert client.timeout.read == 2
+        assert client.base_url == "http://eunomia.test"
+    
+    @pytest.mark.asyncio
+    async def test_start_warms_and_close_releases(self, config):
+        """Test warming at startup and closing the pool."""
+        requests = []
+        client = EunomiaClient(config, transport=make_transport(requests))
+        
+        await client.start()
+        assert requests[0].url.path == "/health"
+        assert client.get_stats()["open"] is True
+        
+        await client.close()
+        assert client.get_stats()["open"] is False
+    
+    @pytest.mark.asyncio
+    async def test_start_tolerates_unreachable_server(self, config):
+        """Test that a failed warm-up does not abort startup."""
+        
+        def handler(request):
+            raise httpx.ConnectError("refused", request=request)
+        
+        client = EunomiaClient(config, transport=httpx.MockTransport(handler))
+        
+        await client.start()
+        await client.close()
+    
+    @pytest.mark.asyncio
+    async def test_shared_by_remote_authorizer(self, config):
+        """Test that the remote authorizer reuses the shared client."""
+        requests = []
+        client = EunomiaClient(config, transport=make_transport(requests))
+        authorizer = RemoteAuthorizer(client)
+        
+        allowed = await authorizer.authorize(Principal(user_id="u1", role="user"), "read", "tools/hello")
+        denied = await authorizer.authorize(Principal(role="guest"), "read", "tools/hello")
+        
+        assert allowed.allowed is True
+        assert denied.allowed is False
+        assert client.get_stats()["requests"] == 2
+        assert all(request.url.path == "/check" for request in requests)
+        await client.close()
+    
+    @pytest.mark.asyncio
+    async def test_bulk_check_uses_one_request(self, config):
+        """Test that batched decisions need a single round trip."""
+        requests = []
+        client = EunomiaClient(config, transport=make_transport(requests))
+        authorizer = RemoteAuthorizer(client)
+        
+        decisions = await authorizer.authorize_many(
+            Principal(role="user"), [("list", f"tools/tool_{i}") for i in range(50)]
+        )
+        
+        assert len(decisions) == 50
+        assert all(decision.allowed for decision in decisions)
+        assert [request.url.path for request in requests] == ["/check/bulk"]
+        await client.close()
@@ -0,0 +1,98 @@
+"""Tests for the hello tool greeting catalog."""
+
+import json
+from datetime import datetime
+
+import pytest
+
+from template_mcp.greetings import GreetingCatalog, compile_template
+
+
+class TestCompileTemplate:
+    """Test greeting template compilation."""
+    
+    def test_splits_around_name(self):
+        """Test that the literal text around {name} is kept."""
+        assert compile_template("¡Hola, {name}!") == ("¡Hola, ", "!")
+        assert compile_template("{name}") == ("", "")
+        assert compile_template("{{Hi}} {name}") == ("{Hi} ", "")
+    
+    @pytest.mark.parametrize("template", ["Hello!", "{name} and {name}", "Hi {user}", "Hi {name!r}", "Hi {name:>9}"])
+    def test_rejects_invalid_templates(self, template):
+        """Test that templates need exactly one plain {name} field."""
+        with pytest.raises(ValueError):
+            compile_template(template)
+
+
+class TestGreetingCatalog:
+    """Test language resolution and rendering."""
+    
+    @pytest.fixture
+    def catalog(self):
+        """Small catalog with a regional variant."""
+        return GreetingCatalog({"en": "Hello, {name}!", "pt": "Olá, {name}!", "pt-BR": "Oi, {name}!"})
+    
+    def test_fallback_chain(self, catalog):
+        """Test that regional tags fall back to the language, then the default."""
+        assert catalog.resolve("pt-BR") == "pt-br"
+        assert catalog.resolve("pt-br") == "pt-br"
+        assert catalog.resolve("pt-PT") == "pt"
+        assert catalog.resolve("pt-Latn-AO") == "pt"
+        assert catalog.resolve("xx") == "en"
+        assert catalog.greeting("Ana", "pt-PT") == "Olá, Ana!"
+        assert catalog.greeting("Ana", "pt-BR") == "Oi, Ana!"
+    
+    def test_render_formats(self, catalog):
+        """Test the plain, html and json result formats."""
+        assert catalog.render("Ana", "pt", "plain") == "Olá, Ana!"
+        assert catalog.render("Ana", "pt", "html") == "<h1>Olá, Ana!</h1><p>Welcome, <strong>Ana</strong>!</p>"
+        
+        document = json.loads(catalog.render("Ana", "pt-PT", "json"))
+        assert document["greeting"] == "Olá, Ana!"
+        assert document["name"] == "Ana"
+        assert document["language"] == "pt-PT"
+        assert datetime.fromisoformat(document["timestamp"]).tzinfo is not None
+    
+    def test_result_cache(self):
+        """Test that plain and html results are cached and json results are not."""
+        catalog = GreetingCatalog({"en": "Hello, {name}!"}, cache_size=2)
+        for _ in range(3):
+            catalog.render("Ana", "en", "plain")
+            catalog.render("Ana", "en", "json")
+        
+        stats = catalog.get_stats()["cache"]
+        assert stats["hits"] == 2
+        assert stats["misses"] == 1
+        assert stats["size"] == 1
+    
+    def test_no_cache_by_default(self, catalog):
+        """Test that the result cache is opt-in."""
+        assert catalog.cache is None
+        assert catalog.get_stats()["cache"] is None
+    
+    def test_default_language_required(self):
+        """Test that the default language must be in the catalog."""
+        with pytest.raises(ValueError):
+            GreetingCatalog({"pt": "Olá, {name}!"}, default_language="en")
+    
+    def test_load_packaged_catalog(self):
+        """Test that the packaged catalog keeps the original greetings."""
+        catalog = GreetingCatalog.load()
+        
+        assert len(catalog) > 50
+        assert catalog.greeting("Alice", "en") == "Hello, Alice!"
+        assert catalog.greeting("Alice", "es") == "¡Hola, Alice!"
+        assert catalog.greeting("Alice", "de") == "Hallo, Alice!"
+        assert catalog.greeting("Alice", "it") == "Ciao, Alice!"
+        assert catalog.greeting("Alice", "pt-BR") == "Oi, Alice!"
+        assert catalog.greeting("Alice", "fr-BE") == "Bonjour, Alice!"
+    
+    def test_load_file(self, tmp_path):
+        """Test loading a catalog file with its own default language."""
+        path = tmp_path / "greetings.json"
+        path.write_text(json.dumps({"default_language": "fr", "greetings": {"fr": "Salut {name}"}}))
+        
+        catalog = GreetingCatalog.load(str(path), cache_size=10)
+        
+        assert catalog.greeting("Ana", "en") == "Salut Ana"
+        assert catalog.cache.max_size == 10
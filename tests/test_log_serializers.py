@@ -0,0 +1,108 @@
+"""Tests for the orjson log serializers."""
+
+import gzip
+import io
+import json
+from datetime import datetime, timezone
+
+import pytest
+import structlog
+from loguru import logger
+
+from template_mcp.log_serializers import (
+    OrjsonFileSink,
+    OrjsonStreamSink,
+    orjson_available,
+    orjson_default,
+    orjson_renderer,
+)
+from template_mcp.models import HelloResponse, UserRole
+
+pytestmark = pytest.mark.skipif(not orjson_available(), reason="orjson is not installed")
+
+
+class FakeClock:
+    """Manually advanced clock."""
+    
+    def __init__(self, now=1000.0):
+        self.now = now
+    
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def loguru_sink():
+    """Remove loguru sinks added by a test."""
+    handler_ids = []
+    yield handler_ids
+    for handler_id in handler_ids:
+        logger.remove(handler_id)
+
+
+class TestOrjsonStreamSink:
+    """Test the binary stream sink."""
+    
+    def test_matches_loguru_serialize_layout(self, loguru_sink):
+        """Test that records keep loguru's serialized layout with native enums and datetimes."""
+        stream = io.BytesIO()
+        loguru_sink.append(logger.add(OrjsonStreamSink(stream), format="{message}"))
+        
+        logger.bind(role=UserRole.ADMIN, at=datetime(2024, 1, 1, tzinfo=timezone.utc)).info("hello {}", "world")
+        document = json.loads(stream.getvalue())
+        
+        assert document["text"] == "hello world\n"
+        assert document["record"]["message"] == "hello world"
+        assert document["record"]["level"]["name"] == "INFO"
+        assert document["record"]["extra"] == {"role": "admin", "at": "2024-01-01T00:00:00+00:00"}
+        assert isinstance(document["record"]["time"]["timestamp"], float)
+    
+    def test_exceptions(self, loguru_sink):
+        """Test that exception details are serialized."""
+        stream = io.BytesIO()
+        loguru_sink.append(logger.add(OrjsonStreamSink(stream), format="{message}"))
+        
+        try:
+            raise KeyError("missing")
+        except KeyError:
+            logger.exception("failed")
+        
+        assert json.loads(stream.getvalue())["record"]["exception"]["type"] == "KeyError"
+
+
+class TestOrjsonFileSink:
+    """Test the rotating binary file sink."""
+    
+    def test_rotation_compresses_previous_file(self, tmp_path, loguru_sink):
+        """Test that an old file is rotated and gzipped before the next write."""
+        clock = FakeClock()
+        path = tmp_path / "mcp.log"
+        loguru_sink.append(logger.add(OrjsonFileSink(str(path), clock=clock), format="{message}"))
+        
+        logger.info("first")
+        clock.now += 86400
+        logger.info("second")
+        
+        rotated = list(tmp_path.glob("mcp.*.log.gz"))
+        assert len(rotated) == 1
+        assert json.loads(gzip.decompress(rotated[0].read_bytes()))["record"]["message"] == "first"
+        assert json.loads(path.read_bytes())["record"]["message"] == "second"
+
+
+class TestStructlogRenderer:
+    """Test the orjson structlog renderer."""
+    
+    def test_renders_bytes(self):
+        """Test that events render to bytes with models, enums and datetimes encoded."""
+        renderer = orjson_renderer()
+        response = HelloResponse(greeting="Hi", name="Ana", language="en", timestamp=datetime(2024, 1, 1))
+        
+        rendered = renderer(None, "info", {"event": "x", "role": UserRole.USER, "response": response})
+        
+        assert isinstance(rendered, bytes)
+        assert json.loads(rendered)["role"] == "user"
+        assert json.loads(rendered)["response"]["timestamp"] == "2024-01-01T00:00:00"
+    
+    def test_default_falls_back_to_str(self):
+        """Test that unknown values are encoded as strings."""
+        assert orjson_default(structlog) == str(structlog)
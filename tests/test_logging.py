@@ -0,0 +1,224 @@
+"""Tests for the logging setup and the level-gated logger facade."""
+
+import json
+import logging
+import socket
+import sys
+import threading
+
+import pytest
+import structlog
+from loguru import logger
+
+from template_mcp import logging as mcp_logging
+from template_mcp.config import LoggingConfig
+from template_mcp.logging import (
+    GatedLogger,
+    LoguruHandler,
+    get_logger,
+    is_enabled,
+    level_number,
+    open_console_stream,
+    protocol_stdout,
+    setup_logging,
+    setup_supervisor_logging,
+)
+
+
+@pytest.fixture
+def captured(tmp_path):
+    """Set up logging at WARNING and capture emitted loguru records."""
+    setup_logging(LoggingConfig(level="WARNING", console_enabled=False, file_path=str(tmp_path / "mcp.log")))
+    records = []
+    logger.add(records.append, level="WARNING", format="{message}")
+    yield records
+    logger.remove()
+    logger.add(sys.stderr)
+    logging.basicConfig(force=True)
+    structlog.reset_defaults()
+    mcp_logging._min_level = mcp_logging.LEVELS["DEBUG"]
+
+
+class Exploding:
+    """Argument whose string conversion must never happen."""
+    
+    def __str__(self):
+        raise AssertionError("formatted a disabled message")
+
+
+class TestGatedLogger:
+    """Test the level-gated logger facade."""
+    
+    def test_disabled_levels_do_not_format(self, captured):
+        """Test that disabled levels return before formatting their arguments."""
+        log = get_logger("test")
+        
+        log.debug("value {}", Exploding())
+        log.info("value {}", Exploding())
+        log.log("info", "value {}", Exploding())
+        
+        assert captured == []
+        assert not is_enabled(logging.INFO)
+        assert is_enabled(logging.WARNING)
+    
+    def test_enabled_levels_format_placeholders(self, captured):
+        """Test that placeholders are filled when a record is emitted."""
+        log = get_logger("test")
+        
+        log.warning("worker {} exited with code {}", 3, 1)
+        log.error("literal {braces} without arguments")
+        
+        assert [record.record["message"] for record in captured] == [
+            "worker 3 exited with code 1",
+            "literal {braces} without arguments",
+        ]
+        assert captured[0].record["extra"]["logger_name"] == "test"
+        assert captured[0].record["function"] == "test_enabled_levels_format_placeholders"
+    
+    def test_get_logger(self):
+        """Test that get_logger returns the facade bound to the name."""
+        log = get_logger("template_mcp.server")
+        
+        assert isinstance(log, GatedLogger)
+        assert log.name == "template_mcp.server"
+
+
+class TestSetupLogging:
+    """Test that the configured level applies to every backend."""
+    
+    def test_level_applies_to_stdlib_and_structlog(self, captured):
+        """Test that stdlib and structlog loggers filter below the configured level."""
+        assert logging.getLogger("some.library").isEnabledFor(logging.INFO) is False
+        assert logging.getLogger("some.library").isEnabledFor(logging.WARNING) is True
+        
+        structured = structlog.get_logger("test")
+        assert structured.is_enabled_for(logging.INFO) is False
+    
+    def test_no_sinks_disables_everything(self, tmp_path):
+        """Test that disabling console and file output disables every level."""
+        try:
+            setup_logging(LoggingConfig(console_enabled=False, file_enabled=False))
+            assert not is_enabled(logging.CRITICAL)
+        finally:
+            logger.add(sys.stderr)
+            mcp_logging._min_level = mcp_logging.LEVELS["DEBUG"]
+    
+    def test_orjson_encoder(self, tmp_path):
+        """Test that the orjson encoder switches structlog to byte output and the file sink to binary."""
+        pytest.importorskip("orjson")
+        try:
+            config = LoggingConfig(console_enabled=False, file_path=str(tmp_path / "mcp.log"), json_encoder="orjson")
+            setup_logging(config)
+            get_logger("test").info("encoded by {}", "orjson")
+            logger.remove()  # Closes the file sink after writing the queued record
+            
+            assert isinstance(structlog.get_config()["logger_factory"], structlog.BytesLoggerFactory)
+            assert json.loads((tmp_path / "mcp.log").read_bytes())["record"]["message"] == "encoded by orjson"
+        finally:
+            logger.add(sys.stderr)
+            structlog.reset_defaults()
+            mcp_logging._min_level = mcp_logging.LEVELS["DEBUG"]
+    
+    def test_supervisor_logging_starts_no_threads(self):
+        """Test that the forking supervisor logs synchronously, leaving no thread for workers to inherit."""
+        threads = threading.active_count()
+        try:
+            setup_supervisor_logging(LoggingConfig(level="WARNING"))
+            get_logger("test").warning("before forking")
+            
+            assert threading.active_count() == threads
+            assert is_enabled(logging.WARNING) and not is_enabled(logging.INFO)
+        finally:
+            logger.remove()
+            logger.add(sys.stderr)
+            structlog.reset_defaults()
+            mcp_logging._min_level = mcp_logging.LEVELS["DEBUG"]
+    
+    def test_unknown_encoder(self):
+        """Test that unsupported JSON encoders are rejected."""
+        with pytest.raises(ValueError):
+            mcp_logging.resolve_json_encoder("simdjson")
+    
+    def test_level_number(self):
+        """Test level name lookup."""
+        assert level_number("warning") == logging.WARNING
+        with pytest.raises(ValueError):
+            level_number("loud")
+    
+    def test_handler_without_caller_info(self, captured):
+        """Test that stdlib records are forwarded without walking stack frames."""
+        logging.getLogger().handlers[0].caller_info = False
+        
+        logging.getLogger("some.library").warning("disk %s full", "/tmp")
+        
+        assert isinstance(logging.getLogger().handlers[0], LoguruHandler)
+        assert captured[-1].record["message"] == "disk /tmp full"
+
+
+class TestConsoleRouting:
+    """Test transport-aware routing of console logs."""
+    
+    def test_auto_keeps_stdout_free_for_stdio(self):
+        """Test that console logs go to stderr with the stdio transport and stdout otherwise."""
+        assert open_console_stream(LoggingConfig(), "stdio") is sys.stderr
+        assert open_console_stream(LoggingConfig(), "http") is sys.stdout
+    
+    def test_stdout_is_refused_with_stdio(self):
+        """Test that logs can never be sent down the protocol pipe."""
+        with pytest.raises(ValueError):
+            open_console_stream(LoggingConfig(console_output="stdout"), "stdio")
+        with pytest.raises(ValueError):
+            open_console_stream(LoggingConfig(console_output="syslog"), "http")
+    
+    def test_file_output(self, tmp_path):
+        """Test that console logs can be appended to a file."""
+        config = LoggingConfig(console_output="file", console_path=str(tmp_path / "c.log"))
+        stream = open_console_stream(config, "stdio")
+        stream.write("line\n")
+        stream.close()
+        
+        assert (tmp_path / "c.log").read_text() == "line\n"
+    
+    def test_socket_output(self, tmp_path):
+        """Test that console logs can be streamed to a Unix socket."""
+        path = str(tmp_path / "logs.sock")
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(path)
+        server.listen(1)
+        try:
+            stream = open_console_stream(LoggingConfig(console_output="socket", console_path=path), "stdio")
+            connection, _ = server.accept()
+            stream.write("over the socket\n")
+            stream.close()
+            
+            assert connection.recv(100) == b"over the socket\n"
+            connection.close()
+        finally:
+            server.close()
+    
+    def test_stdio_setup_routes_structlog_to_stderr(self, tmp_path):
+        """Test that structlog writes to the routed stream instead of stdout."""
+        try:
+            setup_logging(LoggingConfig(file_enabled=False), "stdio")
+            assert structlog.get_config()["logger_factory"]._file is sys.stderr
+        finally:
+            logger.remove()
+            logger.add(sys.stderr)
+            structlog.reset_defaults()
+            mcp_logging._min_level = mcp_logging.LEVELS["DEBUG"]
+    
+    def test_protocol_stdout(self, tmp_path, monkeypatch):
+        """Test that the protocol writer buffers on its own descriptor and restores stdout."""
+        target = (tmp_path / "stdout").open("w")
+        monkeypatch.setattr(sys, "stdout", target)
+        
+        with protocol_stdout(buffer_size=4096) as stream:
+            assert sys.stdout is stream
+            assert stream.buffer.fileno() != target.fileno()
+            sys.stdout.write('{"jsonrpc":"2.0"}\n')
+            assert (tmp_path / "stdout").read_text() == ""
+            sys.stdout.flush()
+            assert (tmp_path / "stdout").read_text() == '{"jsonrpc":"2.0"}\n'
+        
+        assert sys.stdout is target
+        target.close()
@@ -0,0 +1,76 @@
+"""Tests for latency summaries and Prometheus exposition."""
+
+from template_mcp.counters import SharedCounters
+from template_mcp.metrics import collect_metrics, estimate_quantile, render_prometheus
+
+
+def record(counters: SharedCounters, tool: str, duration_ns: int, error: bool = False) -> None:
+    """Record one completed tool call."""
+    counters.start(tool)
+    counters.finish(tool, duration_ns, error=error)
+
+
+class TestQuantiles:
+    """Test quantile estimation from histogram buckets."""
+    
+    def test_empty_histogram(self):
+        """Test that an empty histogram reports zero."""
+        assert estimate_quantile([0] * 27, 0.99) == 0.0
+    
+    def test_quantile_within_bucket(self):
+        """Test that quantiles fall inside the bucket holding the rank."""
+        counters = SharedCounters()
+        for _ in range(99):
+            record(counters, "hello", 1500)  # 1-2 µs bucket
+        record(counters, "hello", 5_000_000)  # ~5 ms
+        
+        counts, _ = counters.histograms()["hello"]["success"]
+        assert 1024 <= estimate_quantile(counts, 0.5) <= 2048
+        assert estimate_quantile(counts, 1.0) > 4_000_000
+
+
+class TestCollectMetrics:
+    """Test the server_info metrics section."""
+    
+    def test_rates_and_latency(self):
+        """Test request rate, error rate and per-outcome summaries."""
+        counters = SharedCounters()
+        for i in range(10):
+            record(counters, "hello", 2_000_000, error=i < 2)
+        
+        metrics = collect_metrics(counters, uptime_seconds=5.0)
+        hello = metrics["tools"]["hello"]
+        assert hello["request_rate"] == 2.0
+        assert hello["error_rate"] == 0.2
+        assert hello["latency"]["success"]["count"] == 8
+        assert hello["latency"]["error"]["count"] == 2
+        assert hello["latency"]["success"]["mean_ms"] == 2.0
+
+
+class TestRenderPrometheus:
+    """Test the Prometheus text exposition."""
+    
+    def test_counters_and_histogram(self):
+        """Test counter lines and cumulative histogram buckets."""
+        counters = SharedCounters()
+        record(counters, "hello", 500)
+        record(counters, "hello", 3000, error=True)
+        counters.start("hello")
+        
+        body = render_prometheus(counters, 10.0)
+        
+        assert 'template_mcp_tool_requests_total{tool="hello"} 3' in body
+        assert 'template_mcp_tool_errors_total{tool="hello"} 1' in body
+        assert 'template_mcp_tool_in_flight{tool="hello"} 1' in body
+        assert '# TYPE template_mcp_tool_duration_seconds histogram' in body
+        assert 'template_mcp_tool_duration_seconds_bucket{tool="hello",outcome="success",le="1.024e-06"} 1' in body
+        assert 'template_mcp_tool_duration_seconds_bucket{tool="hello",outcome="error",le="+Inf"} 1' in body
+        assert 'template_mcp_tool_duration_seconds_count{tool="hello",outcome="success"} 1' in body
+        assert body.endswith("\n")
+    
+    def test_label_escaping(self):
+        """Test that tool names are escaped in label values."""
+        counters = SharedCounters()
+        record(counters, 'say"hi', 500)
+        
+        assert 'tool="say\\"hi"' in render_prometheus(counters, 1.0)
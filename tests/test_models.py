@@ -47,6 +47,7 @@ class TestHelloRequest:
         HelloRequest(name="John")
         HelloRequest(name="  Mary  ")  # Whitespace should be stripped
         HelloRequest(name="José-Carlos")
+        assert HelloRequest(name="  Иван ").name == "Иван"  # Letters of any script
         
         # Invalid names
         with pytest.raises(ValidationError):
@@ -54,6 +55,9 @@ class TestHelloRequest:
         
         with pytest.raises(ValidationError):
             HelloRequest(name="123")  # No letters
+        
+        with pytest.raises(ValidationError):
+            HelloRequest(name="   ")  # Only whitespace
     
     def test_language_validation(self):
         """Test language code validation."""
@@ -61,6 +65,8 @@ class TestHelloRequest:
         HelloRequest(name="John", language="en")
         HelloRequest(name="John", language="pt")
         HelloRequest(name="John", language="fr")
+        HelloRequest(name="John", language="pt-BR")  # Regional tag
+        HelloRequest(name="John", language="haw")
         
         # Invalid language codes
         with pytest.raises(ValidationError):
@@ -71,6 +77,9 @@ class TestHelloRequest:
         
         with pytest.raises(ValidationError):
             HelloRequest(name="John", language="EN")  # Uppercase not allowed
+        
+        with pytest.raises(ValidationError):
+            HelloRequest(name="John", language="pt_BR")  # Subtags are separated by hyphens
     
     def test_format_validation(self):
         """Test format validation."""
@@ -151,6 +160,9 @@ class TestToolRequest:
         
         with pytest.raises(ValidationError):
             ToolRequest(tool_name="tool@name")  # Special characters
+        
+        with pytest.raises(ValidationError):
+            ToolRequest(tool_name="__")  # No letters or digits
 
 
 class TestToolResponse:
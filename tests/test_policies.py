@@ -0,0 +1,156 @@
+"""Tests for the embedded policy engine."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from template_mcp.models import PolicyDocument, PolicyEffect, PolicyRule
+from template_mcp.policies import PolicyEngine, PolicyStore, load_policy_engine
+
+POLICIES_FILE = Path(__file__).parent.parent / "configs" / "eunomia_policies.json"
+
+
+class TestShippedPolicies:
+    """Test decisions against the shipped policies file."""
+    
+    @pytest.fixture
+    def engine(self):
+        """Compile the shipped policies."""
+        return load_policy_engine(POLICIES_FILE)
+    
+    @pytest.mark.parametrize(
+        "subject,action,resource,allowed",
+        [
+            ("admin", "read", "tools/hello", True),
+            ("admin", "delete", "anything/else", True),
+            ("user", "read", "tools/hello", True),
+            ("user", "list", "resources/docs", True),
+            ("user", "write", "tools/hello", False),
+            ("user", "read", "admin/panel", False),
+            ("guest", "list", "tools/hello", True),
+            ("guest", "list", "tools/server_info", False),
+            ("guest", "read", "tools/hello", True),
+            ("guest", "read", "tools/server_info", False),
+            ("admin", "read", "tools/audit_query", True),
+            ("user", "read", "tools/audit_query", False),
+            ("unknown", "list", "tools/hello", False),
+        ],
+    )
+    def test_decisions(self, engine, subject, action, resource, allowed):
+        """Test allow/deny results for the shipped policies."""
+        decision = engine.evaluate(subject, action, resource)
+        
+        assert decision.allowed is allowed
+    
+    def test_decision_reports_policy(self, engine):
+        """Test that decisions carry the matching policy id."""
+        assert engine.evaluate("guest", "list", "tools/hello").policy_id == "guest_policy"
+        assert engine.evaluate("guest", "list", "tools/other").policy_id is None
+        assert engine.version == "1.0"
+        assert engine.policy_count == 4
+
+
+class TestPolicyEngine:
+    """Test policy engine semantics."""
+    
+    def test_deny_overrides_allow(self):
+        """Test that a matching deny policy wins over an allow."""
+        engine = PolicyEngine(
+            PolicyDocument(
+                policies=[
+                    PolicyRule(id="allow_all", subjects=["user"], actions=["*"], resources=["*"]),
+                    PolicyRule(
+                        id="deny_admin",
+                        subjects=["*"],
+                        actions=["read"],
+                        resources=["tools/admin_*"],
+                        effect=PolicyEffect.DENY,
+                    ),
+                ]
+            )
+        )
+        
+        assert engine.evaluate("user", "read", "tools/hello").allowed is True
+        decision = engine.evaluate("user", "read", "tools/admin_reset")
+        assert decision.allowed is False
+        assert decision.policy_id == "deny_admin"
+        assert engine.evaluate("user", "list", "tools/admin_reset").allowed is True
+    
+    def test_wildcard_subject(self):
+        """Test that wildcard subjects apply to unknown subjects."""
+        engine = PolicyEngine(
+            PolicyDocument(
+                policies=[PolicyRule(id="public", subjects=["*"], actions=["list"], resources=["tools/*"])]
+            )
+        )
+        
+        assert engine.evaluate("anyone", "list", "tools/hello").allowed is True
+        assert engine.evaluate("anyone", "read", "tools/hello").allowed is False
+    
+    def test_empty_document_denies(self):
+        """Test that an empty policy set denies everything."""
+        engine = PolicyEngine(PolicyDocument())
+        
+        assert engine.evaluate("admin", "read", "tools/hello").allowed is False
+
+
+class TestPolicyStore:
+    """Test policy hot-reload with atomic snapshot swap."""
+    
+    @pytest.fixture
+    def policies_file(self, tmp_path):
+        """Copy the shipped policies to a writable location."""
+        path = tmp_path / "policies.json"
+        path.write_text(POLICIES_FILE.read_text())
+        return path
+    
+    def test_decisions_are_tagged_with_version(self, policies_file):
+        """Test that every decision carries the policy version it used."""
+        store = PolicyStore(policies_file)
+        
+        allowed = store.engine.evaluate("admin", "read", "tools/hello")
+        denied = store.engine.evaluate("guest", "read", "tools/server_info")
+        
+        assert allowed.policy_version == store.engine.policy_version
+        assert denied.policy_version == store.engine.policy_version
+        assert store.engine.policy_version.startswith("1.0@")
+    
+    @pytest.mark.asyncio
+    async def test_reload_swaps_engine(self, policies_file):
+        """Test that a changed file is compiled and swapped in."""
+        store = PolicyStore(policies_file)
+        old_engine = store.engine
+        swapped = []
+        store.subscribe(swapped.append)
+        
+        document = json.loads(policies_file.read_text())
+        document["policies"][2]["resources"].append("tools/server_info")
+        policies_file.write_text(json.dumps(document))
+        
+        assert await store.reload() is True
+        assert store.engine is not old_engine
+        assert swapped == [store.engine]
+        assert store.engine.evaluate("guest", "list", "tools/server_info").allowed is True
+        # Snapshots taken before the swap keep answering with the old policy set
+        assert old_engine.evaluate("guest", "list", "tools/server_info").allowed is False
+    
+    @pytest.mark.asyncio
+    async def test_unchanged_file_is_not_swapped(self, policies_file):
+        """Test that reloading identical contents keeps the current engine."""
+        store = PolicyStore(policies_file)
+        engine = store.engine
+        
+        assert await store.reload() is False
+        assert store.engine is engine
+    
+    @pytest.mark.asyncio
+    async def test_invalid_file_keeps_current_policies(self, policies_file):
+        """Test that a broken policy file does not replace the active set."""
+        store = PolicyStore(policies_file)
+        engine = store.engine
+        policies_file.write_text("{not json")
+        
+        assert await store.reload() is False
+        assert store.engine is engine
+        assert store.get_stats()["reload_errors"] == 1
@@ -0,0 +1,63 @@
+"""Tests for the trie-based resource matcher."""
+
+from fnmatch import fnmatchcase
+
+import pytest
+
+from template_mcp.resource_matcher import ResourceMatcher
+
+
+class TestResourceMatcher:
+    """Test ResourceMatcher pattern semantics."""
+    
+    @pytest.mark.parametrize(
+        "pattern,resource,matches",
+        [
+            ("tools/hello", "tools/hello", True),
+            ("tools/hello", "tools/hello2", False),
+            ("tools/*", "tools/hello", True),
+            ("tools/*", "tools/a/b", True),
+            ("tools/*", "tools/", True),
+            ("tools/*", "tools", False),
+            ("*", "anything/at/all", True),
+            ("*", "", True),
+            ("tenants/*/tools", "tenants/acme/tools", True),
+            ("tenants/*/tools", "tenants/acme/x/tools", False),
+            ("tools/admin_*", "tools/admin_reset", True),
+            ("tools/admin_*", "tools/user_reset", False),
+            ("tools/tool_?", "tools/tool_1", True),
+        ],
+    )
+    def test_pattern_semantics(self, pattern, resource, matches):
+        """Test matching of literal and wildcard patterns."""
+        matcher = ResourceMatcher()
+        matcher.insert(pattern, "hit")
+        
+        assert (matcher.match(resource) == "hit") is matches
+    
+    @pytest.mark.parametrize("resource", ["tools/hello", "tools/a/b", "resources/x", "admin", "tools"])
+    def test_agrees_with_fnmatch_for_shipped_patterns(self, resource):
+        """Test parity with glob matching for the patterns used by the shipped policies."""
+        for pattern in ("*", "tools/*", "resources/*", "tools/hello"):
+            matcher = ResourceMatcher()
+            matcher.insert(pattern, True)
+            
+            assert bool(matcher.match(resource)) is fnmatchcase(resource, pattern)
+    
+    def test_lowest_priority_wins(self):
+        """Test that the best-ranked matching pattern is returned."""
+        matcher = ResourceMatcher()
+        matcher.insert("*", "allow_all", priority=(1, 0))
+        matcher.insert("tools/admin_*", "deny_admin", priority=(0, 1))
+        matcher.insert("tools/*", "allow_tools", priority=(1, 2))
+        
+        assert matcher.match("tools/admin_reset") == "deny_admin"
+        assert matcher.match("tools/hello") == "allow_all"
+        assert len(matcher) == 3
+    
+    def test_no_match(self):
+        """Test that unmatched resources return None."""
+        matcher = ResourceMatcher()
+        matcher.insert("tools/hello", True)
+        
+        assert matcher.match("resources/hello") is None
@@ -0,0 +1,86 @@
+"""Tests for declarative tool result caching."""
+
+from template_mcp.cache import MISSING
+from template_mcp.result_cache import CachePolicy, ResultCache, canonical_arguments, result_key
+
+
+class TestResultKey:
+    """Test cache key construction."""
+    
+    def test_argument_order_does_not_matter(self):
+        """Test that equal arguments in any order give the same key."""
+        first = canonical_arguments({"b": 1, "a": {"y": 2, "x": 1}})
+        assert first == canonical_arguments({"a": {"x": 1, "y": 2}, "b": 1})
+        assert result_key({"name": "Ana", "language": "pt"}, "user") == result_key(
+            {"language": "pt", "name": "Ana"}, "user"
+        )
+    
+    def test_role_is_part_of_key(self):
+        """Test that callers with different roles never share a key."""
+        assert result_key({"name": "Ana"}, "user") != result_key({"name": "Ana"}, "admin")
+    
+    def test_missing_arguments(self):
+        """Test that absent and empty arguments give the same key."""
+        assert result_key(None, "guest") == result_key({}, "guest")
+
+
+class TestResultCache:
+    """Test per-tool caches and statistics."""
+    
+    def test_only_declared_tools_are_cacheable(self):
+        """Test that tools must opt in."""
+        cache = ResultCache()
+        assert cache.declare("hello", CachePolicy(ttl=60))
+        
+        assert cache.is_cacheable("hello")
+        assert not cache.is_cacheable("server_info")
+    
+    def test_get_and_set_per_tool(self):
+        """Test that results are stored per tool and reported with hit ratios."""
+        cache = ResultCache()
+        cache.declare("hello", CachePolicy(ttl=60, max_size=2))
+        cache.declare("lookup", CachePolicy(ttl=30))
+        key = result_key({"name": "Ana"}, "user")
+        
+        assert cache.get("hello", key) is MISSING
+        cache.set("hello", key, {"content": []})
+        assert cache.get("hello", key) == {"content": []}
+        assert cache.get("lookup", key) is MISSING
+        
+        stats = cache.get_stats()
+        assert stats["hello"]["ttl"] == 60
+        assert stats["hello"]["max_size"] == 2
+        assert stats["hello"]["hit_ratio"] == 0.5
+        assert stats["lookup"]["misses"] == 1
+    
+    def test_uncached_arguments(self):
+        """Test that calls with impure argument values are excluded and overrides keep the exclusions."""
+        policy = CachePolicy(ttl=60, uncached=(("format", "json"),))
+        cache = ResultCache({"hello": 5})
+        cache.declare("hello", policy)
+        
+        assert policy.applies({"name": "Ana", "format": "plain"})
+        assert policy.applies(None)
+        assert not policy.applies({"name": "Ana", "format": "json"})
+        assert cache.policies["hello"].uncached == (("format", "json"),)
+    
+    def test_ttl_overrides(self):
+        """Test that configured TTLs replace declared ones and 0 disables a tool."""
+        cache = ResultCache({"hello": 5, "lookup": 0})
+        
+        assert cache.declare("hello", CachePolicy(ttl=60))
+        assert not cache.declare("lookup", CachePolicy(ttl=60))
+        assert cache.policies["hello"].ttl == 5
+        assert not cache.is_cacheable("lookup")
+    
+    def test_invalidate(self):
+        """Test dropping the results of one tool or of all tools."""
+        cache = ResultCache()
+        for tool in ("hello", "lookup"):
+            cache.declare(tool, CachePolicy(ttl=60))
+            cache.set(tool, ("user", "{}"), "result")
+        
+        assert cache.invalidate("hello") == 1
+        assert cache.get("lookup", ("user", "{}")) == "result"
+        assert cache.invalidate() == 1
+        assert cache.invalidate("unknown") == 0
@@ -0,0 +1,63 @@
+"""Tests for rotated, compressed and purged append-only files."""
+
+import gzip
+from pathlib import Path
+
+from template_mcp.rotation import RotatingFile
+
+
+class FakeClock:
+    """Manually advanced wall clock."""
+    
+    def __init__(self):
+        self.now = 1_700_000_000.0
+    
+    def __call__(self):
+        return self.now
+
+
+class TestRotatingFile:
+    """Test rotation triggers and compression."""
+    
+    def test_age_rotation_compresses_inline(self, tmp_path):
+        """Test that an old file is gzipped before the next write returns."""
+        clock = FakeClock()
+        output = RotatingFile(str(tmp_path / "app.log"), max_age=60, clock=clock)
+        output.write(b"old\n")
+        clock.now += 60
+        output.write(b"new\n")
+        output.flush()
+        
+        [rotated] = tmp_path.glob("app.*.log.gz")
+        assert gzip.decompress(rotated.read_bytes()) == b"old\n"
+        assert (tmp_path / "app.log").read_bytes() == b"new\n"
+        output.close()
+    
+    def test_empty_file_is_not_rotated(self, tmp_path):
+        """Test that limits are only checked once the file holds data."""
+        clock = FakeClock()
+        output = RotatingFile(str(tmp_path / "app.log"), max_age=60, max_bytes=1, clock=clock)
+        clock.now += 3600
+        output.write(b"first write\n")
+        output.close()
+        
+        assert list(tmp_path.glob("app.*.log*")) == []
+    
+    def test_purge_skips_files_removed_meanwhile(self, tmp_path, monkeypatch):
+        """Test that a rotated file deleted by a compressor during the purge is ignored."""
+        clock = FakeClock()
+        output = RotatingFile(str(tmp_path / "app.log"), retention=60, clock=clock)
+        vanishing = tmp_path / "app.2023-11-14_22-13-20-000001.log"
+        vanishing.write_bytes(b"compressed elsewhere\n")
+        stat = Path.stat
+        
+        def racing_stat(path, *args, **kwargs):
+            if path == vanishing:
+                path.unlink()
+            return stat(path, *args, **kwargs)
+        
+        monkeypatch.setattr(Path, "stat", racing_stat)
+        output.rotate()
+        output.close()
+        
+        assert not vanishing.exists()
@@ -1,11 +1,17 @@
 """Tests for server initialization and basic functionality."""
 
+import json
+from contextlib import contextmanager
+
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 
+from template_mcp.audit_segments import SegmentedAuditSink
+from template_mcp.authorization import AuthorizationMiddleware, LocalAuthorizer, Principal
 from template_mcp.config import AppConfig
 from template_mcp.models import UserRole
-from template_mcp.server import TemplateMcpServer
+from template_mcp.result_cache import CachePolicy
+from template_mcp.server import HELLO_CACHE_POLICY, TemplateMcpServer
 
 
 class TestTemplateMcpServer:
@@ -40,6 +46,7 @@ class TestTemplateMcpServer:
         mock_fastmcp.assert_called_once_with(
             name="test-mcp",
             version="0.1.0",
+            auth=None,
         )
         
         # Verify middleware was added
@@ -51,6 +58,21 @@ class TestTemplateMcpServer:
         assert server.app == mock_app
         assert server.request_count == 0
     
+    @patch('template_mcp.server.FastMCP')
+    @patch('template_mcp.server.EunomiaMcpMiddleware')
+    def test_local_authorization_mode(self, mock_middleware, mock_fastmcp, mock_config):
+        """Test that local mode installs the embedded policy engine instead of the Eunomia client."""
+        mock_app = MagicMock()
+        mock_fastmcp.return_value = mock_app
+        mock_config.eunomia.mode = "local"
+        
+        server = TemplateMcpServer(mock_config)
+        
+        mock_middleware.assert_not_called()
+        middleware = mock_app.add_middleware.call_args[0][0]
+        assert isinstance(middleware, AuthorizationMiddleware)
+        assert isinstance(server.authorizer, LocalAuthorizer)
+    
     @patch('template_mcp.server.FastMCP')
     @patch('template_mcp.server.EunomiaMcpMiddleware')
     def test_tools_registration(self, mock_middleware, mock_fastmcp, mock_config):
@@ -61,8 +83,8 @@ class TestTemplateMcpServer:
         # Create server
         server = TemplateMcpServer(mock_config)
         
-        # Verify tools were added (hello and server_info)
-        assert mock_app.add_tool.call_count == 2
+        # Verify tools were added (hello, server_info and audit_query)
+        assert mock_app.add_tool.call_count == 3
         
         # Get the tool calls
         tool_calls = mock_app.add_tool.call_args_list
@@ -70,6 +92,7 @@ class TestTemplateMcpServer:
         
         assert "hello" in tool_names
         assert "server_info" in tool_names
+        assert "audit_query" in tool_names
     
     @patch('template_mcp.server.FastMCP')
     @patch('template_mcp.server.EunomiaMcpMiddleware')
@@ -215,6 +238,189 @@ class TestTemplateMcpServer:
         assert "0.1.0" in response_text
         assert "running" in response_text
         assert "uptime_seconds" in response_text
+        assert '"metrics"' in response_text
+    
+    @patch('template_mcp.server.FastMCP')
+    @patch('template_mcp.server.EunomiaMcpMiddleware')
+    @pytest.mark.asyncio
+    async def test_cached_tool_skips_handler(self, mock_middleware, mock_fastmcp, mock_config):
+        """Test that declared cacheable tools are answered from the result cache per role."""
+        mock_fastmcp.return_value = MagicMock()
+        server = TemplateMcpServer(mock_config)
+        server.counters.register_tool("lookup")
+        handler = AsyncMock(return_value={"content": [{"type": "text", "text": "ok"}]})
+        cached = server._cached("lookup", CachePolicy(ttl=60))(handler)
+        
+        server.principals = lambda: Principal(role=UserRole.USER.value)
+        for params in ({"a": 1, "b": 2}, {"b": 2, "a": 1}):
+            result = await cached({"params": params})
+            assert result["content"][0]["text"] == "ok"
+        server.principals = lambda: Principal(role=UserRole.ADMIN.value)
+        await cached({"params": {"a": 1, "b": 2}})
+        
+        assert handler.await_count == 2
+        assert server.result_cache.get_stats()["lookup"]["hits"] == 1
+        assert server.counters.snapshot()["lookup"]["requests"] == 1
+    
+    @patch('template_mcp.server.FastMCP')
+    @patch('template_mcp.server.EunomiaMcpMiddleware')
+    @pytest.mark.asyncio
+    async def test_hello_json_results_are_not_cached(self, mock_middleware, mock_fastmcp, mock_config):
+        """Test that json hello results, which carry a timestamp, are rendered on every call."""
+        mock_fastmcp.return_value = MagicMock()
+        server = TemplateMcpServer(mock_config)
+        handler = AsyncMock(return_value={"content": [{"type": "text", "text": "ok"}]})
+        cached = server._cached("hello", HELLO_CACHE_POLICY)(handler)
+        
+        for _ in range(2):
+            await cached({"params": {"name": "Ana", "format": "json"}})
+            await cached({"params": {"name": "Ana", "format": "plain"}})
+        
+        assert handler.await_count == 3
+        assert server.result_cache.get_stats()["hello"]["hits"] == 1
+    
+    @patch('template_mcp.server.FastMCP')
+    @patch('template_mcp.server.EunomiaMcpMiddleware')
+    @pytest.mark.asyncio
+    async def test_cached_tool_does_not_store_errors(self, mock_middleware, mock_fastmcp, mock_config):
+        """Test that error results are not cached."""
+        mock_fastmcp.return_value = MagicMock()
+        server = TemplateMcpServer(mock_config)
+        handler = AsyncMock(return_value={"content": [], "isError": True})
+        cached = server._cached("lookup", CachePolicy(ttl=60))(handler)
+        
+        await cached({"params": {}})
+        await cached({"params": {}})
+        
+        assert handler.await_count == 2
+    
+    @patch('template_mcp.server.FastMCP')
+    @patch('template_mcp.server.EunomiaMcpMiddleware')
+    @pytest.mark.asyncio
+    async def test_audit_query_requires_admin(self, mock_middleware, mock_fastmcp, mock_config):
+        """Test that non-admin callers are refused by the audit query tool."""
+        mock_fastmcp.return_value = MagicMock()
+        server = TemplateMcpServer(mock_config)
+        server.principals = lambda: Principal(user_id="u1", role=UserRole.USER.value)
+        
+        result = await server._handle_audit_query_tool({"params": {}})
+        
+        assert result["isError"] is True
+        assert "administrators" in result["content"][0]["text"]
+        assert server.counters.snapshot()["audit_query"]["errors"] == 1
+    
+    @patch('template_mcp.server.FastMCP')
+    @patch('template_mcp.server.EunomiaMcpMiddleware')
+    @pytest.mark.asyncio
+    async def test_audit_query_ignores_spoofed_role(self, mock_middleware, mock_fastmcp, mock_config):
+        """Test that claiming admin in the tool arguments does not open the audit trail."""
+        mock_fastmcp.return_value = MagicMock()
+        server = TemplateMcpServer(mock_config)
+        
+        request = {"params": {}, "user_id": "mallory", "user_role": UserRole.ADMIN}
+        result = await server._handle_audit_query_tool(request)
+        
+        assert result["isError"] is True
+        assert "administrators" in result["content"][0]["text"]
+    
+    @patch('template_mcp.server.FastMCP')
+    @patch('template_mcp.server.EunomiaMcpMiddleware')
+    @pytest.mark.asyncio
+    async def test_audit_query_tool(self, mock_middleware, mock_fastmcp, mock_config, tmp_path):
+        """Test that admins can page through audit segments."""
+        mock_fastmcp.return_value = MagicMock()
+        mock_config.audit.storage = "segments"
+        mock_config.audit.segment_dir = str(tmp_path)
+        sink = SegmentedAuditSink(str(tmp_path))
+        sink.write([
+            {"event": "Tool execution", "event_type": "tool_execution", "timestamp": 1700000000.0 + i,
+             "tool_name": "hello", "user_id": f"u{i % 2}", "user_role": "user", "result": "success"}
+            for i in range(5)
+        ])
+        sink.close()
+        server = TemplateMcpServer(mock_config)
+        server.principals = lambda: Principal(user_id="root", role=UserRole.ADMIN.value)
+        
+        request = {"params": {"user_id": "u0", "limit": 2}}
+        first = json.loads((await server._handle_audit_query_tool(request))["content"][0]["text"])
+        request["params"]["cursor"] = first["next_cursor"]
+        second = json.loads((await server._handle_audit_query_tool(request))["content"][0]["text"])
+        
+        assert first["count"] == 2 and second["count"] == 1
+        assert second["next_cursor"] is None
+        assert first["events"][0]["timestamp"] == "2023-11-14T22:13:20+00:00"
+        assert {event["user_id"] for event in first["events"] + second["events"]} == {"u0"}
+    
+    @patch('template_mcp.server.FastMCP')
+    @patch('template_mcp.server.EunomiaMcpMiddleware')
+    def test_metrics_route_registration(self, mock_middleware, mock_fastmcp, mock_config):
+        """Test that the Prometheus endpoint is registered on the configured path."""
+        mock_app = MagicMock()
+        mock_fastmcp.return_value = mock_app
+        
+        TemplateMcpServer(mock_config)
+        
+        mock_app.custom_route.assert_called_once_with("/metrics", methods=["GET"], include_in_schema=False)
+    
+    @patch('template_mcp.server.FastMCP')
+    @patch('template_mcp.server.EunomiaMcpMiddleware')
+    @pytest.mark.asyncio
+    async def test_start_server_stdio_transport(self, mock_middleware, mock_fastmcp, mock_config):
+        """Test that the stdio transport runs the protocol inside its dedicated stdout writer."""
+        routed = []
+        
+        @contextmanager
+        def fake_protocol_stdout(buffer_size):
+            routed.append("enter")
+            yield
+            routed.append("exit")
+        
+        mock_app = MagicMock()
+        mock_app.run_async = AsyncMock(side_effect=lambda **kwargs: routed.append("run"))
+        mock_fastmcp.return_value = mock_app
+        mock_config.mcp_server.transport = "stdio"
+        
+        server = TemplateMcpServer(mock_config)
+        with patch('template_mcp.server.protocol_stdout', fake_protocol_stdout):
+            await server.start_server()
+        
+        mock_app.run_async.assert_called_once_with(transport="stdio")
+        mock_app.run.assert_not_called()
+        assert routed == ["enter", "run", "exit"]
+    
+    @patch('template_mcp.server.FastMCP')
+    @patch('template_mcp.server.EunomiaMcpMiddleware')
+    @pytest.mark.asyncio
+    async def test_start_server_http_transport(self, mock_middleware, mock_fastmcp, mock_config):
+        """Test that the HTTP transport binds to the configured host and port."""
+        mock_app = MagicMock()
+        mock_app.run_async = AsyncMock()
+        mock_fastmcp.return_value = mock_app
+        mock_config.mcp_server.transport = "http"
+        mock_config.mcp_server.port = 8123
+        
+        server = TemplateMcpServer(mock_config)
+        await server.start_server()
+        
+        mock_app.run_async.assert_called_once_with(
+            transport="http",
+            host="localhost",
+            port=8123,
+            path="/mcp",
+        )
+    
+    @patch('template_mcp.server.FastMCP')
+    @patch('template_mcp.server.EunomiaMcpMiddleware')
+    @pytest.mark.asyncio
+    async def test_start_server_unknown_transport(self, mock_middleware, mock_fastmcp, mock_config):
+        """Test that an unknown transport is rejected."""
+        mock_fastmcp.return_value = MagicMock()
+        mock_config.mcp_server.transport = "carrier-pigeon"
+        
+        server = TemplateMcpServer(mock_config)
+        
+        with pytest.raises(ValueError):
+            await server.start_server()
     
     @patch('template_mcp.server.FastMCP')
     @patch('template_mcp.server.EunomiaMcpMiddleware')
@@ -224,14 +430,20 @@ class TestTemplateMcpServer:
         mock_fastmcp.return_value = mock_app
         
         server = TemplateMcpServer(mock_config)
-        server.request_count = 5
+        for _ in range(5):
+            server.counters.start("hello")
+            server.counters.finish("hello", 1000)
+        server.counters.start("server_info")
+        server.counters.finish("server_info", 1000, error=True)
         
         stats = server.get_server_stats()
         
         # Verify stats structure
         assert stats["name"] == "test-mcp"
         assert stats["version"] == "0.1.0"
-        assert stats["total_requests"] == 5
+        assert stats["total_requests"] == 6
+        assert stats["total_errors"] == 1
+        assert stats["tools"]["hello"] == {"requests": 5, "errors": 0, "in_flight": 0}
         assert stats["status"] == "running"
         assert "uptime_seconds" in stats
         assert "start_time" in stats
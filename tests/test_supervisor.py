@@ -0,0 +1,138 @@
+"""Tests for the multi-process worker supervisor."""
+
+import os
+import signal
+import socket
+import threading
+import time
+
+import pytest
+
+from template_mcp.supervisor import WorkerSupervisor, create_listen_socket
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "fork"), reason="worker mode requires fork")
+
+
+def free_port() -> int:
+    """Find a free TCP port."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class TestCreateListenSocket:
+    """Test listening socket creation."""
+    
+    @pytest.mark.skipif(not hasattr(socket, "SO_REUSEPORT"), reason="SO_REUSEPORT not available")
+    def test_reuseport_allows_shared_bind(self):
+        """Test that two SO_REUSEPORT sockets can bind the same port."""
+        port = free_port()
+        first = create_listen_socket("127.0.0.1", port, reuse_port=True)
+        second = create_listen_socket("127.0.0.1", port, reuse_port=True)
+        
+        assert first.getsockname() == second.getsockname()
+        first.close()
+        second.close()
+    
+    def test_socket_is_inheritable(self):
+        """Test that pre-forked sockets survive into workers."""
+        sock = create_listen_socket("127.0.0.1", 0)
+        
+        assert sock.get_inheritable() is True
+        sock.close()
+
+
+class TestWorkerSupervisor:
+    """Test worker supervision."""
+    
+    def test_invalid_configuration(self):
+        """Test that invalid worker settings are rejected."""
+        with pytest.raises(ValueError):
+            WorkerSupervisor(target=lambda worker_id, sock: None, workers=0, host="127.0.0.1", port=0)
+        with pytest.raises(ValueError):
+            WorkerSupervisor(
+                target=lambda worker_id, sock: None, workers=1, host="127.0.0.1", port=0, socket_mode="magic"
+            )
+    
+    def test_restarts_dead_workers(self):
+        """Test that workers exiting are restarted until the supervisor stops."""
+        supervisor = WorkerSupervisor(
+            target=lambda worker_id, sock: None,
+            workers=2,
+            host="127.0.0.1",
+            port=free_port(),
+            socket_mode="prefork",
+            restart_delay=0.01,
+        )
+        stopper = threading.Timer(1.0, supervisor.stop)
+        stopper.start()
+        
+        supervisor.run()
+        
+        assert supervisor.restarts >= 2
+    
+    def test_forwards_termination_signal(self):
+        """Test that SIGTERM reaches the workers and stops the supervisor."""
+        preloaded = []
+        
+        def worker(worker_id, sock):
+            assert sock is not None
+            time.sleep(30)
+        
+        supervisor = WorkerSupervisor(
+            target=worker,
+            workers=2,
+            host="127.0.0.1",
+            port=free_port(),
+            socket_mode="prefork",
+            preload=lambda: preloaded.append(True),
+            shutdown_timeout=5,
+        )
+        threading.Timer(1.0, os.kill, args=(os.getpid(), signal.SIGTERM)).start()
+        
+        start = time.monotonic()
+        supervisor.run()
+        
+        assert preloaded == [True]
+        assert supervisor.restarts == 0
+        assert time.monotonic() - start < 10
+    
+    @pytest.mark.skipif(not hasattr(signal, "SIGHUP"), reason="SIGHUP not available")
+    def test_sighup_does_not_kill_workers(self):
+        """Test that a forwarded SIGHUP leaves workers without a reload handler running."""
+        
+        def worker(worker_id, sock):
+            time.sleep(30)
+        
+        supervisor = WorkerSupervisor(
+            target=worker,
+            workers=2,
+            host="127.0.0.1",
+            port=free_port(),
+            socket_mode="prefork",
+            shutdown_timeout=5,
+        )
+        threading.Timer(0.5, os.kill, args=(os.getpid(), signal.SIGHUP)).start()
+        threading.Timer(1.5, supervisor.stop).start()
+        
+        supervisor.run()
+        
+        assert supervisor.restarts == 0
+    
+    def test_restart_backoff(self):
+        """Test that quick exits double the restart delay up to the cap and a stable run resets it."""
+        supervisor = WorkerSupervisor(
+            target=lambda worker_id, sock: None,
+            workers=1,
+            host="127.0.0.1",
+            port=0,
+            restart_delay=1,
+            max_restart_delay=5,
+            stable_seconds=10,
+        )
+        
+        delays = [supervisor._next_restart_delay(0, uptime=0.5) for _ in range(5)]
+        
+        assert delays == [1, 2, 4, 5, 5]
+        assert supervisor._next_restart_delay(0, uptime=60) == 1
+        assert supervisor._next_restart_delay(1, uptime=0.5) == 1
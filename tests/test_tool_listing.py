@@ -0,0 +1,161 @@
+"""Tests for cached tools/list results."""
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+from fastmcp import Client, FastMCP
+from fastmcp.tools import Tool
+
+from template_mcp.authorization import Authorizer, AuthorizationMiddleware, Principal
+from template_mcp.policies import AuthorizationDecision
+from template_mcp.tool_listing import ToolListCache
+
+
+def registered_tool(name):
+    """Build a registered tool."""
+    return SimpleNamespace(name=name)
+
+
+class Clock:
+    """Manually advanced monotonic clock."""
+    
+    def __init__(self):
+        self.now = 0.0
+    
+    def __call__(self):
+        return self.now
+
+
+class PrefixAuthorizer(Authorizer):
+    """Authorizer allowing tools whose resource starts with a prefix, counting batched calls."""
+    
+    def __init__(self, prefix="tools/public", stale=False):
+        self.prefix = prefix
+        self.stale = stale
+        self.calls = 0
+    
+    async def authorize(self, principal, action, resource):
+        return AuthorizationDecision(allowed=resource.startswith(self.prefix), stale=self.stale)
+    
+    async def authorize_many(self, principal, requests):
+        self.calls += 1
+        return await super().authorize_many(principal, requests)
+
+
+class TestToolListCache:
+    """Test registry versions, visibility sets and filtered lists."""
+    
+    def test_filtered_list_shared_per_visibility_set(self):
+        """Test that equal visibility sets share one filtered list."""
+        cache = ToolListCache()
+        tools = [registered_tool("hello"), registered_tool("server_info")]
+        
+        first = cache.tools(frozenset({"hello"}), tools)
+        
+        assert cache.tools(frozenset({"hello"}), tools) is first
+        assert [tool.name for tool in first] == ["hello"]
+    
+    def test_invalidate_starts_new_version(self):
+        """Test that adding or removing tools drops visibility and filtered lists."""
+        cache = ToolListCache()
+        tools = [registered_tool("hello")]
+        principal = Principal(role="user")
+        cache.remember_visibility(principal, frozenset({"hello", "lookup"}))
+        cache.tools(frozenset({"hello", "lookup"}), tools)
+        
+        cache.invalidate()
+        tools.append(registered_tool("lookup"))
+        
+        assert cache.version == 1
+        assert cache.visibility(principal) is None
+        assert [tool.name for tool in cache.tools(frozenset({"hello", "lookup"}), tools)] == ["hello", "lookup"]
+    
+    def test_sync_follows_the_listed_tools(self):
+        """Test that a listing with other tools starts a new version and an identical one does not."""
+        cache = ToolListCache()
+        tools = [registered_tool("hello")]
+        cache.sync(tools)
+        cache.remember_visibility(Principal(), frozenset({"hello"}))
+        
+        cache.sync(list(tools))
+        assert cache.version == 1
+        assert cache.visibility(Principal()) == frozenset({"hello"})
+        
+        cache.sync(tools + [registered_tool("lookup")])
+        assert cache.version == 2
+        assert cache.visibility(Principal()) is None
+    
+    def test_visibility_expires(self):
+        """Test that remembered visibility is checked again after its TTL."""
+        clock = Clock()
+        cache = ToolListCache(visibility_ttl=10, clock=clock)
+        principal = Principal(role="user")
+        cache.remember_visibility(principal, frozenset({"hello"}))
+        
+        assert cache.visibility(principal) == frozenset({"hello"})
+        clock.now = 10
+        assert cache.visibility(principal) is None
+    
+    def test_visibility_sets_are_bounded(self):
+        """Test that stored lists are dropped once as many sets as principals are kept."""
+        cache = ToolListCache(max_principals=2)
+        tools = [registered_tool(name) for name in ("a", "b", "c")]
+        for name in ("a", "b", "c"):
+            cache.tools(frozenset({name}), tools)
+        
+        assert cache.get_stats()["visibility_sets"] == 1
+
+
+class TestCachedListing:
+    """Test tools/list filtering through the authorization middleware."""
+    
+    @pytest.mark.asyncio
+    async def test_visibility_decided_once_per_principal(self):
+        """Test that repeated listings reuse the visibility and the filtered list."""
+        authorizer = PrefixAuthorizer()
+        cache = ToolListCache()
+        middleware = AuthorizationMiddleware(authorizer, audit_logger=MagicMock(), tool_lists=cache)
+        tools = [registered_tool("public_a"), registered_tool("private"), registered_tool("public_b")]
+        
+        async def call_next(context):
+            return tools
+        
+        first = await middleware.on_list_tools(SimpleNamespace(message=None), call_next)
+        second = await middleware.on_list_tools(SimpleNamespace(message=None), call_next)
+        
+        assert [tool.name for tool in first] == ["public_a", "public_b"]
+        assert second is first
+        assert authorizer.calls == 1
+    
+    @pytest.mark.asyncio
+    async def test_stale_decisions_are_not_remembered(self):
+        """Test that fallback decisions are decided again on the next listing."""
+        authorizer = PrefixAuthorizer(stale=True)
+        cache = ToolListCache()
+        middleware = AuthorizationMiddleware(authorizer, audit_logger=MagicMock(), tool_lists=cache)
+        tools = [registered_tool("public_a")]
+        
+        assert await middleware.visible_tool_names(Principal(), tools) == frozenset({"public_a"})
+        assert cache.visibility(Principal()) is None
+    
+    @pytest.mark.asyncio
+    async def test_tools_added_to_the_app_are_listed(self):
+        """Test that tools registered on the FastMCP app directly invalidate cached listings."""
+        def public_a() -> str:
+            return "a"
+        
+        def public_b() -> str:
+            return "b"
+        
+        app = FastMCP("listing")
+        middleware = AuthorizationMiddleware(PrefixAuthorizer(), audit_logger=MagicMock(), tool_lists=ToolListCache())
+        app.add_middleware(middleware)
+        app.add_tool(Tool.from_function(public_a))
+        
+        async with Client(app) as client:
+            assert [tool.name for tool in await client.list_tools()] == ["public_a"]
+            app.add_tool(Tool.from_function(public_b))
+            assert sorted(tool.name for tool in await client.list_tools()) == ["public_a", "public_b"]
+            app.remove_tool("public_a")
+            assert [tool.name for tool in await client.list_tools()] == ["public_b"]
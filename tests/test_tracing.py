@@ -0,0 +1,195 @@
+"""Tests for span tracing and OTLP JSON export."""
+
+import asyncio
+import json
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from template_mcp.config import TracingConfig
+from template_mcp.tracing import (
+    NOOP_SPAN,
+    SPAN_KIND_SERVER,
+    InMemoryExporter,
+    OtlpJsonFileExporter,
+    SpanExporter,
+    Tracer,
+    TracingMiddleware,
+    create_tracer,
+)
+
+
+@pytest.fixture
+def exporter():
+    """Create an in-memory exporter."""
+    return InMemoryExporter()
+
+
+@pytest.fixture
+def tracer(exporter):
+    """Create a tracer sampling every trace."""
+    return Tracer(sample_rate=1.0, exporter=exporter, batch_size=1000)
+
+
+class TestTracer:
+    """Test span creation and sampling."""
+    
+    def test_spans_nest_within_trace(self, tracer, exporter):
+        """Test that child spans share the trace and point at their parent."""
+        with (
+            tracer.trace("tools/call", tool="hello") as root,
+            tracer.span("validation") as child,
+            tracer.span("inner") as grandchild,
+        ):
+            pass
+        tracer.flush()
+        
+        assert [span.name for span in exporter.spans] == ["inner", "validation", "tools/call"]
+        assert root.kind == SPAN_KIND_SERVER
+        assert root.parent_id is None
+        assert child.parent_id == root.span_id
+        assert grandchild.parent_id == child.span_id
+        assert {span.trace_id for span in exporter.spans} == {root.trace_id}
+        assert root.start_ns <= child.start_ns <= child.end_ns <= root.end_ns
+    
+    def test_span_outside_trace_is_noop(self, tracer, exporter):
+        """Test that spans are not recorded without a sampled root."""
+        assert tracer.span("handler") is NOOP_SPAN
+        tracer.flush()
+        assert exporter.spans == []
+    
+    def test_unsampled_trace(self, exporter):
+        """Test that an unsampled trace records nothing."""
+        tracer = Tracer(sample_rate=0.0, exporter=exporter)
+        
+        with tracer.trace("tools/call"):
+            assert tracer.span("handler") is NOOP_SPAN
+        
+        assert tracer.enabled is False
+        assert tracer.get_stats()["traces_sampled"] == 0
+    
+    def test_error_is_recorded(self, tracer, exporter):
+        """Test that an exception marks the span as failed and propagates."""
+        with pytest.raises(ValueError), tracer.trace("tools/call"):
+            raise ValueError("boom")
+        tracer.flush()
+        
+        assert exporter.spans[0].error == "ValueError: boom"
+    
+    def test_batches_are_exported(self, exporter):
+        """Test that spans are exported once the batch is full."""
+        tracer = Tracer(sample_rate=1.0, exporter=exporter, batch_size=2)
+        
+        with tracer.trace("a"):
+            pass
+        assert exporter.spans == []
+        with tracer.trace("b"):
+            pass
+        
+        assert len(exporter.spans) == 2
+        assert tracer.get_stats()["spans_exported"] == 2
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_tasks_have_separate_traces(self, tracer, exporter):
+        """Test that the current span does not leak between tasks."""
+        async def call(name):
+            with tracer.trace(name) as root:
+                await asyncio.sleep(0)
+                with tracer.span("handler") as child:
+                    await asyncio.sleep(0)
+            return root, child
+        
+        (root_a, child_a), (root_b, child_b) = await asyncio.gather(call("a"), call("b"))
+        
+        assert child_a.parent_id == root_a.span_id
+        assert child_b.parent_id == root_b.span_id
+        assert root_a.trace_id != root_b.trace_id
+
+
+class TestOtlpJsonFileExporter:
+    """Test the OTLP JSON file exporter."""
+    
+    def test_exporter_must_implement_export(self):
+        """Test that an exporter without export cannot be created."""
+        class IncompleteExporter(SpanExporter):
+            pass
+        
+        with pytest.raises(TypeError):
+            IncompleteExporter()
+    
+    def test_writes_trace_request(self, tmp_path):
+        """Test that a batch is written as one OTLP JSON line."""
+        path = tmp_path / "traces" / "spans.jsonl"
+        tracer = Tracer(sample_rate=1.0, exporter=OtlpJsonFileExporter(str(path)), service_name="svc")
+        
+        with tracer.trace("tools/call", tool="hello", retries=2), tracer.span("handler"):
+            pass
+        tracer.close()
+        
+        lines = path.read_text().splitlines()
+        assert len(lines) == 1
+        resource_spans = json.loads(lines[0])["resourceSpans"][0]
+        assert resource_spans["resource"]["attributes"][0]["value"] == {"stringValue": "svc"}
+        handler, root = resource_spans["scopeSpans"][0]["spans"]
+        assert len(root["traceId"]) == 32
+        assert len(root["spanId"]) == 16
+        assert handler["parentSpanId"] == root["spanId"]
+        assert "parentSpanId" not in root
+        assert int(root["endTimeUnixNano"]) >= int(root["startTimeUnixNano"])
+        assert {"key": "tool", "value": {"stringValue": "hello"}} in root["attributes"]
+        assert {"key": "retries", "value": {"intValue": "2"}} in root["attributes"]
+    
+    def test_batches_are_written_off_the_calling_thread(self, tmp_path, monkeypatch):
+        """Test that exporting hands the file append to the writer thread."""
+        exporter = OtlpJsonFileExporter(str(tmp_path / "spans.jsonl"))
+        writers = []
+        monkeypatch.setattr(exporter, "_write", lambda spans, service_name: writers.append(threading.current_thread()))
+        tracer = Tracer(sample_rate=1.0, exporter=exporter)
+        
+        with tracer.trace("tools/call"):
+            pass
+        tracer.close()
+        
+        assert len(writers) == 1
+        assert writers[0] is not threading.current_thread()
+
+
+class TestTracingMiddleware:
+    """Test the tracing middleware."""
+    
+    @pytest.mark.asyncio
+    async def test_call_is_traced(self, tracer, exporter):
+        """Test that a tool call gets a root span and a middleware phase."""
+        middleware = TracingMiddleware(tracer)
+        context = SimpleNamespace(message=SimpleNamespace(name="hello", arguments={}))
+        
+        async def call_next(ctx):
+            with tracer.span("handler"):
+                return "result"
+        
+        assert await middleware.on_call_tool(context, call_next) == "result"
+        tracer.flush()
+        
+        handler, phase, root = exporter.spans
+        assert root.name == "tools/call"
+        assert root.attributes == {"tool": "hello"}
+        assert phase.parent_id == root.span_id
+        assert handler.parent_id == phase.span_id
+
+
+class TestCreateTracer:
+    """Test tracer construction from configuration."""
+    
+    def test_disabled_by_default(self):
+        """Test that the default configuration disables tracing."""
+        assert create_tracer(TracingConfig(), "template-mcp").enabled is False
+    
+    def test_enabled(self, tmp_path):
+        """Test that an enabled configuration exports to the configured file."""
+        config = TracingConfig(enabled=True, sample_rate=0.5, export_path=str(tmp_path / "t.jsonl"))
+        tracer = create_tracer(config, "template-mcp")
+        
+        assert tracer.enabled is True
+        assert tracer.sample_rate == 0.5
+        assert isinstance(tracer.exporter, OtlpJsonFileExporter)
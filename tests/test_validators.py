@@ -0,0 +1,41 @@
+"""Tests for the compiled tool input validator registry."""
+
+import pytest
+from pydantic import ValidationError
+
+from template_mcp.models import AuditQueryRequest, HelloRequest
+from template_mcp.validators import ValidatorRegistry
+
+
+class TestValidatorRegistry:
+    """Test registration and validation."""
+    
+    @pytest.fixture
+    def registry(self):
+        """Registry with the hello tool registered."""
+        registry = ValidatorRegistry()
+        registry.register("hello", HelloRequest)
+        return registry
+    
+    def test_register_returns_schema(self, registry):
+        """Test that registration returns the schema used for the tool listing."""
+        assert "hello" in registry
+        assert "audit_query" not in registry
+        assert registry.json_schema("hello") == HelloRequest.model_json_schema()
+        assert registry.register("audit_query", AuditQueryRequest) == AuditQueryRequest.model_json_schema()
+    
+    def test_validate_arguments(self, registry):
+        """Test validation of decoded arguments."""
+        request = registry.validate("hello", {"name": "  Ana  ", "language": "pt-BR"})
+        
+        assert isinstance(request, HelloRequest)
+        assert request.name == "Ana"
+        assert request.language == "pt-BR"
+        
+        with pytest.raises(ValidationError):
+            registry.validate("hello", None)
+    
+    def test_unknown_tool(self, registry):
+        """Test that tools must be registered first."""
+        with pytest.raises(KeyError):
+            registry.validate("missing", {})